@@ -0,0 +1,157 @@
+import asyncio
+import atexit
+import gzip
+import json
+import os
+import threading
+import time
+from typing import Any, Optional
+from CONFIG.Constants import Constants
+from API.GraphQLTransport import TransportResponse
+
+
+class CassetteMiss(Exception):
+    """The replayed request is not on the cassette; retrying will not help."""
+
+
+class CassetteTransport:
+    """Records request/response pairs of the wrapped transport to a gzip JSON
+    cassette, or replays them offline.
+
+    Entries are keyed by operation name and variables (without the volatile
+    ones in ``Constants.CASSETTE_IGNORED_VARIABLES``). Batched payloads are
+    stored per operation, so a replay may combine them into different batches
+    than the recording. Replay waits for the recorded latency (the slowest
+    operation of a batch) unless ``latency`` is "zero". A replaying cassette
+    is ``offline``: no server is involved, so the clients skip the rate
+    limiter and the circuit breaker for it.
+    """
+
+    def __init__(self, inner, mode: str, path: str = Constants.CASSETTE_PATH,
+                 latency: str = Constants.CASSETTE_REPLAY_LATENCY):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unbekannter Kassetten-Modus: {mode}")
+        self.inner = inner
+        self.mode = mode
+        self.path = path
+        self.latency = latency
+        self.name = f"cassette-{mode}"
+        self.offline = mode == "replay"
+        self._entries: dict[str, list] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+        self._load()
+        if mode == "record":
+            atexit.register(self.flush)
+
+    @staticmethod
+    def _key(operation: dict) -> str:
+        variables = {
+            name: value for name, value in (operation.get("variables") or {}).items()
+            if name not in Constants.CASSETTE_IGNORED_VARIABLES
+        }
+        return json.dumps([operation.get("operationName", ""), variables], sort_keys=True, separators=(",", ":"))
+
+    async def post(self, url: str, payload: Any, timeout_ms: int) -> TransportResponse:
+        if self.mode == "replay":
+            return await self._replay(payload)
+
+        started = time.monotonic()
+        response = await self.inner.post(url, payload, timeout_ms)
+        if response.ok:
+            self._record(payload, response, time.monotonic() - started)
+        return response
+
+    def _record(self, payload: Any, response: TransportResponse, latency: float) -> None:
+        try:
+            data = response.json()
+        except ValueError:
+            return
+        if isinstance(payload, list):
+            if not isinstance(data, list) or len(data) != len(payload):
+                return
+            pairs = zip(payload, data)
+        elif "errors" in data:
+            return
+        else:
+            pairs = [(payload, data)]
+        with self._lock:
+            for operation, entry in pairs:
+                self._entries[self._key(operation)] = [round(latency, 4), entry]
+                self.recorded += 1
+            self._dirty = True
+
+    async def _replay(self, payload: Any) -> TransportResponse:
+        operations = payload if isinstance(payload, list) else [payload]
+        entries = [self._entries.get(self._key(operation)) for operation in operations]
+        missing = sum(1 for entry in entries if entry is None)
+        self.misses += missing
+        self.replayed += len(entries) - missing
+
+        if not isinstance(payload, list):
+            if entries[0] is None:
+                raise CassetteMiss(f"Nicht auf der Kassette: {self._key(payload)}")
+            data = entries[0][1]
+        else:
+            # fehlende Operationen scheitern einzeln, der Rest des Batches bleibt nutzbar
+            data = [
+                entry[1] if entry is not None else {"errors": [{"message": "Nicht auf der Kassette"}], "data": None}
+                for entry in entries
+            ]
+
+        delay = max((entry[0] for entry in entries if entry is not None), default=0)
+        if self.latency != "zero" and delay > 0:
+            await asyncio.sleep(delay)
+        return TransportResponse(200, json.dumps(data), {"content-type": "application/json"})
+
+    def stats(self) -> dict:
+        stats = {
+            "active": self.name,
+            "fallback_count": 0,
+            "cassette_entries": len(self._entries),
+            "recorded": self.recorded,
+            "replayed": self.replayed,
+            "misses": self.misses,
+        }
+        if self.inner is not None and hasattr(self.inner, "stats"):
+            stats["inner"] = self.inner.stats()
+        return stats
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            if self.mode == "replay":
+                Constants.LOGGER.warning(f"Kassette nicht gefunden: {self.path}")
+            return
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError) as e:
+            Constants.LOGGER.warning(f"Kassette konnte nicht geladen werden: {self.path} {e}")
+            self._entries = {}
+
+    def flush(self) -> Optional[str]:
+        """Write the cassette if new responses were recorded since the last flush."""
+        with self._lock:
+            if not self._dirty:
+                return None
+            snapshot = json.dumps(self._entries, ensure_ascii=False, separators=(",", ":"))
+            self._dirty = False
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                f.write(snapshot)
+            os.replace(tmp_path, self.path)
+            Constants.LOGGER.info(f"Kassette gespeichert: {self.path} ({len(self._entries)} Einträge)")
+            return self.path
+        except OSError as e:
+            Constants.LOGGER.warning(f"Kassette konnte nicht gespeichert werden: {e}")
+            return None
+
+    async def close(self):
+        self.flush()
+        if self.inner is not None:
+            await self.inner.close()
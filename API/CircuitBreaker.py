@@ -0,0 +1,98 @@
+import time
+import threading
+from CONFIG.Constants import Constants
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the endpoint's breaker is open."""
+
+
+class CircuitBreaker:
+    """Per-endpoint circuit breaker shared by all clients.
+
+    closed:    requests pass, consecutive failures are counted
+    open:      requests fail fast until ``reset_timeout`` has passed
+    half_open: a limited number of probe requests decide between closed and open
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    _breakers = {}
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        endpoint: str,
+        failure_threshold: int = Constants.CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = Constants.CIRCUIT_RESET_TIMEOUT,
+        half_open_probes: int = Constants.CIRCUIT_HALF_OPEN_PROBES,
+    ):
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._state_lock = threading.Lock()
+
+    @classmethod
+    def for_endpoint(cls, endpoint: str) -> "CircuitBreaker":
+        with cls._lock:
+            if endpoint not in cls._breakers:
+                cls._breakers[endpoint] = cls(endpoint)
+            return cls._breakers[endpoint]
+
+    def _transition(self, state: str) -> None:
+        if state == self.state:
+            return
+        log = Constants.LOGGER.info if state == self.CLOSED else Constants.LOGGER.warning
+        log(f"[CircuitBreaker] {self.endpoint}: {self.state} -> {state} (Fehler in Folge: {self.failures})")
+        self.state = state
+        if state == self.OPEN:
+            self.opened += 1
+            self._opened_at = time.monotonic()
+        self._probes = 0
+
+    def allow_request(self) -> bool:
+        with self._state_lock:
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._transition(self.HALF_OPEN)
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and self._probes < self.half_open_probes:
+                self._probes += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def release_probe(self) -> None:
+        """Free a half-open probe whose request ended without a verdict (cancelled, cassette miss)."""
+        with self._state_lock:
+            if self.state == self.HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def record_success(self) -> None:
+        with self._state_lock:
+            self.failures = 0
+            self._transition(self.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._state_lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self._transition(self.OPEN)
+
+    def stats(self) -> dict:
+        return {
+            "endpoint": self.endpoint,
+            "state": self.state,
+            "failures": self.failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,187 @@
+import json
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from CONFIG.Constants import Constants
+
+
+@dataclass
+class TransportResponse:
+    status: int
+    body: str
+    headers: dict = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class TransportRejected(Exception):
+    """The transport was blocked (e.g. bot protection) and should not be retried as is."""
+
+    def __init__(self, response: TransportResponse):
+        super().__init__(f"HTTP {response.status} (abgelehnt)")
+        self.response = response
+
+
+class HttpTransport:
+    """Browserless transport: pooled keep-alive requests.Session, run in a thread pool
+    so it can be awaited from the service loop."""
+
+    name = "http"
+
+    def __init__(self, pool_size: int = Constants.HTTP_POOL_SIZE):
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        # nur Kodierungen anfordern, die urllib3 auch dekodieren kann
+        self._session.headers.update({**Constants.HEADERS, "Accept-Encoding": ACCEPT_ENCODING})
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="galaxo-http")
+
+    def _post(self, url: str, payload: Any, timeout_ms: int) -> TransportResponse:
+        resp = self._session.post(url, data=json.dumps(payload), timeout=timeout_ms / 1000)
+        return TransportResponse(resp.status_code, resp.text, dict(resp.headers))
+
+    async def post(self, url: str, payload: Any, timeout_ms: int) -> TransportResponse:
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(self._executor, self._post, url, payload, timeout_ms)
+        if self.is_rejected(response):
+            raise TransportRejected(response)
+        return response
+
+    @staticmethod
+    def is_rejected(response: TransportResponse) -> bool:
+        # Bot-Schutz liefert 401/403 oder eine HTML-Challenge statt JSON
+        if response.status in (401, 403):
+            return True
+        content_type = {k.lower(): v for k, v in response.headers.items()}.get("content-type", "")
+        return "text/html" in content_type
+
+    async def close(self):
+        self._session.close()
+        self._executor.shutdown(wait=False)
+
+
+class PlaywrightTransport:
+    """Browser-backed transport using the PlaywrightService page pool.
+    The browser is only launched on the first request."""
+
+    name = "browser"
+
+    def __init__(self, service):
+        self._service = service
+
+    async def post(self, url: str, payload: Any, timeout_ms: int) -> TransportResponse:
+        await self._service.ensure_started()
+        # only transport errors count against the checked out page
+        async with self._service.page_pool.page() as page:
+            resp = await page.request.post(
+                url,
+                data=json.dumps(payload),
+                headers={"Content-Type": "application/json", **Constants.HEADERS},
+                timeout=timeout_ms,
+            )
+            body = await resp.text()
+        return TransportResponse(resp.status, body, resp.headers)
+
+    async def close(self):
+        pass
+
+
+class FallbackTransport:
+    """Uses the HTTP transport and switches to the browser transport when HTTP is
+    rejected. After ``retry_http_after`` seconds HTTP is tried again."""
+
+    def __init__(self, primary, fallback, retry_http_after: float = Constants.TRANSPORT_RETRY_HTTP_AFTER):
+        self.primary = primary
+        self.fallback = fallback
+        self.retry_http_after = retry_http_after
+        self._fallback_since = None
+        self.fallback_count = 0
+        self.requests = {primary.name: 0, fallback.name: 0}
+
+    @property
+    def active(self):
+        if self._fallback_since is None:
+            return self.primary
+        if time.monotonic() - self._fallback_since >= self.retry_http_after:
+            Constants.LOGGER.info(f"[GraphQLTransport] Versuche wieder {self.primary.name}")
+            self._fallback_since = None
+            return self.primary
+        return self.fallback
+
+    async def post(self, url: str, payload: Any, timeout_ms: int) -> TransportResponse:
+        transport = self.active
+        self.requests[transport.name] += 1
+        if transport is self.fallback:
+            return await transport.post(url, payload, timeout_ms)
+        try:
+            return await transport.post(url, payload, timeout_ms)
+        except TransportRejected as e:
+            self.fallback_count += 1
+            self._fallback_since = time.monotonic()
+            Constants.LOGGER.warning(
+                f"[GraphQLTransport] {self.primary.name} abgelehnt ({e.response.status}), "
+                f"wechsle auf {self.fallback.name} (Fallback #{self.fallback_count})"
+            )
+            self.requests[self.fallback.name] += 1
+            return await self.fallback.post(url, payload, timeout_ms)
+
+    def stats(self) -> dict:
+        return {
+            "active": self.active.name,
+            "fallback_count": self.fallback_count,
+            "requests": dict(self.requests),
+        }
+
+    async def close(self):
+        await self.primary.close()
+        await self.fallback.close()
+
+
+class GraphQLTransport:
+    """Factory for the process-wide transport selected by Constants.GRAPHQL_TRANSPORT
+    ("auto" = HTTP with lazy browser fallback, "http" or "browser"), optionally
+    wrapped in a CassetteTransport to record or replay (Constants.CASSETTE_MODE)."""
+
+    _instance = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def instance(cls, service):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = cls.create(Constants.GRAPHQL_TRANSPORT, service, Constants.CASSETTE_MODE)
+                Constants.LOGGER.info(
+                    f"[GraphQLTransport] Transport: {Constants.GRAPHQL_TRANSPORT}, Kassette: {Constants.CASSETTE_MODE}"
+                )
+            return cls._instance
+
+    @staticmethod
+    def create(mode: str, service, cassette_mode: str = "off"):
+        if cassette_mode != "off":
+            from API.CassetteTransport import CassetteTransport
+            # beim Abspielen wird kein echter Transport benötigt
+            inner = None if cassette_mode == "replay" else GraphQLTransport.create(mode, service)
+            return CassetteTransport(inner, cassette_mode)
+        if mode == "http":
+            return HttpTransport()
+        if mode == "browser":
+            return PlaywrightTransport(service)
+        return FallbackTransport(HttpTransport(), PlaywrightTransport(service))
+
+    @staticmethod
+    def stats(transport) -> dict:
+        if hasattr(transport, "stats"):
+            return transport.stats()
+        return {"active": transport.name, "fallback_count": 0}
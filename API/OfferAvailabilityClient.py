@@ -2,8 +2,8 @@ from API.RequestGraphQLClient import RequestGraphQLClient
 
 class OfferAvailabilityClient(RequestGraphQLClient):
     
-    def get_offer_availability(self, product_id, sales_offer_id, offer_type):
-        query = [{
+    def _build_query(self, product_id, sales_offer_id, offer_type):
+        return [{
             "operationName": "GET_OFFER_AVAILABILITY_V2",
             "variables": {
                 "productId": product_id,
@@ -31,9 +31,65 @@ class OfferAvailabilityClient(RequestGraphQLClient):
                 }
             """
         }]
-        
+
+    def get_offer_availability(self, product_id, sales_offer_id, offer_type):
+        try:
+            response = self.send_request(self._build_query(product_id, sales_offer_id, offer_type))
+            return self._parse_stock_count(response)
+        except Exception as e:
+            return 0
+
+    async def get_offer_availability_async(self, product_id, sales_offer_id, offer_type):
+        """Async variant of ``get_offer_availability`` for use inside the service loop."""
         try:
-            response = self.send_request(query)
-            return response[0]["data"].get("offerAvailabilityV2", {}).get("mail", {}).get("stockDetails", {}).get("stockCount", 0)        
+            response = await self.send_request_async(self._build_query(product_id, sales_offer_id, offer_type))
+            return self._parse_stock_count(response)
         except Exception as e:
             return 0
+
+    def get_offer_availability_batch(self, offers):
+        """Fetch the stock count for several offers with a single request.
+        ``offers`` is an iterable of (product_id, sales_offer_id, offer_type);
+        returns a dict product_id -> stock count.
+        """
+        offers, results = self._split_batch(offers)
+        if not offers:
+            return results
+        try:
+            response = self.send_request(self._build_batch_query(offers))
+            return self._parse_batch_response(offers, response, results)
+        except Exception as e:
+            return {**results, **{offer[0]: 0 for offer in offers}}
+
+    async def get_offer_availability_batch_async(self, offers):
+        """Async variant of ``get_offer_availability_batch`` for use inside the service loop."""
+        offers, results = self._split_batch(offers)
+        if not offers:
+            return results
+        try:
+            response = await self.send_request_async(self._build_batch_query(offers))
+            return self._parse_batch_response(offers, response, results)
+        except Exception as e:
+            return {**results, **{offer[0]: 0 for offer in offers}}
+
+    @staticmethod
+    def _split_batch(offers):
+        # Produkte ohne Angebot haben keinen Lagerbestand und werden nicht abgefragt
+        offers = list(offers)
+        results = {product_id: 0 for product_id, offer_id, _ in offers if offer_id is None}
+        return [offer for offer in offers if offer[1] is not None], results
+
+    def _build_batch_query(self, offers):
+        return [operation for offer in offers for operation in self._build_query(*offer)]
+
+    def _parse_batch_response(self, offers, response, results):
+        for index, (product_id, _, _) in enumerate(offers):
+            try:
+                results[product_id] = self._parse_stock_count(response[index:index + 1])
+            except Exception:
+                results[product_id] = 0
+        return results
+
+    @staticmethod
+    def _parse_stock_count(response):
+        return response[0]["data"].get("offerAvailabilityV2", {}).get("mail", {}).get("stockDetails", {}).get("stockCount", 0)
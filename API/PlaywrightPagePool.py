@@ -0,0 +1,117 @@
+import asyncio
+from contextlib import asynccontextmanager
+from CONFIG.Constants import Constants
+
+
+class PlaywrightPagePool:
+    """Pool of Playwright pages with checkout/return semantics.
+
+    Lives inside the PlaywrightService loop. Pages that are closed or failed
+    ``max_failures`` times in a row are dropped on return; their slot goes
+    back to the pool empty and the replacement page is created by the next
+    checkout. If that fails, the slot stays empty for the one after.
+    """
+
+    def __init__(self, context, size: int = Constants.PLAYWRIGHT_POOL_SIZE, max_failures: int = 3):
+        self._context = context
+        self.size = max(1, size)
+        self.max_failures = max_failures
+        self._queue = None
+        self._pages = []
+        self._failures = {}
+        self.in_use = 0
+        self.waiting = 0
+        self.waits = 0
+        self.peak_in_use = 0
+        self.recycled = 0
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        for _ in range(self.size):
+            page = await self._new_page()
+            self._queue.put_nowait(page)
+
+    async def _new_page(self):
+        page = await self._context.new_page()
+        self._pages.append(page)
+        self._failures[page] = 0
+        return page
+
+    async def _discard(self, page):
+        self.recycled += 1
+        Constants.LOGGER.warning(
+            f"[PlaywrightPagePool] Seite wird ersetzt (Fehler in Folge: {self._failures.get(page, 0)})"
+        )
+        self._failures.pop(page, None)
+        if page in self._pages:
+            self._pages.remove(page)
+        try:
+            if not page.is_closed():
+                await page.close()
+        except Exception:
+            pass
+
+    @asynccontextmanager
+    async def page(self):
+        """Check out a page for the duration of the ``async with`` block.
+        An exception raised inside the block counts as a failure of that page.
+        """
+        if self._queue.empty():
+            self.waiting += 1
+            self.waits += 1
+            Constants.LOGGER.debug(f"[PlaywrightPagePool] Alle Seiten belegt: {self.stats()}")
+            try:
+                page = await self._queue.get()
+            finally:
+                self.waiting -= 1
+        else:
+            page = self._queue.get_nowait()
+
+        # None ist ein leerer Platz, dessen Seite erst jetzt erzeugt wird
+        try:
+            if page is not None and page.is_closed():
+                await self._discard(page)
+                page = None
+            if page is None:
+                page = await self._new_page()
+        except BaseException:
+            self._queue.put_nowait(None)
+            raise
+
+        self.in_use += 1
+        self.peak_in_use = max(self.peak_in_use, self.in_use)
+        try:
+            yield page
+            self._failures[page] = 0
+        except Exception:
+            self._failures[page] = self._failures.get(page, 0) + 1
+            raise
+        finally:
+            self.in_use -= 1
+            if page.is_closed() or self._failures.get(page, 0) >= self.max_failures:
+                # Platz sofort zurückgeben, der Ersatz entsteht beim nächsten Auschecken
+                self._queue.put_nowait(None)
+                await self._discard(page)
+            else:
+                self._queue.put_nowait(page)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "in_use": self.in_use,
+            "available": self._queue.qsize() if self._queue else 0,
+            "waiting": self.waiting,
+            "waits": self.waits,
+            "peak_in_use": self.peak_in_use,
+            "recycled": self.recycled,
+            "utilization": round(self.in_use / self.size, 2),
+        }
+
+    async def close(self):
+        for page in self._pages:
+            try:
+                await page.close()
+            except Exception:
+                pass
+        self._pages.clear()
+        self._failures.clear()
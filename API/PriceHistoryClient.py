@@ -2,6 +2,7 @@ from datetime import datetime
 from dataclasses import dataclass
 from CONFIG.Constants import Constants
 from API.RequestGraphQLClient import RequestGraphQLClient
+from API.PriceHistoryStore import PriceHistoryStore
 import base64
 import json
 
@@ -13,26 +14,31 @@ class PriceHistoryPoint:
 
 class PriceHistoryClient(RequestGraphQLClient):
 
-    def __init__(self, max_retries: int = 5, backoff_factor: float = 1.0, timeout: int = 5):
+    def __init__(self, max_retries: int = 5, backoff_factor: float = 1.0, timeout: int = 5,
+                 store: PriceHistoryStore = None):
         super().__init__(max_retries=max_retries, backoff_factor=backoff_factor, timeout=timeout)
         self.BASE_URL = Constants.BASE_URL_HISTORY
+        self.store = store or PriceHistoryStore()
 
     def encode_product_id(self, product_id):                
         full_string = "Product\nd" + str(product_id) + ":1:406802"
         return base64.b64encode(full_string.encode()).decode()
 
-    def fetch_price_chart(self, product_id):
+    def _build_payload(self, product_id, history_from=None):
         timestamp = datetime.now().isoformat() + "Z"
 
         encoded_id =  self.encode_product_id(product_id)
 
-        payload = {
+        return {
             "variables": {
                 "id": encoded_id,
                 "olderThan3MonthTimestamp": timestamp,
-                "historyFrom": None
+                "historyFrom": history_from
             }
         }
+
+    def fetch_price_chart(self, product_id, history_from=None):
+        payload = self._build_payload(product_id, history_from)
         try:
             response = self.send_request(payload)
             return response
@@ -42,30 +48,56 @@ class PriceHistoryClient(RequestGraphQLClient):
             )
             return {"error": str(e)}
 
-    def get_pdp_price_history(self, product_id: str) -> dict:
+    async def fetch_price_chart_async(self, product_id, history_from=None):
+        """Async variant of ``fetch_price_chart`` for use inside the service loop."""
+        payload = self._build_payload(product_id, history_from)
         try:
-            response = self.fetch_price_chart(product_id)
-            points = response.get("data", {}).get("productById", {}).get("priceHistory", {}).get("points", [])
+            return await self.send_request_async(payload)
+        except Exception as e:
+            Constants.LOGGER.error(
+                f"Fehler beim Abrufen der Preishistorie für Produkt-ID {product_id}: {e} {payload} {self.BASE_URL}"
+            )
+            return {"error": str(e)}
 
-            price_history = [
-                PriceHistoryPoint(
-                    amount_incl=point["price"]["amountInclusive"],
-                    valid_from=point["validFrom"][:10]
-                )
-                for point in points
-                if point.get("price") and "amountInclusive" in point["price"] and "validFrom" in point
-            ]
+    def get_pdp_price_history(self, product_id: str) -> dict:
+        """Min/max price from the local series after fetching only points newer
+        than the last stored ``validFrom``."""
+        try:
+            history_from = self.store.last_valid_from(product_id)
+            response = self.fetch_price_chart(product_id, history_from)
+            return self._update_local_history(product_id, response)
+        except Exception as e:
+            Constants.LOGGER.error(f"Error in get_pdp_price_history for product {product_id}: {e}")
+        return {"min_price": None, "max_price": None}
 
-            # Prüfen, ob es Preispunkte gibt
-            if not price_history:
-                return {"min_price": None, "max_price": None}
+    async def get_pdp_price_history_async(self, product_id: str) -> dict:
+        """Async variant of ``get_pdp_price_history`` for use inside the service loop."""
+        try:
+            history_from = self.store.last_valid_from(product_id)
+            response = await self.fetch_price_chart_async(product_id, history_from)
+            return self._update_local_history(product_id, response)
+        except Exception as e:
+            Constants.LOGGER.error(f"Error in get_pdp_price_history_async for product {product_id}: {e}")
+        return {"min_price": None, "max_price": None}
 
-            # Berechne den minimalen und maximalen Preis
-            min_price = min(price_history, key=lambda x: x.amount_incl).amount_incl
-            max_price = max(price_history, key=lambda x: x.amount_incl).amount_incl
+    def get_local_price_history(self, product_id) -> list[PriceHistoryPoint]:
+        """Locally stored price series of a product, available offline."""
+        return [
+            PriceHistoryPoint(amount_incl=amount, valid_from=valid_from[:10])
+            for valid_from, amount in self.store.load(product_id)
+        ]
 
-            return {"min_price": min_price, "max_price": max_price}
+    def _update_local_history(self, product_id, response) -> dict:
+        # bei Fehlern bleibt die lokale Historie gültig
+        series = self.store.merge(product_id, self._raw_points(response))
+        return PriceHistoryStore.summarize(series)
 
-        except Exception as e:
-            Constants.LOGGER.error(f"Error in get_pdp_price_history for product {product_id}: {e}")
-        return {"min_price": None, "max_price": None}
+    @staticmethod
+    def _raw_points(response) -> list[list]:
+        # volles validFrom: die Store-Einträge dienen als Cursor für historyFrom
+        points = (response.get("data") or {}).get("productById", {}).get("priceHistory", {}).get("points", [])
+        return [
+            [point["validFrom"], point["price"]["amountInclusive"]]
+            for point in points
+            if point.get("price") and "amountInclusive" in point["price"] and "validFrom" in point
+        ]
@@ -0,0 +1,57 @@
+import json
+import os
+import threading
+from typing import List, Optional
+from CONFIG.Constants import Constants
+
+
+class PriceHistoryStore:
+    """Local price history per product, stored as one compact JSON file per product
+    ([[validFrom, amountInclusive], ...] sorted by validFrom)."""
+
+    def __init__(self, directory: str = Constants.PRICE_HISTORY_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def _path(self, product_id) -> str:
+        return os.path.join(self.directory, f"{int(product_id)}.json")
+
+    def load(self, product_id) -> List[list]:
+        path = self._path(product_id)
+        if not os.path.exists(path):
+            return []
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            Constants.LOGGER.warning(f"Lokale Preishistorie für {product_id} unlesbar: {e}")
+            return []
+
+    def last_valid_from(self, product_id) -> Optional[str]:
+        series = self.load(product_id)
+        return series[-1][0] if series else None
+
+    def merge(self, product_id, points: List[list]) -> List[list]:
+        """Add new [validFrom, amount] points to the stored series and return the merged series."""
+        with self._lock:
+            series = self.load(product_id)
+            if not points:
+                return series
+            merged = {valid_from: amount for valid_from, amount in series}
+            merged.update({valid_from: amount for valid_from, amount in points})
+            series = [[valid_from, merged[valid_from]] for valid_from in sorted(merged)]
+
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(product_id)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(series, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+            return series
+
+    @staticmethod
+    def summarize(series: List[list]) -> dict:
+        if not series:
+            return {"min_price": None, "max_price": None}
+        amounts = [amount for _, amount in series]
+        return {"min_price": min(amounts), "max_price": max(amounts)}
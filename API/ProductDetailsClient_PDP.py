@@ -13,11 +13,21 @@ class ProductDetails:
         self.offer_id = offer_id
         self.shop_offer_id = shop_offer_id
         self.offer_type = offer_type
+        self.offer_signature = ""
+
+class ProductOffers:
+    """Result of the price-only query: cheapest offer plus a signature of the offer set."""
+    def __init__(self, product_id, price, offer_id, offer_type, offer_signature):
+        self.product_id = product_id
+        self.price = price
+        self.offer_id = offer_id
+        self.offer_type = offer_type
+        self.offer_signature = offer_signature
 
 class ProductDetailsClient_PDP(RequestGraphQLClient):
 
-    def get_product_details_pdp(self, product_id):
-        query = [{
+    def _build_query(self, product_id):
+        return [{
             "operationName": "PDP_GET_PRODUCT_DETAILS",
             "variables": {"productId": product_id},
             "query": """query PDP_GET_PRODUCT_DETAILS($productId: Int!) { 
@@ -29,63 +39,195 @@ class ProductDetailsClient_PDP(RequestGraphQLClient):
             }"""
         }]
 
-        try:
-            response = self.send_request(query)
-            # Debugausgabe optional
-            #print(response)
-
-            # Prüfen auf GraphQL Errors
-            if not response:
-                Constants.LOGGER.error(f"Leere Antwort für Produkt {product_id}")
-                return None
-
-            if "errors" in response[0]:
-                Constants.LOGGER.error(f"GraphQL Fehler für Produkt {product_id}: {response[0]['errors']}")
-                return None
-
-            if "data" not in response[0] or not response[0]["data"].get("productDetails"):
-                Constants.LOGGER.error(f"Keine Produktdetails gefunden für Produkt {product_id}: {response}")
-                return None
-
-            product_info = response[0]["data"]["productDetails"]
-            product_data = product_info.get("product", {})
-            
-            offers = product_info.get("offers", [])
-            product_url = product_info.get("productDetails", {}).get("canonicalUrl", "")
-            
-            images = product_data.get("images", [])
-            image_url = images[0]["url"] if images else ""
-
-            valid_offers = [
-                offer for offer in offers
-                if offer.get("supplier") and offer["supplier"].get("name")
-            ]
-
-            price = 0
-            cheapest_offer_id = None
-            cheapest_shop_offer_id = None
-            cheapest_offer_type = ''
-
-            if valid_offers:
-                cheapest_offer = min(valid_offers, key=lambda x: x["price"]["amountInclusive"])
-                price = cheapest_offer["price"]["amountInclusive"]
-                cheapest_offer_id = cheapest_offer.get("offerId")
-                cheapest_shop_offer_id = cheapest_offer.get("shopOfferId")
-                cheapest_offer_type = cheapest_offer.get("type")
-
-            return ProductDetails(
-                name=product_data.get("name", ""),
-                brand=product_data.get("brandName", ""),
-                product_id=product_id,
-                price=price,
-                image_url=image_url,
-                product_url=product_url,
-                category=product_data.get("productTypeName", ""),
-                offer_id=cheapest_offer_id,
-                shop_offer_id=cheapest_shop_offer_id,
-                offer_type=cheapest_offer_type
-            )
+    def _build_offers_query(self, product_id):
+        return [{
+            "operationName": "PDP_GET_PRODUCT_OFFERS",
+            "variables": {"productId": product_id},
+            "query": """query PDP_GET_PRODUCT_OFFERS($productId: Int!) {
+                productDetails: productDetailsV3(productId: $productId) {
+                    offers { offerId type price { amountInclusive } supplier { name } }
+                }
+            }"""
+        }]
 
+    def get_product_details_pdp(self, product_id):
+        try:
+            response = self.send_request(self._build_query(product_id))
+            return self._parse_response(product_id, response)
         except Exception as e:
             Constants.LOGGER.error(f"Fehler in get_product_details_pdp für Produkt {product_id}: {e}")
             return None
+
+    async def get_product_details_pdp_async(self, product_id):
+        """Async variant of ``get_product_details_pdp`` for use inside the service loop."""
+        try:
+            response = await self.send_request_async(self._build_query(product_id))
+            return self._parse_response(product_id, response)
+        except Exception as e:
+            Constants.LOGGER.error(f"Fehler in get_product_details_pdp_async für Produkt {product_id}: {e}")
+            return None
+
+    def get_product_offers_pdp(self, product_id):
+        """Price-only refresh: fetch just the offers of a product."""
+        try:
+            response = self.send_request(self._build_offers_query(product_id))
+            return self._parse_offers_response(product_id, response)
+        except Exception as e:
+            Constants.LOGGER.error(f"Fehler in get_product_offers_pdp für Produkt {product_id}: {e}")
+            return None
+
+    async def get_product_offers_pdp_async(self, product_id):
+        """Async variant of ``get_product_offers_pdp`` for use inside the service loop."""
+        try:
+            response = await self.send_request_async(self._build_offers_query(product_id))
+            return self._parse_offers_response(product_id, response)
+        except Exception as e:
+            Constants.LOGGER.error(f"Fehler in get_product_offers_pdp_async für Produkt {product_id}: {e}")
+            return None
+
+    async def get_product_offers_pdp_batch_async(self, product_ids):
+        """Batched variant of ``get_product_offers_pdp_async``.
+        Returns a dict product_id -> ProductOffers (or ``None``).
+        """
+        product_ids = list(product_ids)
+        if not product_ids:
+            return {}
+        try:
+            response = await self.send_request_async(self._build_batch_query(product_ids, self._build_offers_query))
+            return self._parse_batch_response(product_ids, response, self._parse_offers_response)
+        except Exception as e:
+            Constants.LOGGER.error(f"Fehler in get_product_offers_pdp_batch_async für {len(product_ids)} Produkte: {e}")
+            return {product_id: None for product_id in product_ids}
+
+    def _build_batch_query(self, product_ids, build_query=None):
+        # Mehrere Operationen in einem POST, die Antwort kommt in derselben Reihenfolge
+        build_query = build_query or self._build_query
+        return [operation for product_id in product_ids for operation in build_query(product_id)]
+
+    def get_product_details_pdp_batch(self, product_ids):
+        """Fetch the PDP details of several products with a single request.
+        Returns a dict product_id -> ProductDetails (or ``None``).
+        """
+        product_ids = list(product_ids)
+        if not product_ids:
+            return {}
+        try:
+            response = self.send_request(self._build_batch_query(product_ids))
+            return self._parse_batch_response(product_ids, response)
+        except Exception as e:
+            Constants.LOGGER.error(f"Fehler in get_product_details_pdp_batch für {len(product_ids)} Produkte: {e}")
+            return {product_id: None for product_id in product_ids}
+
+    async def get_product_details_pdp_batch_async(self, product_ids):
+        """Async variant of ``get_product_details_pdp_batch`` for use inside the service loop."""
+        product_ids = list(product_ids)
+        if not product_ids:
+            return {}
+        try:
+            response = await self.send_request_async(self._build_batch_query(product_ids))
+            return self._parse_batch_response(product_ids, response)
+        except Exception as e:
+            Constants.LOGGER.error(f"Fehler in get_product_details_pdp_batch_async für {len(product_ids)} Produkte: {e}")
+            return {product_id: None for product_id in product_ids}
+
+    def _parse_batch_response(self, product_ids, response, parse=None):
+        parse = parse or self._parse_response
+        results = {product_id: None for product_id in product_ids}
+        if not isinstance(response, list):
+            Constants.LOGGER.error(f"Unerwartete Batch-Antwort für {len(product_ids)} Produkte: {response}")
+            return results
+        if len(response) != len(product_ids):
+            Constants.LOGGER.warning(
+                f"Batch-Antwort mit {len(response)} Einträgen für {len(product_ids)} Produkte erhalten"
+            )
+        for product_id, entry in zip(product_ids, response):
+            results[product_id] = parse(product_id, [entry])
+        return results
+
+    @staticmethod
+    def _extract_product_info(product_id, response):
+        # Debugausgabe optional
+        #print(response)
+
+        # Prüfen auf GraphQL Errors
+        if not response:
+            Constants.LOGGER.error(f"Leere Antwort für Produkt {product_id}")
+            return None
+
+        if "errors" in response[0]:
+            Constants.LOGGER.error(f"GraphQL Fehler für Produkt {product_id}: {response[0]['errors']}")
+            return None
+
+        if not response[0].get("data") or not response[0]["data"].get("productDetails"):
+            Constants.LOGGER.error(f"Keine Produktdetails gefunden für Produkt {product_id}: {response}")
+            return None
+
+        return response[0]["data"]["productDetails"]
+
+    @staticmethod
+    def _cheapest_offer(offers):
+        """Cheapest offer with a supplier and the signature of all such offers."""
+        valid_offers = [
+            offer for offer in offers or []
+            if offer.get("supplier") and offer["supplier"].get("name")
+        ]
+        signature = ",".join(sorted(f"{offer.get('offerId')}:{offer.get('type')}" for offer in valid_offers))
+        if not valid_offers:
+            return None, signature
+        return min(valid_offers, key=lambda x: x["price"]["amountInclusive"]), signature
+
+    def _parse_offers_response(self, product_id, response):
+        product_info = self._extract_product_info(product_id, response)
+        if product_info is None:
+            return None
+
+        cheapest_offer, signature = self._cheapest_offer(product_info.get("offers", []))
+        if cheapest_offer is None:
+            return ProductOffers(product_id, 0, None, '', signature)
+        return ProductOffers(
+            product_id=product_id,
+            price=cheapest_offer["price"]["amountInclusive"],
+            offer_id=cheapest_offer.get("offerId"),
+            offer_type=cheapest_offer.get("type"),
+            offer_signature=signature
+        )
+
+    def _parse_response(self, product_id, response):
+        product_info = self._extract_product_info(product_id, response)
+        if product_info is None:
+            return None
+        product_data = product_info.get("product", {})
+        
+        offers = product_info.get("offers", [])
+        product_url = product_info.get("productDetails", {}).get("canonicalUrl", "")
+        
+        images = product_data.get("images", [])
+        image_url = images[0]["url"] if images else ""
+
+        cheapest_offer, signature = self._cheapest_offer(offers)
+
+        price = 0
+        cheapest_offer_id = None
+        cheapest_shop_offer_id = None
+        cheapest_offer_type = ''
+
+        if cheapest_offer is not None:
+            price = cheapest_offer["price"]["amountInclusive"]
+            cheapest_offer_id = cheapest_offer.get("offerId")
+            cheapest_shop_offer_id = cheapest_offer.get("shopOfferId")
+            cheapest_offer_type = cheapest_offer.get("type")
+
+        details = ProductDetails(
+            name=product_data.get("name", ""),
+            brand=product_data.get("brandName", ""),
+            product_id=product_id,
+            price=price,
+            image_url=image_url,
+            product_url=product_url,
+            category=product_data.get("productTypeName", ""),
+            offer_id=cheapest_offer_id,
+            shop_offer_id=cheapest_shop_offer_id,
+            offer_type=cheapest_offer_type
+        )
+        details.offer_signature = signature
+        return details
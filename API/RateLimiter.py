@@ -0,0 +1,106 @@
+import time
+import random
+import asyncio
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from CONFIG.Constants import Constants
+
+
+class RateLimiter:
+    """Adaptive token bucket, one instance per endpoint shared by all clients.
+
+    The refill rate grows additively after successful requests and is cut
+    multiplicatively on 429/5xx responses (AIMD). A ``Retry-After`` header
+    blocks the whole endpoint until it has passed. Must only be used from
+    the PlaywrightService loop.
+    """
+
+    _limiters = {}
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        endpoint: str,
+        rate: float = Constants.RATE_LIMIT_RATE,
+        min_rate: float = Constants.RATE_LIMIT_MIN_RATE,
+        max_rate: float = Constants.RATE_LIMIT_MAX_RATE,
+        burst: int = Constants.RATE_LIMIT_BURST,
+    ):
+        self.endpoint = endpoint
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self.throttled = 0
+        self.server_errors = 0
+
+    @classmethod
+    def for_endpoint(cls, endpoint: str) -> "RateLimiter":
+        with cls._lock:
+            if endpoint not in cls._limiters:
+                cls._limiters[endpoint] = cls(endpoint)
+            return cls._limiters[endpoint]
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available for this endpoint."""
+        while True:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                wait = self._blocked_until - now
+            else:
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            await asyncio.sleep(wait + random.uniform(0, wait * Constants.RATE_LIMIT_JITTER))
+
+    def on_success(self) -> None:
+        self.rate = min(self.max_rate, self.rate + Constants.RATE_LIMIT_INCREASE)
+
+    def on_throttle(self, retry_after: float | None = None) -> None:
+        self.throttled += 1
+        self._decrease()
+        if retry_after:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+        Constants.LOGGER.warning(
+            f"[RateLimiter] 429 für {self.endpoint}, Rate {self.rate:.2f}/s, Retry-After {retry_after}"
+        )
+
+    def on_server_error(self) -> None:
+        self.server_errors += 1
+        self._decrease()
+
+    def _decrease(self) -> None:
+        self.rate = max(self.min_rate, self.rate * Constants.RATE_LIMIT_DECREASE)
+        self._tokens = min(self._tokens, 0.0)
+
+    @staticmethod
+    def parse_retry_after(value) -> float | None:
+        """Retry-After as seconds (delta-seconds or HTTP-date), ``None`` if absent/invalid."""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            pass
+        try:
+            return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+    def stats(self) -> dict:
+        return {
+            "endpoint": self.endpoint,
+            "rate": round(self.rate, 2),
+            "throttled": self.throttled,
+            "server_errors": self.server_errors,
+        }
@@ -1,16 +1,19 @@
-import json
-import time
+import random
 import threading
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 from typing import Any
-from playwright.async_api import async_playwright
 from CONFIG.Constants import Constants
+from API.PlaywrightPagePool import PlaywrightPagePool
+from API.GraphQLTransport import GraphQLTransport
+from API.RateLimiter import RateLimiter
+from API.CircuitBreaker import CircuitBreaker, CircuitOpenError
+from API.CassetteTransport import CassetteMiss
 
 
 class PlaywrightService:
     """Singleton service that runs one asyncio event loop in a background thread
-    and owns a single Playwright browser/context/page to be reused for requests.
+    and owns a single Playwright browser/context with a pool of pages to be
+    reused for requests. The browser is launched lazily by ensure_started().
     """
     _instance = None
     _lock = threading.Lock()
@@ -25,25 +28,46 @@ class PlaywrightService:
         self._playwright = None
         self._browser = None
         self._context = None
-        self._page = None
-
-        # start Playwright inside the background loop and wait for completion
-        fut = asyncio.run_coroutine_threadsafe(self._start_async(), self.loop)
-        fut.result()  # wait until ready
+        self._page_pool = None
+        self._start_lock = None
 
     def _run_loop(self):
         # Bind the loop to this thread and run forever
         asyncio.set_event_loop(self.loop)
         self.loop.run_forever()
 
+    async def ensure_started(self):
+        """Launch the browser on first use (runs inside the background loop)."""
+        if self._page_pool is not None:
+            return
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._page_pool is None:
+                Constants.LOGGER.info("[PlaywrightService] Starte Browser")
+                await self._start_async()
+
+    @property
+    def is_started(self) -> bool:
+        return self._page_pool is not None
+
     async def _start_async(self):
+        # imported lazily: the browserless transport does not need Playwright at all
+        from playwright.async_api import async_playwright
         self._playwright = await async_playwright().start()
         # you can change browser to chromium or webkit if you prefer
         self._browser = await self._playwright.firefox.launch(headless=True)
         self._context = await self._browser.new_context()
-        self._page = await self._context.new_page()
-        # optional: set default timeout for the page requests
-        # self._page.set_default_timeout(30_000)
+        self._page_pool = PlaywrightPagePool(self._context, Constants.PLAYWRIGHT_POOL_SIZE)
+        await self._page_pool.start()
+
+    @property
+    def page_pool(self) -> PlaywrightPagePool:
+        return self._page_pool
+
+    def pool_stats(self) -> dict:
+        """Current utilization of the page pool (size, in_use, waiting, recycled ...)."""
+        return self._page_pool.stats() if self._page_pool is not None else {}
 
     def submit_coro(self,coro):
         """Schedule a coroutine in the background loop and return a concurrent.futures.Future."""
@@ -58,7 +82,7 @@ class PlaywrightService:
 
     def close(self):
         """Shut down Playwright and stop the loop. Call explicitly when your program exits."""
-        if self._playwright is None:
+        if not self.thread.is_alive():
             return
         fut = self.submit_coro(self._close_async())
         fut.result()
@@ -68,8 +92,10 @@ class PlaywrightService:
 
     async def _close_async(self):
         try:
-            if self._page is not None:
-                await self._page.close()
+            if GraphQLTransport._instance is not None:
+                await GraphQLTransport._instance.close()
+            if self._page_pool is not None:
+                await self._page_pool.close()
             if self._context is not None:
                 await self._context.close()
             if self._browser is not None:
@@ -81,8 +107,15 @@ class PlaywrightService:
             pass
 
 
+class HTTPStatusError(Exception):
+    def __init__(self, status: int, retry_after: float = None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
 class RequestGraphQLClient:
-    """GraphQL client that uses the shared PlaywrightService.
+    """GraphQL client that uses the shared PlaywrightService loop and transport.
     send_request(...) is synchronous from caller perspective, but runs the actual work
     inside the service's background loop so many requests can run concurrently.
     """
@@ -95,23 +128,46 @@ class RequestGraphQLClient:
         # keep timeout in milliseconds for Playwright
         self.timeout_ms = timeout * 1000
         self._service = PlaywrightService.instance()
+        self._transport = GraphQLTransport.instance(self._service)
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        # resolved per call: subclasses may override BASE_URL after __init__
+        return RateLimiter.for_endpoint(self.BASE_URL)
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        return CircuitBreaker.for_endpoint(self.BASE_URL)
 
     async def _request_coro(self, payload: Any):
         """Coroutine executed inside the background loop. Implements retries/backoff async."""
-        page = self._service._page
+        if getattr(self._transport, "offline", False):
+            # Kassetten-Replay: kein Server, also weder Rate-Limit noch Circuit Breaker
+            resp = await self._transport.post(self.BASE_URL, payload, self.timeout_ms)
+            return resp.json()
+        limiter = self.rate_limiter
+        breaker = self.circuit_breaker
         for attempt in range(1, self.max_retries + 1):
+            retry_after = None
+            # fail fast without retries while the endpoint is considered down
+            if not breaker.allow_request():
+                raise CircuitOpenError(f"Circuit für {self.BASE_URL} ist offen")
             try:
-                resp = await page.request.post(
-                    self.BASE_URL,
-                    data=json.dumps(payload),
-                    headers={"Content-Type": "application/json", **Constants.HEADERS},
-                    timeout=self.timeout_ms,
-                )
+                resp = await self._post(limiter, breaker, payload)
 
+                if resp.status == 429:
+                    retry_after = RateLimiter.parse_retry_after(
+                        {k.lower(): v for k, v in resp.headers.items()}.get("retry-after")
+                    )
+                    limiter.on_throttle(retry_after)
+                    raise HTTPStatusError(resp.status, retry_after)
+                if resp.status >= 500:
+                    limiter.on_server_error()
                 if not resp.ok:
-                    raise Exception(f"HTTP {resp.status}")
+                    raise HTTPStatusError(resp.status)
 
-                data = await resp.json()
+                limiter.on_success()
+                data = resp.json()
 
                 if "errors" in data:
                     Constants.LOGGER.error(f"GraphQL errors: {data['errors']}")
@@ -124,16 +180,45 @@ class RequestGraphQLClient:
                     f"[RequestGraphQLClient] Payload: {payload} :Attempt {attempt} failed: {e}"
                 )
 
+                if isinstance(e, CassetteMiss):
+                    raise
                 if attempt == self.max_retries:
                     Constants.LOGGER.error(
                         f"[RequestGraphQLClient] Max retries {self.max_retries} reached. Giving up."
                     )
                     raise
 
-                sleep_time = self.backoff_factor * (2 ** (attempt - 1))
+                sleep_time = max(retry_after or 0, self.backoff_factor * (2 ** (attempt - 1)))
+                sleep_time += random.uniform(0, sleep_time * Constants.RATE_LIMIT_JITTER)
                 Constants.LOGGER.info(f"[RequestGraphQLClient] Retrying in {sleep_time:.1f} seconds...")
                 await asyncio.sleep(sleep_time)
 
+    async def _post(self, limiter: RateLimiter, breaker: CircuitBreaker, payload: Any):
+        """One transport call. Every outcome settles the breaker, so a half-open
+        probe is never left taken, e.g. when the caller cancels the request."""
+        try:
+            await limiter.acquire()
+            resp = await self._transport.post(self.BASE_URL, payload, self.timeout_ms)
+        except CassetteMiss:
+            breaker.release_probe()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            # Abbruch (CancelledError) sagt nichts über den Endpunkt aus: Probe nur freigeben
+            breaker.release_probe()
+            raise
+
+        if resp.status >= 500:
+            breaker.record_failure()
+        elif resp.status == 429:
+            # gedrosselt: der Endpunkt lebt, ist aber nicht nachweislich gesund
+            breaker.release_probe()
+        else:
+            breaker.record_success()
+        return resp
+
     def send_request(self, payload: Any, future_timeout: float = None):
         """Sync method for callers: schedules the async coroutine and waits for result.
         future_timeout is an optional timeout (seconds) to wait for whole operation.
@@ -146,6 +231,26 @@ class RequestGraphQLClient:
             # bubble up (or wrap) the exception as before
             raise
 
+    async def send_request_async(self, payload: Any):
+        """Async counterpart of send_request. Must be awaited inside the service loop,
+        e.g. from a coroutine scheduled via run_coro(...).
+        """
+        return await self._request_coro(payload)
+
+    def run_coro(self, coro, future_timeout: float = None):
+        """Run an arbitrary coroutine in the service loop and wait for its result.
+        Used to fan out many send_request_async calls concurrently.
+        """
+        return self._service.submit_coro(coro).result(timeout=future_timeout)
+
+    def transport_stats(self) -> dict:
+        """Active transport and how often the browser fallback was triggered."""
+        return GraphQLTransport.stats(self._transport)
+
+    def pool_stats(self) -> dict:
+        """Page pool utilization of the shared browser (empty while no browser runs)."""
+        return self._service.pool_stats()
+
     def close(self):
         # optional: nothing to do per-client because service is shared
         pass
@@ -0,0 +1,149 @@
+"""Throughput benchmark of the GraphQL clients against FakeGraphQLServer.
+
+    python -m BENCHMARK.ClientBenchmark --sizes 100 1000 10000 --latency-ms 50
+
+Measures requests/s and p50/p95/p99 latency of RequestGraphQLClient, the
+bulk fetch of ProductClient and the end-to-end GalaxoProcess refresh. The
+catalog, caches and backups live in a temporary directory; the real
+galaxo_data.json is not touched.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from CONFIG.Constants import Constants
+from BENCHMARK.FakeGraphQLServer import FakeGraphQLServer, LatencyModel
+
+
+def _percentiles(latencies: list) -> dict:
+    if len(latencies) < 2:
+        value = round(latencies[0] * 1000, 1) if latencies else 0.0
+        return {"p50_ms": value, "p95_ms": value, "p99_ms": value}
+    q = statistics.quantiles(latencies, n=100)
+    return {"p50_ms": round(q[49] * 1000, 1), "p95_ms": round(q[94] * 1000, 1), "p99_ms": round(q[98] * 1000, 1)}
+
+
+def _configure(server: FakeGraphQLServer, workdir: str, rate: float) -> None:
+    """Point clients, storage and caches at the fake server and the temp directory."""
+    Constants.GRAPHQL_TRANSPORT = "http"
+    Constants.BASE_URL_HISTORY = server.history_url
+    Constants.JSON_PATH = os.path.join(workdir, "galaxo_data.json")
+    Constants.JSON_BACKUP_PATH = os.path.join(workdir, "Backup")
+    Constants.SQLITE_PATH = os.path.join(workdir, "galaxo_data.sqlite")
+    Constants.OBSERVATION_DIR = os.path.join(workdir, "Observations")
+
+    from API.RequestGraphQLClient import RequestGraphQLClient
+    from API.RateLimiter import RateLimiter
+    from PROCESS.ResponseCache import ResponseCache
+    RequestGraphQLClient.BASE_URL = server.base_url
+    for url in (server.base_url, server.history_url):
+        RateLimiter._limiters[url] = RateLimiter(url, rate=rate, max_rate=rate, burst=int(rate))
+    ResponseCache._instance = ResponseCache(path=os.path.join(workdir, "response_cache.json"))
+
+
+def bench_raw_requests(n: int, concurrency: int) -> dict:
+    """n single PDP requests through RequestGraphQLClient, ``concurrency`` in flight."""
+    from API.ProductDetailsClient_PDP import ProductDetailsClient_PDP
+    client = ProductDetailsClient_PDP()
+    latencies = []
+
+    async def _run():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _one(product_id):
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    await client.send_request_async(client._build_query(product_id))
+                finally:
+                    latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(_one(pid) for pid in range(1, n + 1)), return_exceptions=True)
+
+    start = time.perf_counter()
+    client.run_coro(_run())
+    duration = time.perf_counter() - start
+    return {"requests": n, "duration_s": round(duration, 3), "rps": round(n / duration, 1), **_percentiles(latencies)}
+
+
+def bench_bulk_fetch(n: int, concurrency: int, batch_size: int) -> dict:
+    from PROCESS.ProductClient import ProductClient
+    client = ProductClient()
+    start = time.perf_counter()
+    results = client.get_full_product_details_bulk(
+        range(1, n + 1), include_price_history=False, max_concurrency=concurrency, batch_size=batch_size
+    )
+    duration = time.perf_counter() - start
+    ok = sum(1 for details in results.values() if details)
+    return {"products": n, "ok": ok, "duration_s": round(duration, 3), "products_per_s": round(n / duration, 1)}
+
+
+def bench_end_to_end(n: int, concurrency: int, batch_size: int) -> dict:
+    from PROCESS.GalaxoProcess import GalaxoProcess
+    from PROCESS.ProductStorage import ProductStorage
+    ProductStorage.save_products([
+        {"product_id": pid, "current_price": 10.0, "min_price": 10.0, "max_price": 10.0, "stock_count": 1}
+        for pid in range(1, n + 1)
+    ])
+    start = time.perf_counter()
+    galaxo_process = GalaxoProcess()
+    stats = galaxo_process.process_update_prices(
+        max_concurrency=concurrency, batch_size=batch_size, only_due=False
+    )
+    # schreibt ausstehende Änderungen und beendet den Schreib-Thread
+    galaxo_process.close()
+    duration = time.perf_counter() - start
+    return {"products": n, "succeeded": stats.succeeded, "failed": stats.failed,
+            "duration_s": round(duration, 3), "products_per_s": round(n / duration, 1)}
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--latency", choices=["constant", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--latency-spread", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=Constants.REFRESH_MAX_CONCURRENCY)
+    parser.add_argument("--batch-size", type=int, default=Constants.GRAPHQL_BATCH_SIZE)
+    parser.add_argument("--rate", type=float, default=1000.0, help="Rate-Limit pro Endpunkt (Anfragen/s)")
+    args = parser.parse_args(argv)
+
+    server = FakeGraphQLServer(
+        catalog_size=max(args.sizes),
+        latency=LatencyModel(args.latency, args.latency_ms, args.latency_spread),
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+    ).start()
+    workdir = tempfile.mkdtemp(prefix="galaxo_bench_")
+    _configure(server, workdir, args.rate)
+
+    results = []
+    try:
+        for n in args.sizes:
+            result = {
+                "size": n,
+                "raw_requests": bench_raw_requests(n, args.concurrency),
+                "bulk_fetch": bench_bulk_fetch(n, args.concurrency, args.batch_size),
+                "end_to_end": bench_end_to_end(n, args.concurrency, args.batch_size),
+                "server": server.stats(),
+            }
+            results.append(result)
+            print(json.dumps(result), flush=True)
+    finally:
+        server.stop()
+
+    print(f"{'Produkte':>9} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'bulk s':>8} {'refresh s':>10}")
+    for result in results:
+        raw = result["raw_requests"]
+        print(f"{result['size']:>9} {raw['rps']:>9} {raw['p50_ms']:>8} {raw['p95_ms']:>8} {raw['p99_ms']:>8} "
+              f"{result['bulk_fetch']['duration_s']:>8} {result['end_to_end']['duration_s']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import base64
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+@dataclass
+class LatencyModel:
+    """Server side latency per request in milliseconds.
+    kind: "constant" (mean), "uniform" (mean ± spread) or "lognormal" (median mean, sigma spread)."""
+    kind: str = "lognormal"
+    mean_ms: float = 50.0
+    spread: float = 0.5
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "constant":
+            return self.mean_ms / 1000
+        if self.kind == "uniform":
+            return max(0.0, rng.uniform(self.mean_ms * (1 - self.spread), self.mean_ms * (1 + self.spread))) / 1000
+        return rng.lognormvariate(0, self.spread) * self.mean_ms / 1000
+
+
+class FakeGraphQLServer:
+    """Local stand-in for the Galaxus GraphQL endpoints.
+
+    Answers PDP_GET_PRODUCT_DETAILS, PDP_GET_PRODUCT_OFFERS and
+    GET_OFFER_AVAILABILITY_V2 (also batched) on ``base_url`` and the
+    priceChartQuery on ``history_url`` for a synthetic catalog of
+    ``catalog_size`` products with ids 1..catalog_size.
+    """
+
+    def __init__(self, catalog_size: int = 1000, latency: LatencyModel = None,
+                 error_rate: float = 0.0, throttle_rate: float = 0.0, retry_after: int = 1,
+                 seed: int = 42, host: str = "127.0.0.1", port: int = 0):
+        self.catalog_size = catalog_size
+        self.latency = latency or LatencyModel()
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.requests = 0
+        self.operations = 0
+        self.errors = 0
+        self.throttled = 0
+        self._httpd = _Server((host, port), self._handler_class())
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self._httpd.server_address[0]}:{self._httpd.server_address[1]}/api/graphql"
+
+    @property
+    def history_url(self) -> str:
+        return f"http://{self._httpd.server_address[0]}:{self._httpd.server_address[1]}/graphql/o/fake/priceChartQuery"
+
+    def start(self) -> "FakeGraphQLServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def stats(self) -> dict:
+        return {"requests": self.requests, "operations": self.operations,
+                "errors": self.errors, "throttled": self.throttled}
+
+    # --- Katalog ---
+
+    def _product(self, product_id: int) -> dict | None:
+        if not 1 <= product_id <= self.catalog_size:
+            return None
+        rng = random.Random(self.seed * 1_000_003 + product_id)
+        base_price = round(rng.uniform(5, 2000), 2)
+        offers = [
+            {"id": f"o{product_id}-{i}", "productId": product_id, "offerId": product_id * 10 + i,
+             "shopOfferId": product_id * 100 + i, "type": "RETAIL" if i == 0 else "MARKETPLACE",
+             "price": {"amountInclusive": round(base_price * (1 + 0.05 * i), 2)},
+             "supplier": {"name": f"Supplier {i}"}}
+            for i in range(rng.randint(1, 3))
+        ]
+        return {
+            "product": {"id": f"p{product_id}", "productId": product_id, "name": f"Produkt {product_id}",
+                        "productTypeName": f"Kategorie {product_id % 25}", "brandName": f"Marke {product_id % 97}",
+                        "images": [{"url": f"https://static.example.invalid/{product_id}.jpg"}]},
+            "offers": offers,
+            "productDetails": {"canonicalUrl": f"https://www.galaxus.ch/de/s1/product/produkt-{product_id}"},
+        }
+
+    def _answer_operation(self, operation: dict) -> dict:
+        variables = operation.get("variables", {})
+        name = operation.get("operationName")
+        if name in ("PDP_GET_PRODUCT_DETAILS", "PDP_GET_PRODUCT_OFFERS"):
+            product = self._product(int(variables.get("productId", 0)))
+            if product is None:
+                return {"data": {"productDetails": None}}
+            if name == "PDP_GET_PRODUCT_OFFERS":
+                product = {"offers": product["offers"]}
+            return {"data": {"productDetails": product}}
+        if name == "GET_OFFER_AVAILABILITY_V2":
+            stock = (int(variables.get("salesOfferId", 0)) * 7) % 50
+            return {"data": {"offerAvailabilityV2": {"id": "a", "mail": {"stockDetails": {"stockCount": stock}}}}}
+        return {"errors": [{"message": f"Unknown operation {name}"}]}
+
+    def _answer_history(self, payload: dict) -> dict:
+        encoded = payload.get("variables", {}).get("id", "")
+        try:
+            product_id = int(base64.b64decode(encoded).decode().split("\nd", 1)[1].split(":", 1)[0])
+        except (ValueError, IndexError):
+            product_id = 0
+        product = self._product(product_id)
+        if product is None:
+            return {"data": {"productById": None}}
+        history_from = payload.get("variables", {}).get("historyFrom")
+        price = product["offers"][0]["price"]["amountInclusive"]
+        points = [
+            {"price": {"amountInclusive": round(price * (1 + 0.02 * ((month * 7) % 5 - 2)), 2)},
+             "validFrom": f"2025-{month:02d}-01T00:00:00Z"}
+            for month in range(1, 13)
+        ]
+        if history_from:
+            points = [point for point in points if point["validFrom"] > history_from]
+        return {"data": {"productById": {"priceHistory": {"points": points}}}}
+
+    # --- HTTP ---
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Header und Body gehen in getrennten Writes raus: ohne TCP_NODELAY
+            # warten sie auf das verzögerte ACK des Clients (~40 ms pro Antwort)
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: dict, headers: dict = None):
+                raw = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"null")
+                with server._rng_lock:
+                    server.requests += 1
+                    delay = server.latency.sample(server._rng)
+                    roll = server._rng.random()
+                time.sleep(delay)
+
+                if roll < server.throttle_rate:
+                    server.throttled += 1
+                    return self._send(429, {"error": "Too Many Requests"}, {"Retry-After": str(server.retry_after)})
+                if roll < server.throttle_rate + server.error_rate:
+                    server.errors += 1
+                    return self._send(500, {"error": "Internal Server Error"})
+
+                if self.path.endswith("priceChartQuery"):
+                    server.operations += 1
+                    return self._send(200, server._answer_history(payload))
+                operations = payload if isinstance(payload, list) else [payload]
+                server.operations += len(operations)
+                self._send(200, [server._answer_operation(operation) for operation in operations])
+
+        return Handler
@@ -0,0 +1,95 @@
+"""Memory footprint of the in-memory catalog on a synthetic catalog.
+
+    python -m BENCHMARK.MemoryBenchmark --size 100000
+
+Compares the former representation (dataclass with a __dict__ per instance,
+every string a separate object as returned by the JSON parser) with the
+current slotted ProductData whose repeated strings are interned. Both are
+built from the same JSON lines through ProductFactory.from_sources, so the
+build times include the same derived-field computation. Memory is the size
+retained by the product list, measured with tracemalloc.
+"""
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import MISSING, field, fields, make_dataclass
+from unittest import mock
+
+from BENCHMARK.StorageBenchmark import _catalog
+
+
+def _measure(build) -> dict:
+    # Aufbauzeit ohne tracemalloc messen, das Tracing verlangsamt jede Allokation
+    gc.collect()
+    start = time.perf_counter()
+    products = build()
+    duration = time.perf_counter() - start
+    del products
+    gc.collect()
+    tracemalloc.start()
+    products = build()
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"bytes": retained, "per_product": retained / max(1, len(products)), "build_s": duration}
+
+
+@contextmanager
+def _legacy_representation():
+    """ProductFactory builds a dataclass with __dict__ and interns nothing."""
+    import PROCESS.ProductFactory
+    from PROCESS.ProductData import ProductData
+    methods = {name: value for name, value in vars(ProductData).items()
+               if callable(value) and not name.startswith("__")}
+    legacy = make_dataclass(
+        "LegacyProductData",
+        [(f.name, f.type) if f.default is MISSING else (f.name, f.type, field(default=f.default))
+         for f in fields(ProductData)],
+        namespace=methods,
+    )
+    with mock.patch.object(PROCESS.ProductFactory, "ProductData", legacy), \
+            mock.patch.object(sys, "intern", lambda value: value):
+        yield
+
+
+def _build(lines: list[str]) -> list:
+    from PROCESS.ProductFactory import ProductFactory
+    return ProductFactory.from_sources(json.loads(line) for line in lines)
+
+
+def bench_legacy(lines: list[str]) -> dict:
+    with _legacy_representation():
+        return _measure(lambda: _build(lines))
+
+
+def bench_slotted(lines: list[str]) -> dict:
+    return _measure(lambda: _build(lines))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    # wie aus der Datei gelesen: jedes Produkt eine eigene JSON-Zeile
+    lines = [json.dumps(p, ensure_ascii=False) for p in _catalog(args.size)]
+    results = {
+        "dataclass (__dict__)": bench_legacy(lines),
+        "slots + intern": bench_slotted(lines),
+    }
+
+    print(f"{args.size} Produkte")
+    print(f"{'Darstellung':<22} {'MB':>8} {'Bytes/Produkt':>14} {'Aufbau s':>9}")
+    for name, result in results.items():
+        print(f"{name:<22} {result['bytes'] / 1e6:>8.1f} {result['per_product']:>14.0f} {result['build_s']:>9.2f}")
+    legacy, slotted = results["dataclass (__dict__)"], results["slots + intern"]
+    print(f"Ersparnis: {(1 - slotted['bytes'] / legacy['bytes']) * 100:.0f}%, "
+          f"Aufbau: {(slotted['build_s'] / legacy['build_s'] - 1) * 100:+.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Load/save benchmark of the product storage on a synthetic catalog.
+
+    python -m BENCHMARK.StorageBenchmark --size 50000
+
+Compares the former pretty-printed json.dump/json.load file with the
+journaled JSON backend for every available codec (json/orjson, without and
+with gzip/zstd compression) and with the SQLite backend. Everything is
+written to a temporary directory.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from CONFIG.Constants import Constants
+
+
+def _catalog(size: int, seed: int = 1) -> list[dict]:
+    from PROCESS.ProductFactory import ProductFactory
+    rng = random.Random(seed)
+    categories = [f"Kategorie {i}" for i in range(60)]
+    brands = [f"Marke {i}" for i in range(400)]
+    products = []
+    for product_id in range(1, size + 1):
+        price = round(rng.uniform(5, 2500), 2)
+        products.append(ProductFactory.from_source({
+            "product_id": 1000000 + product_id,
+            "product_name": f"Produkt {product_id} mit einem etwas längeren Namen",
+            "brand_name": rng.choice(brands),
+            "category_name": rng.choice(categories),
+            "current_price": price,
+            "old_price": round(price * rng.uniform(0.9, 1.1), 2),
+            "stock_count": rng.randint(0, 50),
+            "min_price": round(price * 0.8, 2),
+            "max_price": round(price * 1.3, 2),
+            "url": f"https://www.galaxus.ch/de/s1/product/{1000000 + product_id}",
+            "image_url": f"https://static.digitecgalaxus.ch/Files/{product_id}.jpg",
+            "insert_date": 1700000000 + product_id,
+        }).to_dict())
+    return products
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def _file_size(*paths) -> int:
+    return sum(os.path.getsize(path) for path in paths if os.path.exists(path))
+
+
+def bench_legacy(products: list[dict], workdir: str) -> dict:
+    """The storage before the codec layer: indent=2, full parse, then ProductData."""
+    from PROCESS.ProductFactory import ProductFactory
+    path = os.path.join(workdir, "legacy.json")
+
+    def _save():
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(products, f, ensure_ascii=False, indent=2)
+
+    def _load():
+        with open(path, "r", encoding="utf-8") as f:
+            return [ProductFactory.from_source(p) for p in json.load(f)]
+
+    save_s, _ = _timed(_save)
+    load_s, _ = _timed(_load)
+    return {"save_s": save_s, "save_one_ms": save_s * 1000, "load_s": load_s, "bytes": _file_size(path)}
+
+
+def bench_journaled(products: list[dict], workdir: str, library: str, compression: str) -> dict:
+    from PROCESS.JournaledJsonStorage import JournaledJsonStorage
+    from PROCESS.ProductFactory import ProductFactory
+    from PROCESS.ProductStorage import ProductStorage
+    from PROCESS.StorageCodec import StorageCodec
+    codec = StorageCodec(library, compression)
+    path = os.path.join(workdir, f"journaled_{library}_{compression}.json")
+    stored = [ProductStorage._stored_fields(p) for p in products]
+
+    storage = JournaledJsonStorage(path, compact_records=10 ** 9, codec=codec)
+    storage._loaded = True
+
+    def _save():
+        storage.save_products(stored)
+        storage.compact()
+
+    save_s, _ = _timed(_save)
+    changed = dict(stored[len(stored) // 2], current_price=1.0)
+    save_one_s, _ = _timed(lambda: storage.upsert_products([changed]))
+    storage.close()
+
+    reader = JournaledJsonStorage(path, codec=codec)
+    load_s, _ = _timed(lambda: [ProductFactory.from_source(p) for p in reader.iter_products()])
+    return {"save_s": save_s, "save_one_ms": save_one_s * 1000, "load_s": load_s,
+            "bytes": _file_size(path, reader.journal_path), "codec": codec.library, "compression": codec.compression}
+
+
+def bench_sqlite(products: list[dict], workdir: str) -> dict:
+    from PROCESS.ProductFactory import ProductFactory
+    from PROCESS.ProductStorage import ProductStorage
+    from PROCESS.SQLiteProductStorage import SQLiteProductStorage
+    path = os.path.join(workdir, "products.sqlite")
+    stored = [ProductStorage._stored_fields(p) for p in products]
+
+    storage = SQLiteProductStorage(path)
+    save_s, _ = _timed(lambda: storage.save_products(stored))
+    changed = dict(stored[len(stored) // 2], current_price=1.0)
+    save_one_s, _ = _timed(lambda: storage.upsert_products([changed]))
+    storage.close()
+
+    reader = SQLiteProductStorage(path)
+    load_s, _ = _timed(lambda: [ProductFactory.from_source(p) for p in reader.iter_products()])
+    reader.close()
+    return {"save_s": save_s, "save_one_ms": save_one_s * 1000, "load_s": load_s,
+            "bytes": _file_size(path, f"{path}-wal")}
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=50000)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="galaxo_storage_bench_")
+    # Migration und Backups dürfen die echten Dateien nicht anfassen
+    Constants.JSON_PATH = os.path.join(workdir, "galaxo_data.json")
+    Constants.JSON_BACKUP_PATH = os.path.join(workdir, "Backup")
+
+    products = _catalog(args.size)
+    results = {"legacy (indent=2, json)": bench_legacy(products, workdir)}
+    for library in ("json", "orjson"):
+        for compression in ("none", "gzip", "zstd"):
+            result = bench_journaled(products, workdir, library, compression)
+            name = f"journal {result['codec']}/{result['compression']}"
+            results.setdefault(name, result)
+    results["sqlite"] = bench_sqlite(products, workdir)
+
+    print(f"{args.size} Produkte")
+    print(f"{'Format':<26} {'save s':>8} {'1 Produkt ms':>13} {'load s':>8} {'MB':>7}")
+    for name, result in results.items():
+        print(f"{name:<26} {result['save_s']:>8.3f} {result['save_one_ms']:>13.3f} "
+              f"{result['load_s']:>8.3f} {result['bytes'] / 1e6:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
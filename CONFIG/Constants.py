@@ -14,6 +14,35 @@ class Constants:
     JSON_PATH = os.path.join(BASE_PATH, "galaxo_data.json")
     JSON_BACKUP_PATH = os.path.join(BASE_PATH,'Backup')
     JSON_BACKUP_FILE_NAMES = "galaxo_data_backup_"
+    BACKUP_KEEP_COUNT = 5           # höchstens so viele Backups behalten
+    BACKUP_MAX_AGE_DAYS = 90        # ältere Backups löschen (das neueste bleibt immer), 0 = kein Alterslimit
+    BACKUP_EXIT_TIMEOUT = 10        # Sekunden, die beim Beenden auf ein laufendes Backup gewartet wird
+    STORAGE_BACKEND = "json"  # json (galaxo_data.json) oder sqlite (galaxo_data.sqlite, migriert die JSON-Datei einmalig)
+    SQLITE_PATH = os.path.join(BASE_PATH, "galaxo_data.sqlite")
+    STORAGE_JSON_LIBRARY = "auto"   # auto (orjson falls installiert), orjson, json
+    STORAGE_COMPRESSION = "none"    # none, gzip oder zstd (Paket zstandard) für den JSON-Snapshot
+    STORAGE_DERIVED_FIELDS = (      # werden beim Laden neu berechnet und daher nicht gespeichert
+        'price_change', 'percentage_diff', 'old_price_percentage', 'price_changed_flag',
+        'stock_changed_flag', 'stock_count_change', 'both_changed_flag', 'min_flag', 'max_flag',
+        'min_price_erreicht', 'max_price_erreicht', 'preisverlust_percentage',
+    )
+    JOURNAL_COMPACT_RECORDS = 1000  # Journal-Einträge, ab denen im Hintergrund ein neuer JSON-Snapshot geschrieben wird
+    JOURNAL_FSYNC = False           # jeden Journal-Eintrag mit fsync sichern (langsamer, übersteht Stromausfall)
+    STORAGE_LOCK_TIMEOUT = 30       # Sekunden, die auf die Sperre eines anderen Prozesses (GUI, Cron) gewartet wird
+    PRICE_HISTORY_DIR = os.path.join(BASE_PATH, 'PriceHistory')
+    OBSERVATION_DIR = os.path.join(BASE_PATH, 'Observations')  # eigene Preis-/Lagerbeobachtungen
+    OBSERVATION_COMPACT_ROWS = 50000   # Log-Zeilen, ab denen in das sortierte Segment kompaktiert wird
+    OBSERVATION_RETENTION_DAYS = 730   # ältere Beobachtungen werden beim Kompaktieren verworfen, 0 = nie
+    RESPONSE_CACHE_PATH = os.path.join(BASE_PATH, 'Cache', 'response_cache.json')
+    RESPONSE_CACHE_MAX_ENTRIES = 20000
+    RESPONSE_CACHE_FIELD_TTLS = {  # Sekunden, nur statische Produktdaten
+        'product_name': 7 * 86400,
+        'brand_name': 30 * 86400,
+        'category_name': 30 * 86400,
+        'url': 7 * 86400,
+        'image_url': 3 * 86400,
+        'offer_signature': 30 * 86400,  # Angebotsmenge für die reine Preisabfrage
+    }
 
     #GUI
     TITLE="Galaxus/Digitec Produkte"
@@ -81,8 +110,52 @@ class Constants:
     }
     BASE_URL = 'https://www.galaxus.ch/api/graphql'
     BASE_URL_HISTORY = "https://www.galaxus.ch/graphql/o/690220b748da1f61bfd7e73d7bf89b53/priceChartQuery" # kann sich ändern
+
+    #Refresh
+    REFRESH_CONCURRENT = True       # Preise parallel im Service-Loop aktualisieren
+    REFRESH_PRICE_ONLY = True       # nur Preis/Lager abfragen, volle PDP nur bei neuen Angeboten
+    REFRESH_MAX_CONCURRENCY = 8     # max. gleichzeitige Anfragen (Produkte bzw. Batches)
+    REFRESH_FAILURE_BUDGET = 0.25   # Anteil fehlgeschlagener Produkte, ab dem ein Lauf abbricht
+    REFRESH_FAILURE_BUDGET_MIN = 10 # ... aber frühestens nach so vielen Fehlern
+    REFRESH_ONLY_DUE = True         # nur fällige Produkte laut RefreshScheduler aktualisieren
+    GRAPHQL_BATCH_SIZE = 20         # Operationen pro GraphQL-POST, 1 = kein Batching
+    PLAYWRIGHT_POOL_SIZE = 4        # Anzahl Seiten im Playwright-Pool
+    GRAPHQL_TRANSPORT = "auto"      # auto (HTTP, Browser nur bei Ablehnung), http, browser
+    HTTP_POOL_SIZE = 16             # Keep-Alive-Verbindungen des HTTP-Transports
+    TRANSPORT_RETRY_HTTP_AFTER = 600  # Sekunden im Browser-Fallback bis HTTP erneut versucht wird
+    CIRCUIT_FAILURE_THRESHOLD = 5   # Fehler in Folge, nach denen ein Endpunkt gesperrt wird
+    CIRCUIT_RESET_TIMEOUT = 60      # Sekunden bis zur ersten Probeanfrage
+    CIRCUIT_HALF_OPEN_PROBES = 1    # gleichzeitige Probeanfragen im Zustand half_open
+    RATE_LIMIT_RATE = 5.0           # Start-Rate (Anfragen/s) pro Endpunkt
+    RATE_LIMIT_MIN_RATE = 0.5
+    RATE_LIMIT_MAX_RATE = 20.0
+    RATE_LIMIT_BURST = 10
+    RATE_LIMIT_INCREASE = 0.2       # additive Erhöhung nach Erfolg
+    RATE_LIMIT_DECREASE = 0.5       # multiplikative Senkung bei 429/5xx
+    RATE_LIMIT_JITTER = 0.25        # zufälliger Anteil, der auf Wartezeiten aufgeschlagen wird
+    CASSETTE_MODE = "off"           # off, record (Antworten aufzeichnen), replay (offline abspielen)
+    CASSETTE_PATH = os.path.join(BASE_PATH, 'Cassettes', 'galaxo.cassette.json.gz')
+    CASSETTE_REPLAY_LATENCY = "recorded"  # recorded (gemessene Latenz) oder zero
+    # olderThan3MonthTimestamp ändert sich bei jeder Anfrage, historyFrom mit der lokalen Preishistorie
+    CASSETTE_IGNORED_VARIABLES = ("olderThan3MonthTimestamp", "historyFrom")
                                     
     
+    #CLI / Daemon
+    DAEMON_INTERVAL = 3600          # Sekunden zwischen zwei Aktualisierungsläufen
+
+    #Scheduler
+    SCHEDULER_TIER_INTERVALS = {    # Sekunden zwischen zwei Aktualisierungen pro Stufe
+        'hot': 0,
+        'warm': 12 * 3600,
+        'cold': 3 * 86400,
+    }
+    SCHEDULER_CHANGE_ALPHA = 0.2    # Gewichtung der letzten Beobachtung in change_rate
+    SCHEDULER_HOT_CHANGE_RATE = 0.3
+    SCHEDULER_WARM_CHANGE_RATE = 0.1
+    SCHEDULER_MIN_OBSERVATIONS = 3  # so oft wird jedes neue Produkt immer aktualisiert
+    SCHEDULER_LOW_STOCK = 5         # sinkender Lagerbestand, ab dem ein Produkt "hot" ist
+    SCHEDULER_NEAR_MIN_PERCENT = 5  # Abstand zum Minimalpreis in % nach einer Preissenkung, ab dem ein Produkt "hot" ist
+
     #Sort
     SORT_PRICE_UP = "Preis aufsteigend"
     SORT_PRICE_DOWN = "Preis absteigend"
@@ -1,6 +1,5 @@
 import tkinter as tk
 from tkinter import ttk
-from typing import Counter
 from CONFIG.Constants import Constants
 from CONFIG.Version import Version
 from UTILS.Utils import Utils
@@ -78,14 +77,13 @@ class FilterFrame(ttk.LabelFrame):
             for product in all_products
         )        
 
-    def _get_category_counts(self, all_products):
-        category_counts = Counter(product.category_name for product in all_products)
+    def _get_category_counts(self, category_counts):
         display_list = [f"{cat} ({count})" for cat, count in category_counts.items()]
         value_list = list(category_counts.keys())
         return display_list, value_list
         
-    def update_category_counts(self, all_products):
-        display_list, value_list = self._get_category_counts(all_products)
+    def update_category_counts(self, all_products, category_counts):
+        display_list, value_list = self._get_category_counts(category_counts)
         
         self.category_combobox['values'] = [Constants.CATEGORY_DEFAULT] + display_list
         self.category_mapping = dict(zip(display_list, value_list))
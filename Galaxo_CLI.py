@@ -0,0 +1,100 @@
+import argparse
+import json
+import signal
+import sys
+import threading
+from datetime import datetime
+
+from CONFIG.Constants import Constants
+from PROCESS.GalaxoProcess import GalaxoProcess
+from API.RequestGraphQLClient import PlaywrightService
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Galaxo Preisaktualisierung ohne GUI")
+    parser.add_argument("--once", action="store_true", help="nur einen Lauf ausführen und beenden")
+    parser.add_argument("--interval", type=int, default=Constants.DAEMON_INTERVAL,
+                        help="Sekunden zwischen zwei Läufen im Daemon-Modus")
+    parser.add_argument("--all", action="store_true", help="alle Produkte aktualisieren, nicht nur fällige")
+    parser.add_argument("--full", action="store_true", help="volle PDP-Abfrage statt reiner Preisabfrage")
+    parser.add_argument("--sequential", action="store_true", help="Produkte nacheinander aktualisieren")
+    parser.add_argument("--concurrency", type=int, default=Constants.REFRESH_MAX_CONCURRENCY,
+                        help="max. gleichzeitige Anfragen")
+    parser.add_argument("--batch-size", type=int, default=Constants.GRAPHQL_BATCH_SIZE,
+                        help="Operationen pro GraphQL-Anfrage")
+    parser.add_argument("--summary", help="Laufzusammenfassung zusätzlich als JSON-Zeile an diese Datei anhängen")
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument("--record", metavar="KASSETTE", help="alle API-Antworten in diese Kassette aufzeichnen")
+    cassette.add_argument("--replay", metavar="KASSETTE", help="API-Antworten offline aus dieser Kassette abspielen")
+    parser.add_argument("--replay-latency", choices=["recorded", "zero"], default=Constants.CASSETTE_REPLAY_LATENCY,
+                        help="beim Abspielen die gemessene Latenz nachbilden oder sofort antworten")
+    return parser.parse_args(argv)
+
+
+def _configure_cassette(args) -> None:
+    # muss vor dem ersten Client gesetzt sein, der Transport wird einmal pro Prozess erzeugt
+    if args.record or args.replay:
+        Constants.CASSETTE_MODE = "record" if args.record else "replay"
+        Constants.CASSETTE_PATH = args.record or args.replay
+    Constants.CASSETTE_REPLAY_LATENCY = args.replay_latency
+
+
+def run_cycle(galaxo_process: GalaxoProcess, args, cycle: int) -> dict:
+    # der erste Lauf nutzt den beim Start geladenen Katalog, danach können GUI oder
+    # ein anderer Prozess die Daten geändert haben
+    if cycle > 1:
+        galaxo_process.reload_products()
+    stats = galaxo_process.process_update_prices(
+        concurrent=not args.sequential,
+        max_concurrency=args.concurrency,
+        batch_size=args.batch_size,
+        price_only=not args.full,
+        only_due=not args.all,
+    )
+    summary = {"cycle": cycle, "timestamp": datetime.now().isoformat(timespec="seconds"), **stats.to_dict()}
+
+    line = json.dumps(summary, ensure_ascii=False)
+    print(line, flush=True)
+    if args.summary:
+        with open(args.summary, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+    return summary
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    _configure_cassette(args)
+    stop_event = threading.Event()
+
+    def _stop(signum, frame):
+        Constants.LOGGER.info(f"Signal {signum} empfangen, beende nach dem aktuellen Lauf")
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, _stop)
+    signal.signal(signal.SIGTERM, _stop)
+
+    # ein Prozess für alle Läufe: Service-Loop, Transport und Caches bleiben warm
+    galaxo_process = GalaxoProcess()
+    cycle = 0
+    summary = {}
+    try:
+        while not stop_event.is_set():
+            cycle += 1
+            try:
+                summary = run_cycle(galaxo_process, args, cycle)
+            except Exception as e:
+                Constants.LOGGER.error(f"Aktualisierungslauf {cycle} fehlgeschlagen: {e}", exc_info=True)
+                summary = {"cycle": cycle, "error": str(e)}
+                print(json.dumps(summary, ensure_ascii=False), flush=True)
+            if args.once:
+                break
+            stop_event.wait(max(0, args.interval))
+    finally:
+        galaxo_process.close()
+        PlaywrightService.instance().close()
+
+    return 1 if summary.get("error") or summary.get("failed") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
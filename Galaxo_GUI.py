@@ -4,11 +4,11 @@ from tkinter import ttk
 import os
 import sys
 from PROCESS.GalaxoProcess import GalaxoProcess
+from PROCESS.ProductRepository import ProductRepository
 from CONFIG.Constants import Constants
 from GUI.FilterFrame import FilterFrame
 from GUI.ProductWidget import ProductWidget
 from UTILS.Utils import Utils
-from PROCESS.ProductFactory import ProductFactory
 
 
 class ProductListApp:
@@ -39,7 +39,12 @@ class ProductListApp:
         self.selected_products = set()
         self.product_widgets = []
         self.category_counts = {}
-        
+
+        # ein Katalog für die ganze Sitzung, Änderungen kommen als Events
+        self.repository = ProductRepository(autoload=False)
+        self.galaxo_process = GalaxoProcess(self.repository)
+        self.repository.subscribe(self._on_repository_changed)
+
         self._create_widgets()
         self.root.bind("<Configure>", self._on_root_resize)
         # Load products and check logs after the main loop has started
@@ -145,18 +150,12 @@ class ProductListApp:
 
     def delete_selected_products(self):
         count = len(self.selected_products)
-        galaxo_process = GalaxoProcess()
-        for product_id in self.selected_products:
-            galaxo_process.delete_product(product_id)
-            product = next((p for p in self.all_products if p.product_id == product_id), None)
-            Utils.delete_image(product.image_url)
-
         if(len(self.filtered_products) == len(self.selected_products) and self.filter_frame.only_updates):
             self.filter_frame.only_updates.set(False)
 
+        removed = self.galaxo_process.delete_products(list(self.selected_products))
+        Utils.delete_images(p.image_url for p in removed)
         self.selected_products.clear()
-        galaxo_process.close()
-        self._load_products()
         self.filter_frame.update_status_label(f"{count} Product gelöscht!")
 
     def _update_prices(self):
@@ -164,15 +163,14 @@ class ProductListApp:
 
     def _update_prices_thread(self):
         try:
-            galaxo_process = GalaxoProcess()
-            galaxo_process.process_update_prices()
-            self.filter_frame.update_status_label("Update abgeschlossen")
+            stats = self.galaxo_process.process_update_prices()
+            self.filter_frame.update_status_label(
+                f"Update abgeschlossen: {stats.succeeded}/{stats.total} ({stats.failed} Fehler)",
+                "warning" if stats.failed else "info"
+            )
 
             if(self.filter_frame.only_updates):
                 self.filter_frame.only_updates.set(False)
-
-            galaxo_process.close()
-            self._load_products()
         except Exception as e:
             self.filter_frame.update_status_label(f"Fehler beim Aktualisieren der Preise: {e}", "error")
             Constants.LOGGER.error(f"Fehler beim Aktualisieren der Preise: {e}")
@@ -183,16 +181,13 @@ class ProductListApp:
     def _add_favorit_thread(self):
         url = self.filter_frame.search_entry.get().strip()
         self.filter_frame.search_entry.delete(0, tk.END)
-        galaxo_process = GalaxoProcess()
         try:
             product_id = Utils.extract_product_id_from_url(url)
-            if galaxo_process.get_product(product_id):
+            if self.galaxo_process.get_product(product_id):
                 self.filter_frame.update_status_label(f"Product {product_id} existiert bereits!", "warning")
             else:
-                galaxo_process.insert_favorite_by_url(url)
-                self._load_products()
+                self.galaxo_process.insert_favorite_by_url(url)
                 self.filter_frame.update_status_label(f"Product {int(product_id)} hinzugefügt!")
-            galaxo_process.close()
         except Exception as e:
             self.filter_frame.update_status_label(f"Fehler beim Hinzufügen des Produkts: {e}", "error")
             Constants.LOGGER.error(f"Fehler beim Hinzufügen des Produkts: {e}")
@@ -232,8 +227,16 @@ class ProductListApp:
         
         only_updates = self.filter_frame.only_updates.get()
         selected_category = "" if selected_category_display == Constants.CATEGORY_DEFAULT else self.filter_frame.category_mapping.get(selected_category_display, "")
+        # Id-Suche und Kategorie über die Indizes des Repositorys statt über alle Produkte
+        if search_text.isdigit():
+            product = self.repository.get(int(search_text))
+            candidates = [product] if product else []
+        elif selected_category:
+            candidates = self.repository.by_category(selected_category)
+        else:
+            candidates = self.all_products
         return [
-            p for p in self.all_products
+            p for p in candidates
             if Utils.matches_filters(p, search_text, selected_category, only_updates)
         ]
 
@@ -246,17 +249,38 @@ class ProductListApp:
 
     def _load_products(self):
         try:
-            galaxo_process = GalaxoProcess()
-            raw_products = galaxo_process._fetch_all_products()
-            self.all_products = [ProductFactory.from_source(p) for p in raw_products]
-            self._on_products_loaded()
+            # reload() meldet sich über _on_repository_changed zurück
+            self.repository.reload()
             self._check_log()
-            galaxo_process.close()
         except Exception as e:
             Constants.LOGGER.error(f"Fehler beim Laden der Produkte: {e}")
 
+    def _on_repository_changed(self, event):
+        # Events kommen auch aus Worker-Threads, Tk nur im Hauptthread anfassen
+        self.root.after(0, self._apply_change, event)
+
+    def _apply_change(self, event):
+        if event.reloaded:
+            self.all_products = self.repository.products()
+        else:
+            # aktualisierte Produkte sind neue Objekte: an ihrer Stelle einsetzen
+            if event.updated:
+                updated = set(event.updated)
+                self.all_products = [self.repository.get(p.product_id) or p if p.product_id in updated else p
+                                     for p in self.all_products]
+            if event.removed:
+                removed = set(event.removed)
+                self.all_products = [p for p in self.all_products if p.product_id not in removed]
+                self.selected_products -= removed
+            known = {p.product_id for p in self.all_products}
+            for product_id in event.added:
+                pd = self.repository.get(product_id)
+                if pd is not None and product_id not in known:
+                    self.all_products.append(pd)
+        self._on_products_loaded()
+
     def _on_products_loaded(self):
-        self.filter_frame.update_category_counts(self.all_products)
+        self.filter_frame.update_category_counts(self.all_products, self.repository.category_counts())
         self.apply_filters()
         self._update_selected_count_label()
 
@@ -264,3 +288,5 @@ if __name__ == "__main__":
     root = tk.Tk()
     app = ProductListApp(root)
     root.mainloop()
+    app.galaxo_process.close()
+    app.repository.close()
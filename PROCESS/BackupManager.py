@@ -0,0 +1,130 @@
+import atexit
+import glob
+import gzip
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Callable
+
+from CONFIG.Constants import Constants
+
+
+class BackupManager:
+    """Writes catalog backups on a background thread.
+
+    Backups are gzip compressed JSON snapshots named after a hash of their
+    content, so an unchanged catalog is recognised by comparing with the hash
+    of the last snapshot kept in memory, without touching the backup
+    directory. Requests arriving while a backup is pending are coalesced.
+    Retention keeps at most ``keep_count`` backups and drops backups older
+    than ``max_age_days``; the newest backup is always kept.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self, backup_dir: str = None, keep_count: int = Constants.BACKUP_KEEP_COUNT,
+                 max_age_days: float = Constants.BACKUP_MAX_AGE_DAYS):
+        self.backup_dir = backup_dir or Constants.JSON_BACKUP_PATH
+        self.keep_count = keep_count
+        self.max_age_days = max_age_days
+        self._pending: Callable[[], bytes] | None = None
+        self._condition = threading.Condition()
+        self._last_digest = None
+        self._busy = False
+        self.written = 0
+        self.skipped = 0
+        self._thread = threading.Thread(target=self._run, name="galaxo-backup", daemon=True)
+        self._thread.start()
+        # ein laufendes Backup beim Beenden nicht abschneiden
+        atexit.register(self.wait, Constants.BACKUP_EXIT_TIMEOUT)
+
+    @classmethod
+    def instance(cls) -> "BackupManager":
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = BackupManager()
+            return cls._instance
+
+    def schedule(self, snapshot: Callable[[], bytes]) -> None:
+        """Back up the bytes returned by ``snapshot`` in the background; returns immediately."""
+        with self._condition:
+            self._pending = snapshot
+            self._condition.notify()
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until no backup is pending or running, e.g. before shutdown or in tests."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._pending is not None or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._pending is None:
+                    self._condition.wait()
+                snapshot, self._pending = self._pending, None
+                self._busy = True
+            try:
+                self._backup(snapshot())
+            except Exception as e:
+                Constants.LOGGER.warning(f"Backup fehlgeschlagen: {e}", exc_info=True)
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def _backups(self) -> list[str]:
+        """All backups, newest first (including the uncompressed ones of older versions)."""
+        pattern = os.path.join(self.backup_dir, f"{Constants.JSON_BACKUP_FILE_NAMES}*")
+        backups = [path for path in glob.glob(pattern) if not path.endswith(".tmp")]
+        return sorted(backups, key=os.path.getmtime, reverse=True)
+
+    def _backup(self, data: bytes) -> None:
+        digest = hashlib.sha256(data).hexdigest()[:16]
+        if digest == self._last_digest:
+            self.skipped += 1
+            return
+
+        os.makedirs(self.backup_dir, exist_ok=True)
+        if self._last_digest is None:
+            # erster Lauf im Prozess: Hash des neuesten Backups steht im Dateinamen
+            backups = self._backups()
+            if backups and backups[0].endswith(f"_{digest}.json.gz"):
+                self._last_digest = digest
+                self.skipped += 1
+                Constants.LOGGER.info("Kein Backup erforderlich: Inhalt unverändert.")
+                return
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        backup_path = os.path.join(self.backup_dir, f"{Constants.JSON_BACKUP_FILE_NAMES}{timestamp}_{digest}.json.gz")
+        tmp_path = f"{backup_path}.tmp"
+        with gzip.open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, backup_path)
+        self._last_digest = digest
+        self.written += 1
+        Constants.LOGGER.info(f"Backup gespeichert unter {backup_path}")
+        self._apply_retention()
+
+    def _apply_retention(self) -> None:
+        backups = self._backups()
+        cutoff = time.time() - self.max_age_days * 86400 if self.max_age_days else None
+        for index, old_file in enumerate(backups[1:], start=1):
+            if index < self.keep_count and (cutoff is None or os.path.getmtime(old_file) >= cutoff):
+                continue
+            try:
+                os.remove(old_file)
+                Constants.LOGGER.info(f"Altes Backup gelöscht: {old_file}")
+            except Exception as e:
+                Constants.LOGGER.warning(f"Konnte Backup nicht löschen: {old_file}  {e}")
+
+    def stats(self) -> dict:
+        return {"written": self.written, "skipped": self.skipped, "last_digest": self._last_digest}
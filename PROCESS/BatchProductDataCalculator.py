@@ -0,0 +1,137 @@
+import sys
+from typing import Sequence
+
+from CONFIG.Constants import Constants
+from PROCESS.ProductDataCalculator import ProductDataCalculator
+from UTILS.ProductDataUtils import ProductDataUtils
+
+try:
+    import numpy as np
+except ImportError:  # optional: ohne NumPy rechnet der skalare ProductDataCalculator
+    np = None
+
+
+class BatchProductDataCalculator:
+    """Derived fields for many products in one vectorized NumPy pass.
+
+    Gives the same values (and types) as ProductDataCalculator and
+    ProductDataUtils: the price and stock columns are read once, every
+    formula runs on whole float64 arrays in the same operation order, and
+    only the assignment back to the objects remains per product. The change
+    labels are formatted once per distinct value. Without NumPy, or for
+    batches below ``MIN_VECTOR_SIZE``, the scalar calculator is used.
+    """
+
+    # darunter ist der Aufbau der Arrays teurer als die skalare Rechnung
+    MIN_VECTOR_SIZE = 64
+
+    @staticmethod
+    def _vectorized(products: Sequence) -> bool:
+        return np is not None and len(products) >= BatchProductDataCalculator.MIN_VECTOR_SIZE
+
+    @staticmethod
+    def calculate_context_fields(products: Sequence) -> None:
+        """Batch version of calculate_price_and_stock_changes plus evaluate_price_extremes."""
+        if not BatchProductDataCalculator._vectorized(products):
+            for product in products:
+                calculator = ProductDataCalculator(product)
+                calculator.calculate_price_and_stock_changes()
+                calculator.evaluate_price_extremes()
+            return
+
+        current = np.fromiter((p.current_price for p in products), dtype=np.float64, count=len(products))
+        old = np.fromiter((p.old_price for p in products), dtype=np.float64, count=len(products))
+        min_price = np.fromiter((p.min_price for p in products), dtype=np.float64, count=len(products))
+        max_price = np.fromiter((p.max_price for p in products), dtype=np.float64, count=len(products))
+        stock = np.fromiter((p.stock_count for p in products), dtype=np.int64, count=len(products))
+        old_stock = np.fromiter((p.old_stock for p in products), dtype=np.int64, count=len(products))
+        threshold = Constants.PRODUCT_PERCENTAGE_CHANGE
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            stock_diff = stock - old_stock
+            price_change = current - old
+            percentage_diff = np.where(old != 0, price_change / old * 100, 0.0)
+            min_perc_diff = np.where(min_price != 0, (current - min_price) / min_price * 100, 0.0)
+            max_perc_diff = np.where(max_price != 0, (current - max_price) / max_price * 100, 0.0)
+        stock_changed = stock_diff != 0
+        price_changed = (current != old) & (np.abs(percentage_diff) > threshold)
+        min_flag = (current == min_price) | (np.abs(min_perc_diff) < threshold)
+        max_flag = (current == max_price) | (np.abs(max_perc_diff) < threshold)
+        both_changed = price_changed & stock_changed
+
+        percentage_values = percentage_diff.tolist()
+        # skalar ergibt old_price == 0 eine ganzzahlige 0
+        for index in np.flatnonzero(old == 0).tolist():
+            percentage_values[index] = 0
+        stock_labels = BatchProductDataCalculator._stock_labels(stock, stock_diff)
+        percentage_labels = BatchProductDataCalculator._percentage_labels(percentage_diff)
+
+        for product, change, percentage, price_flag, stock_flag, stock_label, percentage_label, \
+                low, high, both in zip(products, price_change.tolist(), percentage_values,
+                                       price_changed.tolist(), stock_changed.tolist(), stock_labels,
+                                       percentage_labels, min_flag.tolist(), max_flag.tolist(),
+                                       both_changed.tolist()):
+            product.stock_changed_flag = stock_flag
+            product.stock_count_change = stock_label
+            product.price_change = change
+            product.percentage_diff = percentage
+            product.price_changed_flag = price_flag
+            product.old_price_percentage = percentage_label
+            product.min_flag = low
+            product.max_flag = high
+            product.both_changed_flag = both
+
+    @staticmethod
+    def calculate_price_position(products: Sequence) -> None:
+        """Batch version of the load-time fields set by ProductFactory.from_source:
+        min_price_erreicht, max_price_erreicht and preisverlust_percentage."""
+        if not BatchProductDataCalculator._vectorized(products):
+            for product in products:
+                product.min_price_erreicht = int(product.current_price <= product.min_price)
+                product.max_price_erreicht = int(product.current_price >= product.max_price)
+                product.preisverlust_percentage = ProductDataUtils.calculate_preisverlust_percentage(
+                    product.current_price, product.max_price
+                )
+            return
+
+        current = np.fromiter((p.current_price for p in products), dtype=np.float64, count=len(products))
+        min_price = np.fromiter((p.min_price for p in products), dtype=np.float64, count=len(products))
+        max_price = np.fromiter((p.max_price for p in products), dtype=np.float64, count=len(products))
+
+        undefined = (max_price == 0) | (current == 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            preisverlust = np.rint(100 - ((current / max_price) * 100))
+        preisverlust = np.where(undefined, 0, preisverlust).astype(np.int64).tolist()
+        # skalar ergibt ein fehlender Preis 0.0 (float)
+        for index in np.flatnonzero(undefined).tolist():
+            preisverlust[index] = 0.0
+
+        for product, low, high, loss in zip(products, (current <= min_price).astype(np.int64).tolist(),
+                                            (current >= max_price).astype(np.int64).tolist(), preisverlust):
+            product.min_price_erreicht = low
+            product.max_price_erreicht = high
+            product.preisverlust_percentage = loss
+
+    @staticmethod
+    def _stock_labels(stock, stock_diff) -> list[str]:
+        cache = {}
+        labels = []
+        for count, diff in zip(stock.tolist(), stock_diff.tolist()):
+            label = cache.get((count, diff))
+            if label is None:
+                label = cache[(count, diff)] = sys.intern(f"{count} ({diff:+d}){ProductDataUtils.get_symbol(diff)}")
+            labels.append(label)
+        return labels
+
+    @staticmethod
+    def _percentage_labels(percentage_diff) -> list[str]:
+        # int(round()) rundet wie np.rint auf die gerade Zahl
+        rounded = np.rint(percentage_diff).astype(np.int64).tolist()
+        cache = {}
+        labels = []
+        for value, sign in zip(rounded, np.sign(percentage_diff).tolist()):
+            label = cache.get((value, sign))
+            if label is None:
+                label = cache[(value, sign)] = sys.intern(f"{value}%{ProductDataUtils.get_symbol(sign)}")
+            labels.append(label)
+        return labels
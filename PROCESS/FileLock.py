@@ -0,0 +1,83 @@
+import os
+import threading
+import time
+
+from CONFIG.Constants import Constants
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """Advisory lock shared between processes through a lock file.
+
+    Uses ``fcntl.flock`` on POSIX and ``msvcrt.locking`` on Windows. Within a
+    process the lock is reentrant and also excludes other threads, so it can
+    serve as the only lock around state that mirrors the locked files.
+    """
+
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, path: str, timeout: float = Constants.STORAGE_LOCK_TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def acquire(self) -> None:
+        if not self._thread_lock.acquire(timeout=self.timeout if self.timeout else -1):
+            raise TimeoutError(f"Sperre {self.path} nicht erhalten")
+        if self._depth == 0:
+            try:
+                self._lock_file()
+            except BaseException:
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            self._unlock_file()
+        self._thread_lock.release()
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+    def _lock_file(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = time.monotonic() + self.timeout if self.timeout else None
+        while True:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                self._fd = fd
+                return
+            except OSError:
+                if deadline is not None and time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise TimeoutError(f"Sperre {self.path} wird von einem anderen Prozess gehalten")
+                time.sleep(self.POLL_INTERVAL)
+
+    def _unlock_file(self) -> None:
+        fd, self._fd = self._fd, None
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
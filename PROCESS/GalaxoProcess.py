@@ -1,63 +1,202 @@
-from typing import List
+from typing import Dict, Iterable, List
 from CONFIG.Constants import Constants
 from PROCESS.ProductFactory import ProductFactory
-from PROCESS.ProductStorage import ProductStorage
 from PROCESS.ProductClient import ProductClient
 from UTILS.Utils import Utils
 from PROCESS.ProductData import ProductData
+from PROCESS.RefreshStats import RefreshStats
+from PROCESS.RefreshScheduler import RefreshScheduler
+from PROCESS.ObservationStore import ObservationStore
+from PROCESS.ProductRepository import ProductRepository
 
 class GalaxoProcess:
 
-    def __init__(self):
+    def __init__(self, repository: ProductRepository = None):
+        """Without ``repository`` the process loads and owns its own catalog
+        (writer thread and exit hook end with ``close()``); the GUI passes its
+        long-lived repository instead."""
         self.product_client = ProductClient()
-        raw_products = ProductStorage.load_products()
-        self._cached_products: List[ProductData] = [
-            ProductFactory.from_source(p) for p in raw_products
-        ]
+        self.observations = ObservationStore()
+        self._owns_repository = repository is None
+        self.repository = repository if repository is not None else ProductRepository()
+
+    def reload_products(self) -> None:
+        """(Re)load the catalog from storage, e.g. before each cycle of a long running process."""
+        self.repository.reload()
 
     def _fetch_all_products(self) -> List[ProductData]:
-        return self._cached_products
+        return self.repository.products()
 
     def insert_favorite_by_url(self, url: str):
-        product_id = Utils.extract_product_id_from_url(url)
-        if product_id is None or self.get_product(product_id) or product_id == '0' or product_id == 0:
-            return
+        self.insert_products([url])
+
+    def insert_products(self, urls: Iterable[str]) -> List[ProductData]:
+        """Add the products behind ``urls``: unknown ids are fetched concurrently
+        and added to the repository in one change."""
+        known = set()
+        product_ids = []
+        for url in urls:
+            product_id = Utils.extract_product_id_from_url(url)
+            if not product_id or product_id in known or product_id in self.repository:
+                continue
+            known.add(product_id)
+            product_ids.append(product_id)
+        if not product_ids:
+            return []
 
-        details = self.product_client.get_full_product_details(product_id)
-        pd = ProductFactory.from_source(details)
-        self._cached_products.append(pd)
-        self._save_products()
+        results = self.product_client.get_full_product_details_bulk(product_ids)
+        found = []
+        for product_id in product_ids:
+            details = results.get(product_id)
+            if not details:
+                Constants.LOGGER.error(f"Produkt {product_id} konnte nicht geladen werden")
+                continue
+            found.append(details)
+        inserted = ProductFactory.from_sources(found)
+        for pd in inserted:
+            pd.last_refresh = pd.insert_date
+
+        inserted = self.repository.add(inserted)
+        self._record_observations(inserted)
+        self.product_client.flush_cache()
+        return inserted
 
     def get_product(self, product_id: int) -> ProductData | None:
-        return next((p for p in self._cached_products if p.product_id == product_id), None)
+        return self.repository.get(product_id)
 
     def delete_product(self, product_id: int):
-        self._cached_products = [
-            p for p in self._cached_products if p.product_id != product_id
-        ]
-        self._save_products()
+        self.delete_products([product_id])
+
+    def delete_products(self, product_ids: Iterable[int]) -> List[ProductData]:
+        """Remove several products in one change.
+        Returns the removed products, e.g. to clean up their images."""
+        return self.repository.remove(product_ids)
 
-    def _update_product_price(self, pd: ProductData):
+    def update_products(self, changes: Dict[int, dict]) -> List[ProductData]:
+        """Set fields of several products (product_id -> {field: value}), recompute
+        their context fields and publish all of them as one change."""
+        updated = []
+        for pd in self.repository.copies(changes):
+            fields = changes[pd.product_id]
+            if not fields:
+                continue
+            changed = False
+            for name, value in fields.items():
+                if name == "product_id" or not hasattr(pd, name):
+                    Constants.LOGGER.warning(f"Unbekanntes Feld {name} für Produkt {pd.product_id} ignoriert")
+                    continue
+                setattr(pd, name, value)
+                changed = True
+            if changed:
+                pd.update_context_fields()
+                updated.append(pd)
+        return self.repository.update(updated)
+
+    def _update_product_price(self, pd: ProductData, price_only: bool = Constants.REFRESH_PRICE_ONLY) -> bool:
         try:
-            details = self.product_client.get_full_product_details(
-                pd.product_id, include_price_history=False
-            )
+            if price_only:
+                details = self.product_client.get_price_update(pd.product_id)
+            else:
+                details = self.product_client.get_full_product_details(
+                    pd.product_id, include_price_history=False
+                )
             if details:
                 ProductFactory.update_existing(pd, details)
+                return True
         except Exception as e:
             Constants.LOGGER.error(
                 f"Fehler bei Produkt {pd.product_id}: {e}", exc_info=True
             )
+        return False
+
+    def process_update_prices(
+        self,
+        concurrent: bool = Constants.REFRESH_CONCURRENT,
+        max_concurrency: int = Constants.REFRESH_MAX_CONCURRENCY,
+        batch_size: int = Constants.GRAPHQL_BATCH_SIZE,
+        price_only: bool = Constants.REFRESH_PRICE_ONLY,
+        only_due: bool = Constants.REFRESH_ONLY_DUE,
+    ) -> RefreshStats:
+        """Update prices for all cached products, or with ``only_due`` for the
+        products the RefreshScheduler considers due.
 
-    def process_update_prices(self):
-        """Update prices for all cached products sequentially."""
-        for pd in self._cached_products:
-            self._update_product_price(pd)
+        With ``concurrent`` the PDP and availability requests are packed into
+        batches of ``batch_size`` operations and fanned out in the service loop
+        with at most ``max_concurrency`` requests in flight, otherwise products
+        are updated one after another. With ``price_only`` only offers and
+        stock are queried; the full PDP query runs for products whose offer set
+        changed or whose metadata is not cached.
+        """
+        catalog = self.repository.products()
+        due = RefreshScheduler.due_products(catalog) if only_due else catalog
+        # Kopien aktualisieren, erst repository.update() übernimmt sie in den Katalog
+        products = self.repository.copies(pd.product_id for pd in due)
+        stats = RefreshStats(total=len(products), concurrent=concurrent,
+                             skipped=len(catalog) - len(products))
+        stats.tiers = RefreshScheduler.tier_counts(catalog)
+        failure_budget = max(Constants.REFRESH_FAILURE_BUDGET_MIN, int(len(products) * Constants.REFRESH_FAILURE_BUDGET))
 
-        self._save_products()
+        if concurrent:
+            self._update_prices_concurrent(products, stats, max_concurrency, batch_size, price_only, failure_budget)
+        else:
+            for pd in products:
+                if stats.failed >= failure_budget:
+                    Constants.LOGGER.error(f"Fehlerbudget erschöpft ({stats.failed} Fehler), Lauf wird abgebrochen")
+                    break
+                stats.record(self._update_product_price(pd, price_only))
+        stats.not_attempted = stats.total - stats.succeeded - stats.failed
 
-    def _save_products(self) -> None:
-        ProductStorage.save_products([p.to_dict() for p in self._cached_products])
+        refreshed = self.repository.update(pd for pd in products if pd.last_refresh >= int(stats.started_at))
+        self._record_observations(refreshed)
+        self.product_client.flush_cache()
+        stats.transport = self.product_client.transport_stats()
+        stats.cache = self.product_client.cache_stats()
+        stats.pool = self.product_client.pool_stats()
+        stats.finish()
+        Constants.LOGGER.info(f"Preisaktualisierung abgeschlossen: {stats.summary()}")
+        return stats
+
+    def _update_prices_concurrent(self, products: List[ProductData], stats: RefreshStats,
+                                  max_concurrency: int, batch_size: int, price_only: bool,
+                                  failure_budget: int) -> None:
+        product_ids = [pd.product_id for pd in products]
+        try:
+            if price_only:
+                results = self.product_client.get_price_updates_bulk(
+                    product_ids, max_concurrency=max_concurrency, batch_size=batch_size,
+                    failure_budget=failure_budget
+                )
+            else:
+                results = self.product_client.get_full_product_details_bulk(
+                    product_ids,
+                    include_price_history=False,
+                    max_concurrency=max_concurrency,
+                    batch_size=batch_size,
+                    failure_budget=failure_budget,
+                )
+        except Exception as e:
+            Constants.LOGGER.error(f"Parallele Preisaktualisierung fehlgeschlagen: {e}", exc_info=True)
+            results = {pid: None for pid in product_ids}
+
+        updates = []
+        for pd in products:
+            if pd.product_id not in results:
+                # wegen erschöpftem Fehlerbudget nicht abgefragt
+                continue
+            details = results.get(pd.product_id)
+            if details:
+                updates.append((pd, details))
+            stats.record(bool(details))
+        # abgeleitete Felder für alle aktualisierten Produkte in einem Durchgang
+        ProductFactory.update_existing_many(updates)
+
+    def _record_observations(self, products) -> None:
+        try:
+            self.observations.append_products(products)
+        except OSError as e:
+            Constants.LOGGER.error(f"Beobachtungen konnten nicht gespeichert werden: {e}")
 
     def close(self) -> None:
         self.product_client.shutdown()
+        if self._owns_repository:
+            self.repository.close()
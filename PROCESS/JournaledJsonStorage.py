@@ -0,0 +1,310 @@
+import atexit
+import os
+import threading
+from typing import Iterable, Iterator
+
+from CONFIG.Constants import Constants
+from PROCESS.FileLock import FileLock
+from PROCESS.ProductMerge import ProductMerge
+from PROCESS.StorageCodec import StorageCodec
+
+
+class JournaledJsonStorage:
+    """JSON backend for ProductStorage with a write-ahead journal.
+
+    ``galaxo_data.json`` is the snapshot; every change is appended to
+    ``galaxo_data.json.journal`` as one JSON line (upsert with the complete
+    product or delete by id). Loading replays the journal on top of the
+    snapshot. Once the journal holds ``compact_records`` records a background
+    thread folds it into a new snapshot (temp file, fsync, rename) and drops
+    the records it contains from the journal. Records are idempotent, so a
+    crash between snapshot and journal rewrite only replays them again.
+
+    Several processes (GUI, cron refresh) may share the files: every read and
+    write holds the advisory lock ``galaxo_data.json.lock``. Before writing,
+    journal records appended by other processes are applied, and a snapshot
+    replaced by another process's compaction is read again. A product changed
+    by another process since this process read it is merged field by field
+    (ProductMerge), so concurrent writers do not lose each other's changes.
+
+    Only the encoded product per id is kept in memory; encoding, compression
+    and the snapshot layout come from StorageCodec.
+    """
+
+    _instances = {}
+    _lock = threading.Lock()
+
+    def __init__(self, path: str, compact_records: int = Constants.JOURNAL_COMPACT_RECORDS,
+                 fsync: bool = Constants.JOURNAL_FSYNC, codec: StorageCodec = None):
+        self.path = path
+        self.codec = codec or StorageCodec.instance()
+        self.journal_path = f"{path}.journal"
+        self.compact_records = compact_records
+        self.fsync = fsync
+        # auch Sperre zwischen den Threads dieses Prozesses
+        self._file_lock = FileLock(f"{path}.lock")
+        # Stand der Dateien (inkl. Änderungen anderer Prozesse)
+        self._rows: dict[int, str] = {}
+        # Stand, den dieser Prozess gelesen bzw. geschrieben hat: Basis für das Zusammenführen
+        self._base: dict[int, str] = {}
+        self._snapshot_stamp = None
+        self._journal_offset = 0
+        self._journal_records = 0
+        self._compaction: threading.Thread | None = None
+        self._loaded = False
+        atexit.register(self.close)
+
+    @classmethod
+    def instance(cls, path: str = None) -> "JournaledJsonStorage":
+        path = path or Constants.JSON_PATH
+        with cls._lock:
+            if path not in cls._instances:
+                cls._instances[path] = JournaledJsonStorage(path)
+            return cls._instances[path]
+
+    def _serialize(self, product: dict) -> str:
+        return self.codec.dumps(product)
+
+    @staticmethod
+    def _stamp(path: str) -> tuple | None:
+        """Identity of a file version; changes when another process replaces it."""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    # --- Laden ----------------------------------------------------------
+
+    def load_products(self) -> list[dict]:
+        """Snapshot plus replayed journal, in insertion order."""
+        return list(self.iter_products())
+
+    def iter_products(self) -> Iterator[dict]:
+        """Snapshot products with the journaled state of each product applied.
+        The files are read under the lock; the products are yielded after it
+        is released, so a slow consumer does not block other processes."""
+        # vor der Sperre warten, die Kompaktierung braucht sie selbst
+        self._wait_for_compaction()
+        with self._file_lock:
+            products = list(self._read_files())
+            self._base = dict(self._rows)
+            self._loaded = True
+        Constants.LOGGER.info(
+            f"{len(products)} Produkte erfolgreich geladen von: {self.path} ({self._journal_records} Journal-Einträge)"
+        )
+        yield from products
+
+    def _read_files(self) -> Iterator[dict]:
+        """Read snapshot and journal (lock held) and replace ``_rows`` once complete."""
+        snapshot_stamp = self._stamp(self.path)
+        journal, journal_records, journal_offset = self._read_journal()
+        rows: dict[int, str] = {}
+        if snapshot_stamp is not None:
+            for product, line in self.codec.iter_array(self.path):
+                product_id = int(product["product_id"])
+                if product_id in rows:
+                    continue
+                if product_id in journal:
+                    # Stand aus dem Journal an derselben Stelle, gelöschte (None) auslassen
+                    product = journal.pop(product_id)
+                    if product is None:
+                        continue
+                    line = self._serialize(product)
+                rows[product_id] = line
+                yield product
+        # neu hinzugekommene Produkte aus dem Journal
+        for product_id, product in journal.items():
+            if product is not None:
+                rows[product_id] = self._serialize(product)
+                yield product
+
+        self._rows = rows
+        self._snapshot_stamp = snapshot_stamp
+        self._journal_offset = journal_offset
+        self._journal_records = journal_records
+
+    def _read_journal(self, offset: int = 0) -> tuple[dict, int, int]:
+        """Last journaled state per product id (``None`` = deleted) from ``offset``
+        on, the number of records and the offset after the last complete record."""
+        if not os.path.exists(self.journal_path):
+            return {}, 0, 0
+        with open(self.journal_path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+        complete = data.rfind(b"\n") + 1
+        if complete < len(data):
+            # unvollständige letzte Zeile nach einem Absturz abschneiden, sonst hängt der nächste Eintrag daran
+            Constants.LOGGER.warning(f"Unvollständigen Journal-Eintrag verworfen: {data[complete:complete + 80]!r}")
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(offset + complete)
+        journal = {}
+        count = 0
+        for line in data[:complete].decode("utf-8").splitlines():
+            try:
+                record = self.codec.loads(line)
+            except ValueError:
+                Constants.LOGGER.warning(f"Defekter Journal-Eintrag ignoriert: {line[:80]!r}")
+                continue
+            if record.get("op") == "delete":
+                journal[int(record["product_id"])] = None
+            else:
+                journal[int(record["product"]["product_id"])] = record["product"]
+            count += 1
+        return journal, count, offset + complete
+
+    def _sync(self) -> None:
+        """Bring ``_rows`` up to date with changes of other processes (lock held)."""
+        if not self._loaded:
+            for _ in self.iter_products():
+                pass
+            return
+        journal_size = os.path.getsize(self.journal_path) if os.path.exists(self.journal_path) else 0
+        if self._stamp(self.path) != self._snapshot_stamp or journal_size < self._journal_offset:
+            # ein anderer Prozess hat kompaktiert: alles neu lesen, die eigene Basis bleibt
+            for _ in self._read_files():
+                pass
+            Constants.LOGGER.info(f"Von einem anderen Prozess kompaktierten Stand neu gelesen: {self.path}")
+        elif journal_size > self._journal_offset:
+            journal, count, self._journal_offset = self._read_journal(self._journal_offset)
+            for product_id, product in journal.items():
+                if product is None:
+                    self._rows.pop(product_id, None)
+                else:
+                    self._rows[product_id] = self._serialize(product)
+            self._journal_records += count
+            if count:
+                Constants.LOGGER.info(f"{count} Journal-Einträge anderer Prozesse übernommen")
+
+    # --- Schreiben ------------------------------------------------------
+
+    def _append(self, records: list[str]) -> None:
+        if not records:
+            return
+        # nur kurz geöffnet: unter Windows ließe eine offene Datei kein Kompaktieren anderer Prozesse zu
+        with open(self.journal_path, "a", encoding="utf-8") as journal:
+            journal.write("".join(record + "\n" for record in records))
+            journal.flush()
+            if self.fsync:
+                os.fsync(journal.fileno())
+            self._journal_offset = journal.tell()
+        self._journal_records += len(records)
+        if self._journal_records >= self.compact_records:
+            self._start_compaction()
+
+    def upsert_products(self, products: Iterable[dict]) -> int:
+        """Journal the products that differ from the stored state. Products another
+        process changed since they were read are merged with its changes."""
+        with self._file_lock:
+            self._sync()
+            records = []
+            for product in products:
+                product_id = int(product["product_id"])
+                data = self._serialize(product)
+                base, current = self._base.get(product_id), self._rows.get(product_id)
+                self._base[product_id] = data
+                if current != base:
+                    merged = ProductMerge.merge(
+                        self.codec.loads(base) if base else None,
+                        self.codec.loads(current) if current else None,
+                        product,
+                    )
+                    if merged is None:
+                        del self._base[product_id]
+                        continue
+                    if merged is not product:
+                        data = self._serialize(merged)
+                if current != data:
+                    self._rows[product_id] = data
+                    # Produkt ist bereits kodiert, nur noch einbetten
+                    records.append(f'{{"op":"upsert","product":{data}}}')
+            self._append(records)
+            return len(records)
+
+    def delete_products(self, product_ids: Iterable) -> int:
+        with self._file_lock:
+            self._sync()
+            records = []
+            for product_id in {int(product_id) for product_id in product_ids}:
+                self._base.pop(product_id, None)
+                if self._rows.pop(product_id, None) is not None:
+                    records.append(f'{{"op":"delete","product_id":{product_id}}}')
+            self._append(records)
+            return len(records)
+
+    def save_products(self, products: list[dict]) -> None:
+        """Store the complete catalog: only changed and removed products are journaled.
+        Products added by another process meanwhile are kept."""
+        with self._file_lock:
+            self._sync()
+            removed = set(self._base) - {int(product["product_id"]) for product in products}
+            deleted = self.delete_products(removed)
+            written = self.upsert_products(products)
+        Constants.LOGGER.info(
+            f"Produkte gespeichert unter: {self.journal_path} ({written} geschrieben, {deleted} gelöscht)"
+        )
+
+    def snapshot(self) -> bytes:
+        """Current catalog as compact JSON, e.g. for backups."""
+        with self._file_lock:
+            self._sync()
+            return ("[" + ",".join(self._rows.values()) + "]").encode("utf-8")
+
+    # --- Kompaktierung --------------------------------------------------
+
+    def _start_compaction(self) -> None:
+        if self._compaction is not None and self._compaction.is_alive():
+            return
+        self._compaction = threading.Thread(target=self.compact, name="galaxo-journal-compaction", daemon=True)
+        self._compaction.start()
+
+    def _wait_for_compaction(self) -> None:
+        compaction = self._compaction
+        if compaction is not None and compaction.is_alive() and compaction is not threading.current_thread():
+            compaction.join()
+
+    def compact(self) -> None:
+        """Write the current state as snapshot and remove the folded records from the journal."""
+        with self._file_lock:
+            if not self._loaded:
+                return
+            self._sync()
+            snapshot = list(self._rows.values())
+            snapshot_stamp = self._snapshot_stamp
+            folded_bytes = self._journal_offset
+
+        # Schreiben ohne Sperre, Änderungen landen derweil weiter im Journal
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with self.codec.open_write(tmp_path) as f:
+            self.codec.write_array(f, snapshot)
+        with open(tmp_path, "rb") as f:
+            os.fsync(f.fileno())
+
+        with self._file_lock:
+            if self._stamp(self.path) != snapshot_stamp:
+                # ein anderer Prozess hat inzwischen kompaktiert, sein Snapshot enthält bereits alles
+                os.remove(tmp_path)
+                return
+            os.replace(tmp_path, self.path)
+            tail = b""
+            if os.path.exists(self.journal_path):
+                with open(self.journal_path, "rb") as f:
+                    f.seek(folded_bytes)
+                    tail = f.read()
+            journal_tmp = f"{self.journal_path}.{os.getpid()}.tmp"
+            with open(journal_tmp, "wb") as f:
+                f.write(tail)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(journal_tmp, self.journal_path)
+            self._snapshot_stamp = self._stamp(self.path)
+            self._journal_offset -= folded_bytes
+            self._journal_records = tail.count(b"\n")
+        Constants.LOGGER.info(f"Journal in Snapshot übernommen: {self.path} ({len(snapshot)} Produkte)")
+
+    def close(self) -> None:
+        """Fold the journal into the snapshot; registered to run at exit."""
+        self._wait_for_compaction()
+        with self._file_lock:
+            if self._journal_records:
+                self.compact()
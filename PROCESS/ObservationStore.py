@@ -0,0 +1,251 @@
+import os
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator
+
+from CONFIG.Constants import Constants
+from PROCESS.FileLock import FileLock
+
+
+class ObservationStore:
+    """Append-only time series of (timestamp, product_id, price, stock) observations.
+
+    Data lives in columnar segments of fixed-width binary files (one
+    ``array`` per column). New observations are appended to the unsorted
+    ``log`` segment; ``compact()`` merges it into the ``main`` segment, which
+    is sorted by (product_id, timestamp) so per-product range reads are a
+    binary search. Compaction drops observations older than the retention
+    and collapses runs of unchanged price/stock to their first and last
+    observation. The active main segment is selected by the ``CURRENT`` file,
+    so an interrupted compaction leaves the previous one intact.
+
+    GUI and cron refresh may write at the same time: every operation holds
+    the FileLock ``LOCK`` and reloads the segments when another process
+    changed them. Columns are appended one file at a time, so after an
+    interrupted append the log files are cut back to their common row count.
+    """
+
+    COLUMNS = (("ts", "q"), ("product_id", "q"), ("price", "d"), ("stock", "q"))
+
+    def __init__(self, directory: str = Constants.OBSERVATION_DIR,
+                 compact_rows: int = Constants.OBSERVATION_COMPACT_ROWS,
+                 retention_days: int = Constants.OBSERVATION_RETENTION_DAYS):
+        self.directory = directory
+        self.compact_rows = compact_rows
+        self.retention_days = retention_days
+        self._lock = FileLock(os.path.join(directory, "LOCK"))
+        self._main = None
+        self._main_segment = None
+        self._log = None
+        self._stamp = None
+
+    # --- Segmente -------------------------------------------------------
+
+    def _column_path(self, segment: str, column: str) -> str:
+        return os.path.join(self.directory, segment, f"{column}.bin")
+
+    def _current_main(self) -> str | None:
+        try:
+            with open(os.path.join(self.directory, "CURRENT"), "r", encoding="utf-8") as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def _read_segment(self, segment: str | None) -> dict:
+        columns = {name: array(typecode) for name, typecode in self.COLUMNS}
+        if segment is None:
+            return columns
+        sizes = {}
+        for name, typecode in self.COLUMNS:
+            path = self._column_path(segment, name)
+            if not os.path.exists(path):
+                continue
+            with open(path, "rb") as f:
+                data = f.read()
+            sizes[name] = len(data)
+            column = columns[name]
+            column.frombytes(data[:len(data) - len(data) % column.itemsize])
+        # nach einem abgebrochenen Append können Spalten unterschiedlich lang sein:
+        # auch die Dateien kürzen, sonst schreibt der nächste Append versetzt weiter
+        rows = min(len(column) for column in columns.values())
+        for name, column in columns.items():
+            del column[rows:]
+            if sizes.get(name, 0) > rows * column.itemsize:
+                Constants.LOGGER.warning(
+                    f"Unvollständige Beobachtungen in {segment}/{name}.bin auf {rows} Zeilen gekürzt"
+                )
+                with open(self._column_path(segment, name), "r+b") as f:
+                    f.truncate(rows * column.itemsize)
+        return columns
+
+    def _write_segment(self, segment: str, columns: dict, mode: str = "wb") -> None:
+        os.makedirs(os.path.join(self.directory, segment), exist_ok=True)
+        for name, _ in self.COLUMNS:
+            with open(self._column_path(segment, name), mode) as f:
+                columns[name].tofile(f)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _disk_stamp(self) -> tuple:
+        paths = [os.path.join(self.directory, "CURRENT")]
+        paths += [self._column_path("log", name) for name, _ in self.COLUMNS]
+        stamp = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+                stamp.append((st.st_ino, st.st_size, st.st_mtime_ns))
+            except FileNotFoundError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def _sync(self) -> None:
+        """Reload the segments if another process appended or compacted (lock held)."""
+        if self._log is not None and self._disk_stamp() == self._stamp:
+            return
+        current = self._current_main()
+        if self._main is None or current != self._main_segment:
+            self._main, self._main_segment = self._read_segment(current), current
+        self._log = self._read_segment("log")
+        self._stamp = self._disk_stamp()
+
+    # --- Schreiben ------------------------------------------------------
+
+    def append(self, observations: Iterable[tuple]) -> int:
+        """Append (timestamp, product_id, price, stock) tuples; compacts once the log is large enough."""
+        batch = {name: array(typecode) for name, typecode in self.COLUMNS}
+        for ts, product_id, price, stock in observations:
+            batch["ts"].append(int(ts))
+            batch["product_id"].append(int(product_id))
+            batch["price"].append(float(price))
+            batch["stock"].append(int(stock))
+        count = len(batch["ts"])
+        if not count:
+            return 0
+
+        with self._lock:
+            self._sync()
+            log = self._log
+            self._write_segment("log", batch, mode="ab")
+            for name, _ in self.COLUMNS:
+                log[name].extend(batch[name])
+            self._stamp = self._disk_stamp()
+            if len(log["ts"]) >= self.compact_rows:
+                self.compact()
+        return count
+
+    def append_products(self, products: Iterable) -> int:
+        """Record the current price and stock of refreshed ProductData objects."""
+        now = int(time.time())
+        return self.append(
+            (product.last_refresh or now, product.product_id, product.current_price, product.stock_count)
+            for product in products
+        )
+
+    def compact(self) -> dict:
+        """Merge the log into a new sorted main segment and apply the retention policy."""
+        with self._lock:
+            self._sync()
+            main, log = self._main, self._log
+            rows = [
+                (columns["product_id"][i], columns["ts"][i], columns["price"][i], columns["stock"][i])
+                for columns in (main, log)
+                for i in range(len(columns["ts"]))
+            ]
+            before = len(rows)
+            rows.sort()
+
+            cutoff = time.time() - self.retention_days * 86400 if self.retention_days else None
+            merged = {name: array(typecode) for name, typecode in self.COLUMNS}
+            kept = []
+            for row in rows:
+                product_id, ts, price, stock = row
+                if cutoff is not None and ts < cutoff:
+                    continue
+                if kept and kept[-1][0] == product_id:
+                    if kept[-1][1] == ts:
+                        kept[-1] = row
+                        continue
+                    # mittlere Beobachtung eines Laufs ohne Änderung verwerfen
+                    if (len(kept) > 1 and kept[-2][0] == product_id
+                            and kept[-2][2:] == kept[-1][2:] == (price, stock)):
+                        kept[-1] = row
+                        continue
+                kept.append(row)
+            for product_id, ts, price, stock in kept:
+                merged["product_id"].append(product_id)
+                merged["ts"].append(ts)
+                merged["price"].append(price)
+                merged["stock"].append(stock)
+
+            current = self._current_main()
+            generation = int(current.split("_")[1]) + 1 if current else 1
+            segment = f"main_{generation:06d}"
+            self._write_segment(segment, merged)
+            current_path = os.path.join(self.directory, "CURRENT")
+            with open(f"{current_path}.tmp", "w", encoding="utf-8") as f:
+                f.write(segment)
+            os.replace(f"{current_path}.tmp", current_path)
+
+            empty = {name: array(typecode) for name, typecode in self.COLUMNS}
+            self._write_segment("log", empty)
+            if current:
+                for name, _ in self.COLUMNS:
+                    try:
+                        os.remove(self._column_path(current, name))
+                    except OSError:
+                        pass
+                try:
+                    os.rmdir(os.path.join(self.directory, current))
+                except OSError:
+                    pass
+            self._main, self._main_segment, self._log = merged, segment, empty
+            self._stamp = self._disk_stamp()
+
+            result = {"rows_before": before, "rows_after": len(kept), "segment": segment}
+            Constants.LOGGER.info(f"Beobachtungen kompaktiert: {result}")
+            return result
+
+    # --- Lesen ----------------------------------------------------------
+
+    def range(self, product_id: int, start: int = None, end: int = None) -> list[tuple]:
+        """(timestamp, price, stock) of one product with start <= timestamp <= end, sorted by time."""
+        product_id = int(product_id)
+        low = start if start is not None else -(2 ** 63)
+        high = end if end is not None else 2 ** 63 - 1
+        with self._lock:
+            self._sync()
+            main, log = self._main, self._log
+            ids, ts = main["product_id"], main["ts"]
+            first, last = bisect_left(ids, product_id), bisect_right(ids, product_id)
+            first, last = bisect_left(ts, low, first, last), bisect_right(ts, high, first, last)
+            result = [(ts[i], main["price"][i], main["stock"][i]) for i in range(first, last)]
+            result.extend(
+                (log["ts"][i], log["price"][i], log["stock"][i])
+                for i in range(len(log["ts"]))
+                if log["product_id"][i] == product_id and low <= log["ts"][i] <= high
+            )
+        result.sort()
+        return result
+
+    def scan(self, start: int = None, end: int = None) -> Iterator[tuple]:
+        """All (timestamp, product_id, price, stock) observations in the time window, main segment first."""
+        with self._lock:
+            self._sync()
+            segments = [self._main, self._log]
+        for columns in segments:
+            ts, ids, prices, stocks = (columns[name] for name, _ in self.COLUMNS)
+            for i in range(len(ts)):
+                if (start is None or ts[i] >= start) and (end is None or ts[i] <= end):
+                    yield ts[i], ids[i], prices[i], stocks[i]
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._sync()
+            main, log = self._main, self._log
+            return {
+                "segment": self._current_main(),
+                "main_rows": len(main["ts"]),
+                "log_rows": len(log["ts"]),
+                "bytes": sum(len(column) * column.itemsize for columns in (main, log) for column in columns.values()),
+            }
@@ -0,0 +1,85 @@
+from typing import Dict, Iterable, List
+
+from PROCESS.ProductData import ProductData
+
+
+class ProductCatalog:
+    """Products indexed by product_id with secondary indexes on category and brand.
+
+    The indexes are maintained incrementally on add, remove and replace;
+    a changed product is a new object that ``replace`` swaps in, so a
+    changed category or brand moves it to the right bucket. Iteration order
+    is the insertion order. Not thread-safe on its own, the ProductRepository
+    guards it with its lock.
+    """
+
+    def __init__(self, products: Iterable[ProductData] = ()):
+        self._by_id: Dict[int, ProductData] = {}
+        self._by_category: Dict[str, Dict[int, ProductData]] = {}
+        self._by_brand: Dict[str, Dict[int, ProductData]] = {}
+        # Schlüssel, unter denen ein Produkt indiziert ist
+        self._keys: Dict[int, tuple] = {}
+        for pd in products:
+            self.add(pd)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, product_id) -> bool:
+        return product_id in self._by_id
+
+    def get(self, product_id: int) -> ProductData | None:
+        return self._by_id.get(product_id)
+
+    def products(self) -> List[ProductData]:
+        return list(self._by_id.values())
+
+    def add(self, pd: ProductData) -> bool:
+        """Add a product; returns False if its id is already present."""
+        if pd.product_id in self._by_id:
+            return False
+        self._by_id[pd.product_id] = pd
+        self._index(pd)
+        return True
+
+    def remove(self, product_id: int) -> ProductData | None:
+        pd = self._by_id.pop(product_id, None)
+        if pd is not None:
+            self._unindex(product_id)
+        return pd
+
+    def replace(self, pd: ProductData) -> bool:
+        """Swap in a changed version of a product, keeping its position;
+        returns False if the product is not (or no longer) in the catalog."""
+        if pd.product_id not in self._by_id:
+            return False
+        self._by_id[pd.product_id] = pd
+        self._unindex(pd.product_id)
+        self._index(pd)
+        return True
+
+    def by_category(self, category_name: str) -> List[ProductData]:
+        return list(self._by_category.get(category_name or "", {}).values())
+
+    def by_brand(self, brand_name: str) -> List[ProductData]:
+        return list(self._by_brand.get(brand_name or "", {}).values())
+
+    def category_counts(self) -> Dict[str, int]:
+        return {category: len(bucket) for category, bucket in self._by_category.items()}
+
+    def brand_counts(self) -> Dict[str, int]:
+        return {brand: len(bucket) for brand, bucket in self._by_brand.items()}
+
+    def _index(self, pd: ProductData) -> None:
+        keys = (pd.category_name or "", pd.brand_name or "")
+        self._by_category.setdefault(keys[0], {})[pd.product_id] = pd
+        self._by_brand.setdefault(keys[1], {})[pd.product_id] = pd
+        self._keys[pd.product_id] = keys
+
+    def _unindex(self, product_id: int) -> None:
+        category, brand = self._keys.pop(product_id)
+        for index, key in ((self._by_category, category), (self._by_brand, brand)):
+            bucket = index[key]
+            del bucket[product_id]
+            if not bucket:
+                del index[key]
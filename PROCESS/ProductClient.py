@@ -1,9 +1,12 @@
-from typing import Optional
+import asyncio
+from typing import Dict, Iterable, Optional
 
 from API.ProductDetailsClient_PDP import ProductDetailsClient_PDP
 from CONFIG.Constants import Constants
 from API.OfferAvailabilityClient import OfferAvailabilityClient
 from API.PriceHistoryClient import PriceHistoryClient
+from PROCESS.ResponseCache import ResponseCache
+from PROCESS.SingleFlight import SingleFlight
 
 
 class ProductDetails:
@@ -25,11 +28,19 @@ class ProductDetails:
 
 
 class ProductClient:
+    PDP_OPERATION = "PDP_GET_PRODUCT_DETAILS"
+    OFFERS_OPERATION = "PDP_GET_PRODUCT_OFFERS"
+    # gemeinsam für alle Instanzen: die GUI erzeugt pro Aktion einen eigenen ProductClient
+    _single_flight = SingleFlight()
+    # Produktdaten, die sich praktisch nie ändern und im ResponseCache landen
+    STATIC_FIELDS = ("product_name", "brand_name", "category_name", "url", "image_url")
+
     def __init__(
         self,
         details_client: Optional[ProductDetailsClient_PDP] = None,
         availability_client: Optional[OfferAvailabilityClient] = None,
-        price_history_client: Optional[PriceHistoryClient] = None
+        price_history_client: Optional[PriceHistoryClient] = None,
+        response_cache: Optional[ResponseCache] = None
     ):
         """Create the ProductClient.
 
@@ -39,6 +50,7 @@ class ProductClient:
         self.details_client = details_client
         self.availability_client = availability_client
         self.price_history_client = price_history_client
+        self.response_cache = response_cache or ResponseCache.instance()
         self.logger = Constants.LOGGER
 
     def _ensure_clients(self, include_price_history: bool = True) -> None:
@@ -56,14 +68,23 @@ class ProductClient:
             self.price_history_client = PriceHistoryClient()
 
     def get_full_product_details(self, product_id: str, include_price_history: bool = True) -> Optional[ProductDetails]:
-        """Fetch product details and optionally the price history."""
+        """Fetch product details and optionally the price history.
+        Concurrent calls for the same product share one fetch."""
         self._ensure_clients(include_price_history=include_price_history)
+        return self._single_flight.do(
+            (self.PDP_OPERATION, product_id, include_price_history),
+            self._fetch_full_product_details, product_id, include_price_history
+        )
+
+    def _fetch_full_product_details(self, product_id: str, include_price_history: bool) -> Optional[ProductDetails]:
         self.logger.info(f"Fetching full product details for: {product_id}")
         if product_id == '0' or product_id ==0:
             self.logger.warning(f"wrong product id {product_id}")
             return
         try:
             pdp_data = self.details_client.get_product_details_pdp(product_id)
+            if pdp_data is None:
+                return None
             price_history = {}
             if include_price_history:
                 try:
@@ -84,28 +105,315 @@ class ProductClient:
                 )
                 stock_count = 0
 
-            current_price = pdp_data.price
-            min_price = (price_history or {}).get("min_price") or current_price
-            max_price = (price_history or {}).get("max_price") or current_price
-            min_price = min(min_price, current_price)
-
-            return ProductDetails(
-                current_price=current_price,
-                image_url=pdp_data.image_url,
-                product_name=pdp_data.name,
-                brand_name=pdp_data.brand,
-                url=pdp_data.product_url,
-                category_name=pdp_data.category,
-                product_id=product_id,
-                stock_count=stock_count,
-                min_price=min_price,
-                max_price=max_price
-            )
+            return self._build_product_details(product_id, pdp_data, stock_count, price_history)
 
         except Exception as e:
             self.logger.error(f"Unhandled error for {product_id}: {e}", exc_info=True)
             return None
 
+    async def get_full_product_details_async(self, product_id: str, include_price_history: bool = True) -> Optional[ProductDetails]:
+        """Async variant of ``get_full_product_details``.
+
+        Runs inside the service loop; the price history request is issued
+        concurrently with the PDP request, availability follows once the
+        cheapest offer is known.
+        """
+        return await self._single_flight.do_async(
+            (self.PDP_OPERATION, product_id, include_price_history),
+            self._fetch_full_product_details_async, product_id, include_price_history
+        )
+
+    async def _fetch_full_product_details_async(self, product_id: str, include_price_history: bool) -> Optional[ProductDetails]:
+        self.logger.info(f"Fetching full product details (async) for: {product_id}")
+        if product_id == '0' or product_id ==0:
+            self.logger.warning(f"wrong product id {product_id}")
+            return None
+        try:
+            history_task = None
+            if include_price_history:
+                history_task = asyncio.ensure_future(
+                    self.price_history_client.get_pdp_price_history_async(product_id)
+                )
+
+            pdp_data = await self.details_client.get_product_details_pdp_async(product_id)
+            if pdp_data is None:
+                if history_task is not None:
+                    history_task.cancel()
+                return None
+
+            try:
+                stock_count = await self.availability_client.get_offer_availability_async(
+                    product_id, pdp_data.offer_id, pdp_data.offer_type
+                )
+            except Exception as e:
+                self.logger.warning(
+                    f"Stock count unavailable for {product_id}: {e}", exc_info=True
+                )
+                stock_count = 0
+
+            price_history = {}
+            if history_task is not None:
+                try:
+                    price_history = await history_task
+                except Exception as e:
+                    self.logger.warning(
+                        f"Price history unavailable for {product_id}: {e}", exc_info=True
+                    )
+                    price_history = {}
+
+            return self._build_product_details(product_id, pdp_data, stock_count, price_history)
+
+        except Exception as e:
+            self.logger.error(f"Unhandled error for {product_id}: {e}", exc_info=True)
+            return None
+
+    async def get_full_product_details_batch_async(self, product_ids: Iterable, include_price_history: bool = True) -> Dict[int, Optional[ProductDetails]]:
+        """Fetch several products with two batched GraphQL round trips.
+
+        The first request packs one PDP operation per product, the second one
+        availability operation per cheapest offer found in the first round.
+        The price history endpoint does not support batching and is queried
+        per product concurrently. Products already in flight are not requested
+        again but share the running fetch.
+        """
+        return await self._single_flight.do_many_async(
+            self.PDP_OPERATION, product_ids, self._fetch_full_product_details_batch_async, include_price_history
+        )
+
+    async def _fetch_full_product_details_batch_async(self, product_ids: Iterable, include_price_history: bool) -> Dict[int, Optional[ProductDetails]]:
+        product_ids = [pid for pid in product_ids if pid != '0' and pid != 0]
+        self.logger.info(f"Fetching full product details (batch) for {len(product_ids)} products")
+        history_tasks = {}
+        if include_price_history:
+            history_tasks = {
+                pid: asyncio.ensure_future(self.price_history_client.get_pdp_price_history_async(pid))
+                for pid in product_ids
+            }
+
+        pdp_results = await self.details_client.get_product_details_pdp_batch_async(product_ids)
+        stock_counts = await self.availability_client.get_offer_availability_batch_async(
+            (pid, pdp_data.offer_id, pdp_data.offer_type)
+            for pid, pdp_data in pdp_results.items() if pdp_data is not None
+        )
+
+        results = {}
+        for pid in product_ids:
+            pdp_data = pdp_results.get(pid)
+            history_task = history_tasks.get(pid)
+            if pdp_data is None:
+                if history_task is not None:
+                    history_task.cancel()
+                results[pid] = None
+                continue
+
+            price_history = {}
+            if history_task is not None:
+                try:
+                    price_history = await history_task
+                except Exception as e:
+                    self.logger.warning(
+                        f"Price history unavailable for {pid}: {e}", exc_info=True
+                    )
+            results[pid] = self._build_product_details(pid, pdp_data, stock_counts.get(pid, 0), price_history)
+        return results
+
+    def get_full_product_details_batch(self, product_ids: Iterable, include_price_history: bool = True) -> Dict[int, Optional[ProductDetails]]:
+        """Sync wrapper around ``get_full_product_details_batch_async``."""
+        self._ensure_clients(include_price_history=include_price_history)
+        return self.details_client.run_coro(
+            self.get_full_product_details_batch_async(product_ids, include_price_history=include_price_history)
+        )
+
+    async def get_price_updates_batch_async(self, product_ids: Iterable) -> Dict[int, Optional[ProductDetails]]:
+        """Price-only refresh for several products.
+
+        Runs the lightweight offers query and takes the static metadata from
+        the response cache. Products without fresh cached metadata or whose
+        offer set changed fall back to the full PDP query.
+        """
+        return await self._single_flight.do_many_async(
+            self.OFFERS_OPERATION, product_ids, self._fetch_price_updates_batch_async
+        )
+
+    async def _fetch_price_updates_batch_async(self, product_ids: Iterable) -> Dict[int, Optional[ProductDetails]]:
+        product_ids = [pid for pid in product_ids if pid != '0' and pid != 0]
+        cached = {pid: self._get_cached_refresh_state(pid) for pid in product_ids}
+        known_ids = [pid for pid in product_ids if cached[pid]]
+
+        offers = await self.details_client.get_product_offers_pdp_batch_async(known_ids) if known_ids else {}
+        unchanged = {
+            pid: product_offers for pid, product_offers in offers.items()
+            if product_offers is not None and product_offers.offer_signature == cached[pid]["offer_signature"]
+        }
+        # fehlgeschlagene Preisabfragen nicht nochmals voll abfragen
+        full_ids = [pid for pid in product_ids if pid not in unchanged and not (pid in offers and offers[pid] is None)]
+        if full_ids:
+            self.logger.info(f"Full PDP query for {len(full_ids)} of {len(product_ids)} products (offers changed or not cached)")
+
+        results = {pid: None for pid in product_ids}
+        if full_ids:
+            results.update(await self.get_full_product_details_batch_async(full_ids, include_price_history=False))
+
+        stock_counts = await self.availability_client.get_offer_availability_batch_async(
+            (pid, product_offers.offer_id, product_offers.offer_type)
+            for pid, product_offers in unchanged.items()
+        )
+        for pid, product_offers in unchanged.items():
+            results[pid] = self._build_price_update(pid, cached[pid], product_offers, stock_counts.get(pid, 0))
+        return results
+
+    def get_price_update(self, product_id) -> Optional[ProductDetails]:
+        """Price-only refresh of a single product, see ``get_price_updates_batch_async``."""
+        self._ensure_clients(include_price_history=False)
+        return self.details_client.run_coro(self.get_price_updates_batch_async([product_id])).get(product_id)
+
+    def get_price_updates_bulk(
+        self,
+        product_ids: Iterable,
+        max_concurrency: int = Constants.REFRESH_MAX_CONCURRENCY,
+        batch_size: int = Constants.GRAPHQL_BATCH_SIZE,
+        failure_budget: Optional[int] = None,
+    ) -> Dict[int, Optional[ProductDetails]]:
+        """Concurrent price-only refresh, batched like ``get_full_product_details_bulk``."""
+        self._ensure_clients(include_price_history=False)
+        return self._run_bulk(product_ids, self.get_price_updates_batch_async, max_concurrency, batch_size,
+                              failure_budget)
+
+    def get_full_product_details_bulk(
+        self,
+        product_ids: Iterable,
+        include_price_history: bool = True,
+        max_concurrency: int = Constants.REFRESH_MAX_CONCURRENCY,
+        batch_size: int = Constants.GRAPHQL_BATCH_SIZE,
+        failure_budget: Optional[int] = None,
+    ) -> Dict[int, Optional[ProductDetails]]:
+        """Fetch many products concurrently in the service loop.
+
+        Products are grouped into batches of ``batch_size`` (one GraphQL POST
+        per batch and round); at most ``max_concurrency`` batches - or single
+        products when ``batch_size`` is 1 - are in flight at any time.
+        Returns a dict product_id -> ProductDetails (or ``None`` on failure).
+        Once ``failure_budget`` products failed, the remaining batches are not
+        requested any more and their ids are missing from the result.
+        """
+        self._ensure_clients(include_price_history=include_price_history)
+
+        async def _fetch_chunk(chunk):
+            if len(chunk) == 1:
+                return {chunk[0]: await self.get_full_product_details_async(
+                    chunk[0], include_price_history=include_price_history
+                )}
+            return await self.get_full_product_details_batch_async(
+                chunk, include_price_history=include_price_history
+            )
+
+        return self._run_bulk(product_ids, _fetch_chunk, max_concurrency, batch_size, failure_budget)
+
+    def _run_bulk(self, product_ids: Iterable, fetch_chunk, max_concurrency: int, batch_size: int,
+                  failure_budget: Optional[int] = None) -> dict:
+        """Run ``fetch_chunk`` for every batch of ids in the service loop, bounded by a semaphore.
+        Batches that start after ``failure_budget`` failures are skipped."""
+        product_ids = list(product_ids)
+        if not product_ids:
+            return {}
+        batch_size = max(1, batch_size)
+        chunks = [product_ids[i:i + batch_size] for i in range(0, len(product_ids), batch_size)]
+
+        async def _fetch_all():
+            semaphore = asyncio.Semaphore(max(1, max_concurrency))
+            failures = 0
+
+            async def _fetch_bounded(chunk):
+                nonlocal failures
+                async with semaphore:
+                    if failure_budget is not None and failures >= failure_budget:
+                        return None
+                    result = await fetch_chunk(chunk)
+                    previous, failures = failures, failures + sum(1 for pid in chunk if result.get(pid) is None)
+                    if failure_budget is not None and previous < failure_budget <= failures:
+                        self.logger.error(f"Fehlerbudget erschöpft ({failures} Fehler), restliche Produkte werden übersprungen")
+                    return result
+
+            results = await asyncio.gather(
+                *(_fetch_bounded(chunk) for chunk in chunks), return_exceptions=True
+            )
+            merged = {}
+            for chunk, result in zip(chunks, results):
+                if result is None:
+                    continue
+                if isinstance(result, BaseException):
+                    self.logger.error(f"Batch mit {len(chunk)} Produkten fehlgeschlagen: {result}")
+                    result = {}
+                merged.update({pid: result.get(pid) for pid in chunk})
+            return merged
+
+        return self.details_client.run_coro(_fetch_all())
+
+    def get_cached_static_details(self, product_id) -> Optional[dict]:
+        """Static metadata of a product from the response cache, ``None`` if expired or unknown."""
+        return self.response_cache.get(self.PDP_OPERATION, product_id, self.STATIC_FIELDS)
+
+    def _get_cached_refresh_state(self, product_id) -> Optional[dict]:
+        return self.response_cache.get(self.PDP_OPERATION, product_id, self.STATIC_FIELDS + ("offer_signature",))
+
+    def flush_cache(self) -> None:
+        self.response_cache.flush()
+
+    def cache_stats(self) -> dict:
+        return self.response_cache.stats()
+
+    def _build_product_details(self, product_id, pdp_data, stock_count, price_history) -> ProductDetails:
+        current_price = pdp_data.price
+        min_price = (price_history or {}).get("min_price") or current_price
+        max_price = (price_history or {}).get("max_price") or current_price
+        min_price = min(min_price, current_price)
+
+        details = ProductDetails(
+            current_price=current_price,
+            image_url=pdp_data.image_url,
+            product_name=pdp_data.name,
+            brand_name=pdp_data.brand,
+            url=pdp_data.product_url,
+            category_name=pdp_data.category,
+            product_id=product_id,
+            stock_count=stock_count,
+            min_price=min_price,
+            max_price=max_price
+        )
+        self.response_cache.put(
+            self.PDP_OPERATION, product_id,
+            {**{name: getattr(details, name) for name in self.STATIC_FIELDS},
+             "offer_signature": getattr(pdp_data, "offer_signature", "")}
+        )
+        return details
+
+    @staticmethod
+    def _build_price_update(product_id, cached: dict, product_offers, stock_count) -> ProductDetails:
+        return ProductDetails(
+            current_price=product_offers.price,
+            image_url=cached["image_url"],
+            product_name=cached["product_name"],
+            brand_name=cached["brand_name"],
+            url=cached["url"],
+            category_name=cached["category_name"],
+            product_id=product_id,
+            stock_count=stock_count,
+            min_price=product_offers.price,
+            max_price=product_offers.price
+        )
+
+    def transport_stats(self) -> dict:
+        """Active GraphQL transport and browser fallback count (empty before first use)."""
+        if hasattr(self.details_client, "transport_stats"):
+            return self.details_client.transport_stats()
+        return {}
+
+    def pool_stats(self) -> dict:
+        """Playwright page pool utilization (empty while the browser is not started)."""
+        if hasattr(self.details_client, "pool_stats"):
+            return self.details_client.pool_stats()
+        return {}
+
     def shutdown(self):
         if hasattr(self.details_client, "close"):
             self.details_client.close()
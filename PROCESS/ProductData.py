@@ -1,8 +1,11 @@
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 from PROCESS.ProductDataCalculator import ProductDataCalculator
 
-@dataclass
+@dataclass(slots=True)
 class ProductData:
+    """One catalog product. Slotted (no per-instance __dict__); the factory and
+    the calculator intern the low-cardinality strings (category, brand and the
+    derived change labels), so large catalogs share one copy of each value."""
     product_id: int
     product_name: str
     brand_name: str
@@ -31,6 +34,11 @@ class ProductData:
     min_flag: bool = False
     max_flag: bool = False
 
+    # Aktualisierungsstatistik für den RefreshScheduler
+    last_refresh: int = 0
+    refresh_count: int = 0
+    change_rate: float = 1.0
+
     def update_context_fields(self):
         # Die Berechnungen und die Logik sind nun in einer separaten Klasse
         product_data_calculator = ProductDataCalculator(self)
@@ -38,4 +46,8 @@ class ProductData:
         product_data_calculator.evaluate_price_extremes()
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        # flach, daher ohne die rekursive Kopie von asdict()
+        return {name: getattr(self, name) for name in _FIELD_NAMES}
+
+
+_FIELD_NAMES = tuple(f.name for f in fields(ProductData))
@@ -1,50 +1,83 @@
-from typing import Union
+import sys
+from typing import Iterable, List, Tuple, Union
 from datetime import datetime
 from PROCESS.ProductClient import ProductDetails
 from PROCESS.ProductData import ProductData
-from PROCESS.ProductDataCalculator import ProductDataCalculator
-from UTILS.ProductDataUtils import ProductDataUtils
+from PROCESS.BatchProductDataCalculator import BatchProductDataCalculator
+from CONFIG.Constants import Constants
 
 class ProductFactory:
 
     @staticmethod
     def from_source(source: Union[dict, ProductDetails]) -> ProductData:
+        return ProductFactory.from_sources([source])[0]
+
+    @staticmethod
+    def from_sources(sources: Iterable[Union[dict, ProductDetails]]) -> List[ProductData]:
+        """Build many products at once; the derived fields are computed for all
+        of them in one batch, e.g. when loading the catalog."""
+        products = [ProductFactory._build(source) for source in sources]
+        # Kontextfelder werden gesammelt im BatchProductDataCalculator berechnet
+        BatchProductDataCalculator.calculate_price_position(products)
+        BatchProductDataCalculator.calculate_context_fields(products)
+        return products
+
+    @staticmethod
+    def _build(source: Union[dict, ProductDetails]) -> ProductData:
         get = lambda k, d=None: ProductFactory._get(source, k, d)
 
         current_price = float(get("current_price", 0))
         stock_count = int(get("stock_count", 0))
-        min_price = float(get("min_price", 0))
-        max_price = float(get("max_price", 0))
-        preisverlust = ProductDataUtils.calculate_preisverlust_percentage(current_price, max_price)
 
-        product = ProductData(
+        return ProductData(
             product_id=int(get("product_id", 0)),
             product_name=str(get("product_name", "")),
-            brand_name=str(get("brand_name", "")),
-            category_name=str(get("category_name", "")),
+            # Marke und Kategorie wiederholen sich: eine Kopie für alle Produkte
+            brand_name=sys.intern(str(get("brand_name", ""))),
+            category_name=sys.intern(str(get("category_name", ""))),
             current_price=current_price,
             old_price=float(get("old_price", current_price)),
             stock_count=stock_count,
             old_stock=int(get("old_stock", stock_count)),
-            min_price=min_price,
-            max_price=max_price,
-            min_price_erreicht=int(current_price <= min_price),
-            max_price_erreicht=int(current_price >= max_price),
-            preisverlust_percentage=preisverlust,
+            min_price=float(get("min_price", 0)),
+            max_price=float(get("max_price", 0)),
+            # berechnet calculate_price_position
+            min_price_erreicht=0,
+            max_price_erreicht=0,
+            preisverlust_percentage=0,
             url=str(get("url", "")),
             image_url=str(get("image_url", "")),
             insert_date=int(get("insert_date", datetime.now().timestamp())),
+            last_refresh=int(get("last_refresh", 0)),
+            refresh_count=int(get("refresh_count", 0)),
+            change_rate=float(get("change_rate", 1.0)),
         )
 
-        # Kontextfelder werden in einer separaten Klasse berechnet
-        calculator = ProductDataCalculator(product)
-        calculator.calculate_price_and_stock_changes()
-        calculator.evaluate_price_extremes()
+    @staticmethod
+    def update_existing(existing: ProductData, source: Union[dict, ProductDetails]) -> ProductData:
+        return ProductFactory.update_existing_many([(existing, source)])[0]
+
+    @staticmethod
+    def update_existing_many(updates: Iterable[Tuple[ProductData, Union[dict, ProductDetails]]]) -> List[ProductData]:
+        """Apply refreshed data to many products and recompute their derived fields in one batch."""
+        products = [ProductFactory._apply_source(existing, source) for existing, source in updates]
+
+        # Kontextberechnungen
+        BatchProductDataCalculator.calculate_context_fields(products)
+
+        # Änderungshäufigkeit als gleitender Mittelwert für den RefreshScheduler
+        alpha = Constants.SCHEDULER_CHANGE_ALPHA
+        now = int(datetime.now().timestamp())
+        for existing in products:
+            changed = existing.price_changed_flag or existing.stock_changed_flag
+            existing.change_rate = (1 - alpha) * existing.change_rate + alpha * float(changed)
+            existing.refresh_count += 1
+            existing.last_refresh = now
 
-        return product
+        return products
 
     @staticmethod
-    def update_existing(existing: ProductData, source: Union[dict, ProductDetails]) -> ProductData:
+    def _apply_source(existing: ProductData, source: Union[dict, ProductDetails]) -> ProductData:
         get = lambda k, d=None: ProductFactory._get(source, k, d)
 
         # Backup alte Werte
@@ -57,8 +90,8 @@ class ProductFactory:
 
         # Felder aktualisieren
         existing.product_name = str(get("product_name", existing.product_name))
-        existing.brand_name = str(get("brand_name", existing.brand_name))
-        existing.category_name = str(get("category_name", existing.category_name))
+        existing.brand_name = sys.intern(str(get("brand_name", existing.brand_name)))
+        existing.category_name = sys.intern(str(get("category_name", existing.category_name)))
         existing.url = str(get("url", existing.url))
         existing.image_url = str(get("image_url", existing.image_url))
         existing.insert_date = int(get("insert_date", existing.insert_date))
@@ -71,11 +104,6 @@ class ProductFactory:
         existing.current_price = new_price
         existing.stock_count = new_stock
 
-        # Kontextberechnungen
-        calculator = ProductDataCalculator(existing)
-        calculator.calculate_price_and_stock_changes()
-        calculator.evaluate_price_extremes()
-
         return existing
 
     @staticmethod
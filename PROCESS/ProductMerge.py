@@ -0,0 +1,26 @@
+from CONFIG.Constants import Constants
+
+
+class ProductMerge:
+    """Three-way merge of a stored product that another process changed meanwhile."""
+
+    @staticmethod
+    def merge(base: dict | None, theirs: dict | None, ours: dict) -> dict | None:
+        """Reconcile ``ours`` with the stored ``theirs``, both derived from ``base``
+        (the version this process read). Fields this process changed win, all
+        other fields keep the stored value. Returns None if the product was
+        deleted by the other process after this one read it.
+        """
+        if theirs is None:
+            if base is not None:
+                Constants.LOGGER.info(f"Produkt {ours.get('product_id')} wurde extern gelöscht, Änderung verworfen")
+                return None
+            return ours
+        if base is None:
+            # von beiden Prozessen neu eingefügt: eigener Stand gewinnt
+            return ours
+        merged = dict(theirs)
+        for name, value in ours.items():
+            if base.get(name) != value:
+                merged[name] = value
+        return merged
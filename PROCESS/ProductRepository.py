@@ -0,0 +1,203 @@
+import atexit
+import copy
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List
+
+from CONFIG.Constants import Constants
+from PROCESS.ProductCatalog import ProductCatalog
+from PROCESS.ProductData import ProductData
+from PROCESS.ProductFactory import ProductFactory
+from PROCESS.ProductStorage import ProductStorage
+
+
+@dataclass(frozen=True)
+class ProductChangeEvent:
+    """Delta published by the ProductRepository (product ids)."""
+    added: tuple = ()
+    removed: tuple = ()
+    updated: tuple = ()
+    reloaded: bool = False
+
+
+class ProductRepository:
+    """Thread-safe in-memory catalog shared by the GUI and GalaxoProcess.
+
+    The catalog (a ProductCatalog with id, category and brand indexes) is
+    read from ProductStorage once; afterwards every change
+    is applied in memory, published to the subscribers as a
+    ProductChangeEvent and written by a background thread. Pending writes
+    are coalesced per product, so a product changed twice before the writer
+    runs is stored once.
+
+    Products in the catalog are never changed in place: writers edit the
+    copies returned by ``copies`` and commit them with ``update``, which
+    swaps them in under the lock. Readers (GUI, writer thread) therefore
+    never see a half-updated product.
+    """
+
+    def __init__(self, autoload: bool = True):
+        self._catalog = ProductCatalog()
+        self._lock = threading.RLock()
+        self._listeners: List[Callable[[ProductChangeEvent], None]] = []
+        self._pending_upserts: dict[int, dict] = {}
+        self._pending_deletes: set[int] = set()
+        self._writer_condition = threading.Condition()
+        self._writing = False
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_loop, name="galaxo-repository-writer", daemon=True)
+        self._writer.start()
+        if autoload:
+            self.reload()
+        # nach dem Laden registriert, läuft also vor dem Schliessen des Speichers;
+        # close() meldet den Hook wieder ab
+        atexit.register(self.flush, Constants.BACKUP_EXIT_TIMEOUT)
+
+    # --- Lesen ----------------------------------------------------------
+
+    def products(self) -> List[ProductData]:
+        with self._lock:
+            return self._catalog.products()
+
+    def get(self, product_id: int) -> ProductData | None:
+        with self._lock:
+            return self._catalog.get(product_id)
+
+    def by_category(self, category_name: str) -> List[ProductData]:
+        with self._lock:
+            return self._catalog.by_category(category_name)
+
+    def by_brand(self, brand_name: str) -> List[ProductData]:
+        with self._lock:
+            return self._catalog.by_brand(brand_name)
+
+    def category_counts(self) -> Dict[str, int]:
+        with self._lock:
+            return self._catalog.category_counts()
+
+    def brand_counts(self) -> Dict[str, int]:
+        with self._lock:
+            return self._catalog.brand_counts()
+
+    def copies(self, product_ids: Iterable[int]) -> List[ProductData]:
+        """Detached copies of the given products to change and pass to ``update``."""
+        with self._lock:
+            products = (self._catalog.get(product_id) for product_id in product_ids)
+            return [copy.copy(pd) for pd in products if pd is not None]
+
+    def __contains__(self, product_id) -> bool:
+        with self._lock:
+            return product_id in self._catalog
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._catalog)
+
+    # --- Ändern ---------------------------------------------------------
+
+    def reload(self) -> None:
+        """Replace the catalog with the stored state, e.g. after another process changed it."""
+        self.flush()
+        catalog = ProductCatalog(ProductFactory.from_sources(ProductStorage.iter_products()))
+        with self._lock:
+            self._catalog = catalog
+        self._publish(ProductChangeEvent(reloaded=True))
+
+    def add(self, products: Iterable[ProductData]) -> List[ProductData]:
+        """Add new products; ids already in the catalog are ignored."""
+        with self._lock:
+            added = [pd for pd in products if self._catalog.add(pd)]
+            self._enqueue(upserts=added)
+        if added:
+            self._publish(ProductChangeEvent(added=tuple(pd.product_id for pd in added)))
+        return added
+
+    def remove(self, product_ids: Iterable[int]) -> List[ProductData]:
+        with self._lock:
+            removed = [pd for pd in (self._catalog.remove(pid) for pid in set(product_ids)) if pd is not None]
+            self._enqueue(deletes=[pd.product_id for pd in removed])
+        if removed:
+            self._publish(ProductChangeEvent(removed=tuple(pd.product_id for pd in removed)))
+        return removed
+
+    def update(self, products: Iterable[ProductData]) -> List[ProductData]:
+        """Swap in, persist and announce changed copies of catalog products. Products no
+        longer in the catalog (deleted meanwhile) are ignored and not stored again."""
+        with self._lock:
+            updated = [pd for pd in products if self._catalog.replace(pd)]
+            self._enqueue(upserts=updated)
+        if updated:
+            self._publish(ProductChangeEvent(updated=tuple(pd.product_id for pd in updated)))
+        return updated
+
+    # --- Benachrichtigung -----------------------------------------------
+
+    def subscribe(self, listener: Callable[[ProductChangeEvent], None]) -> None:
+        """Register a listener. It is called on the thread that made the change;
+        GUI listeners have to hand the event over to their main loop."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[ProductChangeEvent], None]) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def _publish(self, event: ProductChangeEvent) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                Constants.LOGGER.error(f"Fehler in Listener für Produktänderungen: {e}", exc_info=True)
+
+    # --- Speichern ------------------------------------------------------
+
+    def _enqueue(self, upserts: Iterable[ProductData] = (), deletes: Iterable[int] = ()) -> None:
+        # unter self._lock aufgerufen: der Schreib-Thread bekommt den Stand als dict
+        with self._writer_condition:
+            for pd in upserts:
+                self._pending_deletes.discard(pd.product_id)
+                self._pending_upserts[pd.product_id] = pd.to_dict()
+            for product_id in deletes:
+                self._pending_upserts.pop(product_id, None)
+                self._pending_deletes.add(product_id)
+            self._writer_condition.notify_all()
+
+    def _write_loop(self) -> None:
+        while True:
+            with self._writer_condition:
+                while not (self._pending_upserts or self._pending_deletes or self._closed):
+                    self._writer_condition.wait()
+                if self._closed and not (self._pending_upserts or self._pending_deletes):
+                    return
+                upserts, self._pending_upserts = self._pending_upserts, {}
+                deletes, self._pending_deletes = self._pending_deletes, set()
+                self._writing = True
+            try:
+                if deletes:
+                    ProductStorage.delete_products(list(deletes))
+                if upserts:
+                    ProductStorage.upsert_products(list(upserts.values()))
+            except Exception as e:
+                Constants.LOGGER.error(f"Produkte konnten nicht gespeichert werden: {e}", exc_info=True)
+            finally:
+                with self._writer_condition:
+                    self._writing = False
+                    self._writer_condition.notify_all()
+
+    def flush(self, timeout: float = None) -> bool:
+        """Wait until all changes are written to storage."""
+        with self._writer_condition:
+            return self._writer_condition.wait_for(
+                lambda: not (self._pending_upserts or self._pending_deletes or self._writing), timeout
+            )
+
+    def close(self) -> None:
+        """Write pending changes, stop the writer thread and drop the exit hook."""
+        with self._writer_condition:
+            self._closed = True
+            self._writer_condition.notify_all()
+        self._writer.join()
+        atexit.unregister(self.flush)
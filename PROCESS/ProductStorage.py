@@ -1,84 +1,50 @@
-import datetime
-import json
 import os
-import shutil
-import glob
-from datetime import datetime
-import hashlib
+from typing import Iterator
 
 from CONFIG.Constants import Constants
+from PROCESS.SQLiteProductStorage import SQLiteProductStorage
+from PROCESS.JournaledJsonStorage import JournaledJsonStorage
+from PROCESS.BackupManager import BackupManager
 
 class ProductStorage:
 
     @staticmethod
-    def load_products() -> list[dict]:
-        if os.path.exists(Constants.JSON_PATH):
-            with open(Constants.JSON_PATH, "r", encoding="utf-8") as f:
-                products = json.load(f)
-            Constants.LOGGER.info(f"Produkte erfolgreich geladen von: {Constants.JSON_PATH}")
-            ProductStorage.backup_products_file()
-            return products
-        Constants.LOGGER.error("Keine Produktdatei gefunden Rückgabe einer leeren Liste.")
-        return []
-    
-    @staticmethod
-    def save_products(products: list[dict]):
-        with open(Constants.JSON_PATH, "w", encoding="utf-8") as f:
-            json.dump(products, f, ensure_ascii=False, indent=2)
-            Constants.LOGGER.info(f"Produkte erfolgreich gespeichert unter: {Constants.JSON_PATH}")
+    def _backend() -> SQLiteProductStorage | JournaledJsonStorage:
+        if Constants.STORAGE_BACKEND == "sqlite":
+            return SQLiteProductStorage.instance()
+        return JournaledJsonStorage.instance()
 
     @staticmethod
-    def backup_products_file():
-        file_path = Constants.JSON_PATH
-        backup_dir = Constants.JSON_BACKUP_PATH
-
-        if not os.path.exists(file_path):
-            return
-
-        os.makedirs(backup_dir, exist_ok=True)
-
-        def calculate_md5(file_path):
-            hash_md5 = hashlib.md5()
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
-
-        latest_backup = None
-        backup_files = sorted(
-            glob.glob(os.path.join(backup_dir, f"{Constants.JSON_BACKUP_FILE_NAMES}*.json")),
-            key=os.path.getmtime,
-            reverse=True,
-        )
-
-        if backup_files:
-            latest_backup = backup_files[0]
+    def load_products() -> list[dict]:
+        return list(ProductStorage.iter_products())
 
-        if latest_backup:
-            current_md5 = calculate_md5(file_path)
-            backup_md5 = calculate_md5(latest_backup)
-            if current_md5 == backup_md5:
-                Constants.LOGGER.info("Kein Backup erforderlich: Dateiinhalt unverändert (MD5 identisch).")
+    @staticmethod
+    def iter_products() -> Iterator[dict]:
+        """Yield the stored products one by one; the backend reads them under its lock first."""
+        backend = ProductStorage._backend()
+        if isinstance(backend, JournaledJsonStorage):
+            if not os.path.exists(Constants.JSON_PATH) and not os.path.exists(backend.journal_path):
+                Constants.LOGGER.error("Keine Produktdatei gefunden Rückgabe einer leeren Liste.")
                 return
+        yield from backend.iter_products()
+        # Backup im Hintergrund, unveränderte Daten werden am Hash erkannt
+        BackupManager.instance().schedule(backend.snapshot)
 
-        # Backup erstellen
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{Constants.JSON_BACKUP_FILE_NAMES}{timestamp}.json"
-        backup_path = os.path.join(backup_dir, filename)
+    @staticmethod
+    def _stored_fields(product: dict) -> dict:
+        # abgeleitete Felder berechnet ProductFactory beim Laden neu
+        return {k: v for k, v in product.items() if k not in Constants.STORAGE_DERIVED_FIELDS}
 
-        shutil.copy(file_path, backup_path)
-        Constants.LOGGER.info(f"Backup gespeichert unter {backup_path}")
+    @staticmethod
+    def save_products(products: list[dict]):
+        """Store the complete catalog; both backends only write what changed."""
+        ProductStorage._backend().save_products([ProductStorage._stored_fields(p) for p in products])
 
-        # Alte Backups aufräumen (nur die 5 neuesten behalten)
-        backup_files = sorted(
-            glob.glob(os.path.join(backup_dir, f"{Constants.JSON_BACKUP_FILE_NAMES}*.json")),
-            key=os.path.getmtime,
-            reverse=True,
-        )
+    @staticmethod
+    def upsert_products(products: list[dict]):
+        """Insert or update single products."""
+        ProductStorage._backend().upsert_products([ProductStorage._stored_fields(p) for p in products])
 
-        for old_file in backup_files[5:]:
-            try:
-                os.remove(old_file)
-                Constants.LOGGER.info(f"Altes Backup gelöscht: {old_file}")
-            except Exception as e:
-                Constants.LOGGER.warning(f"Konnte Backup nicht löschen: {old_file}  {e}")
+    @staticmethod
+    def delete_products(product_ids: list):
+        ProductStorage._backend().delete_products(product_ids)
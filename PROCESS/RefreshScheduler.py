@@ -0,0 +1,59 @@
+import time
+from collections import Counter
+from typing import Iterable, List, Optional
+
+from CONFIG.Constants import Constants
+from PROCESS.ProductData import ProductData
+
+
+class RefreshScheduler:
+    """Assigns products to refresh tiers and decides which ones are due.
+
+    hot:  frequent price/stock changes, stock running low or a price that just
+          dropped close to ``min_price``
+    warm: occasional changes
+    cold: prices that hardly ever move
+    """
+
+    TIER_HOT = "hot"
+    TIER_WARM = "warm"
+    TIER_COLD = "cold"
+
+    @staticmethod
+    def tier(pd: ProductData) -> str:
+        if pd.refresh_count < Constants.SCHEDULER_MIN_OBSERVATIONS:
+            return RefreshScheduler.TIER_HOT
+        if pd.change_rate >= Constants.SCHEDULER_HOT_CHANGE_RATE:
+            return RefreshScheduler.TIER_HOT
+        # ein dauerhaft kleiner Bestand ist normal, nur ein sinkender ist ein Signal
+        if 0 < pd.stock_count <= Constants.SCHEDULER_LOW_STOCK and pd.stock_count < pd.old_stock:
+            return RefreshScheduler.TIER_HOT
+        if RefreshScheduler._dropped_near_min(pd):
+            return RefreshScheduler.TIER_HOT
+        if pd.change_rate >= Constants.SCHEDULER_WARM_CHANGE_RATE:
+            return RefreshScheduler.TIER_WARM
+        return RefreshScheduler.TIER_COLD
+
+    @staticmethod
+    def _dropped_near_min(pd: ProductData) -> bool:
+        # min_price enthält den aktuellen Preis: nur Preise, die sich je bewegt haben und
+        # zuletzt gefallen sind, zählen; ohne Preis (0) ist das Produkt nicht verfügbar
+        if pd.current_price <= 0 or pd.max_price <= pd.min_price:
+            return False
+        return (pd.current_price < pd.old_price
+                and pd.current_price <= pd.min_price * (1 + Constants.SCHEDULER_NEAR_MIN_PERCENT / 100))
+
+    @staticmethod
+    def is_due(pd: ProductData, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        interval = Constants.SCHEDULER_TIER_INTERVALS[RefreshScheduler.tier(pd)]
+        return now - pd.last_refresh >= interval
+
+    @staticmethod
+    def due_products(products: Iterable[ProductData], now: Optional[float] = None) -> List[ProductData]:
+        now = time.time() if now is None else now
+        return [pd for pd in products if RefreshScheduler.is_due(pd, now)]
+
+    @staticmethod
+    def tier_counts(products: Iterable[ProductData]) -> dict:
+        return dict(Counter(RefreshScheduler.tier(pd) for pd in products))
@@ -0,0 +1,71 @@
+import time
+from dataclasses import dataclass, field
+
+
+@dataclass
+class RefreshStats:
+    """Kennzahlen eines Aktualisierungslaufs (Durchsatz und Fehler)."""
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    not_attempted: int = 0
+    concurrent: bool = False
+    started_at: float = field(default_factory=time.time)
+    duration: float = 0.0
+    transport: dict = field(default_factory=dict)
+    cache: dict = field(default_factory=dict)
+    pool: dict = field(default_factory=dict)
+    tiers: dict = field(default_factory=dict)
+
+    def record(self, success: bool) -> None:
+        if success:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+
+    def finish(self) -> "RefreshStats":
+        self.duration = time.time() - self.started_at
+        return self
+
+    @property
+    def aborted(self) -> bool:
+        """True if the failure budget stopped the run before all due products were requested."""
+        return self.not_attempted > 0
+
+    @property
+    def throughput(self) -> float:
+        """Verarbeitete Produkte pro Sekunde."""
+        processed = self.succeeded + self.failed
+        return processed / self.duration if self.duration > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "total": self.total,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "not_attempted": self.not_attempted,
+            "aborted": self.aborted,
+            "concurrent": self.concurrent,
+            "started_at": int(self.started_at),
+            "duration": round(self.duration, 3),
+            "throughput": round(self.throughput, 2),
+            "transport": self.transport,
+            "cache": self.cache,
+            "pool": self.pool,
+            "tiers": self.tiers,
+        }
+
+    def summary(self) -> str:
+        summary = (
+            f"{self.succeeded}/{self.total} Produkte aktualisiert, {self.failed} Fehler, "
+            f"{self.skipped} nicht fällig, {self.not_attempted} abgebrochen "
+            f"in {self.duration:.1f}s ({self.throughput:.2f} Produkte/s)"
+        )
+        if self.pool:
+            summary += (
+                f", Seitenpool max. {self.pool['peak_in_use']}/{self.pool['size']} belegt, "
+                f"{self.pool['waits']}x gewartet, {self.pool['recycled']} ersetzt"
+            )
+        return summary
@@ -0,0 +1,118 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from CONFIG.Constants import Constants
+
+
+class ResponseCache:
+    """Persistent LRU cache for API response fields keyed by operation and product id.
+
+    Every field carries its own timestamp and is only served while it is
+    younger than its TTL in ``field_ttls``; fields without TTL are not cached.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self, path: str = Constants.RESPONSE_CACHE_PATH,
+                 max_entries: int = Constants.RESPONSE_CACHE_MAX_ENTRIES,
+                 field_ttls: dict = Constants.RESPONSE_CACHE_FIELD_TTLS):
+        self.path = path
+        self.max_entries = max_entries
+        self.field_ttls = field_ttls
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._entries_lock = threading.Lock()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    @classmethod
+    def instance(cls) -> "ResponseCache":
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = ResponseCache()
+            return cls._instance
+
+    @staticmethod
+    def _key(operation: str, product_id) -> str:
+        return f"{operation}:{int(product_id)}"
+
+    def get(self, operation: str, product_id, fields) -> Optional[dict]:
+        """Return the requested fields if all of them are cached and fresh, else ``None``."""
+        now = time.time()
+        key = self._key(operation, product_id)
+        with self._entries_lock:
+            entry = self._entries.get(key)
+            values = {}
+            for name in fields:
+                cached = entry.get(name) if entry else None
+                if cached is None or now - cached[1] > self.field_ttls.get(name, 0):
+                    self.misses += 1
+                    return None
+                values[name] = cached[0]
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return values
+
+    def put(self, operation: str, product_id, values: dict) -> None:
+        now = time.time()
+        key = self._key(operation, product_id)
+        with self._entries_lock:
+            entry = self._entries.setdefault(key, {})
+            for name, value in values.items():
+                if name in self.field_ttls:
+                    entry[name] = [value, now]
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+    def invalidate(self, operation: str, product_id) -> None:
+        with self._entries_lock:
+            if self._entries.pop(self._key(operation, product_id), None) is not None:
+                self._dirty = True
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 3),
+        }
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._entries = OrderedDict(json.load(f))
+        except (OSError, ValueError) as e:
+            Constants.LOGGER.warning(f"Response-Cache konnte nicht geladen werden: {self.path} {e}")
+            self._entries = OrderedDict()
+
+    def flush(self) -> None:
+        """Persist the cache if it changed since the last flush."""
+        with self._entries_lock:
+            if not self._dirty:
+                return
+            snapshot = json.dumps(self._entries, ensure_ascii=False)
+            self._dirty = False
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(snapshot)
+            os.replace(tmp_path, self.path)
+            Constants.LOGGER.info(f"Response-Cache gespeichert ({self.stats()})")
+        except OSError as e:
+            Constants.LOGGER.warning(f"Response-Cache konnte nicht gespeichert werden: {e}")
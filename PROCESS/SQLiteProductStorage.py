@@ -0,0 +1,188 @@
+import os
+import sqlite3
+import threading
+from typing import Iterable, Iterator
+
+from CONFIG.Constants import Constants
+from PROCESS.JournaledJsonStorage import JournaledJsonStorage
+from PROCESS.ProductMerge import ProductMerge
+from PROCESS.StorageCodec import StorageCodec
+
+
+class SQLiteProductStorage:
+    """SQLite backend for ProductStorage.
+
+    One row per product: the indexed columns plus the complete product as JSON
+    in ``data``. The serialized rows of the last load/save are kept in memory,
+    so ``save_products`` only writes rows that changed or disappeared.
+
+    Other processes may write to the same database (SQLite locks the file).
+    Writes run in an immediate transaction that first reads the stored rows;
+    rows changed by another process since this one read them are merged
+    field by field (ProductMerge) instead of being overwritten.
+    """
+
+    _instances = {}
+    _lock = threading.Lock()
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS products (
+            product_id INTEGER PRIMARY KEY,
+            category_name TEXT,
+            brand_name TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_products_category ON products(category_name);
+        CREATE INDEX IF NOT EXISTS idx_products_brand ON products(brand_name);
+    """
+
+    def __init__(self, path: str, codec: StorageCodec = None):
+        self.path = path
+        self.codec = codec or StorageCodec.instance()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        is_new = not os.path.exists(path)
+        self._conn = sqlite3.connect(path, timeout=Constants.STORAGE_LOCK_TIMEOUT, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        self._conn_lock = threading.RLock()
+        self._rows: dict[int, str] | None = None
+        if is_new:
+            self.migrate_from_json(Constants.JSON_PATH)
+
+    @classmethod
+    def instance(cls, path: str = None) -> "SQLiteProductStorage":
+        path = path or Constants.SQLITE_PATH
+        with cls._lock:
+            if path not in cls._instances:
+                cls._instances[path] = SQLiteProductStorage(path)
+            return cls._instances[path]
+
+    def _serialize(self, product: dict) -> str:
+        return self.codec.dumps(product)
+
+    @staticmethod
+    def _product_id(product: dict) -> int:
+        return int(product["product_id"])
+
+    def migrate_from_json(self, json_path: str) -> int:
+        """One-shot import of an existing galaxo_data.json into an empty database."""
+        if not os.path.exists(json_path) and not os.path.exists(f"{json_path}.journal"):
+            return 0
+        with self._conn_lock:
+            if self._conn.execute("SELECT 1 FROM products LIMIT 1").fetchone():
+                return 0
+        # erst hier importiert: ProductStorage importiert dieses Modul
+        from PROCESS.ProductStorage import ProductStorage
+        try:
+            # Snapshot samt Journal, damit keine noch nicht kompaktierten Änderungen fehlen;
+            # dieselbe Instanz (Sperre, Exit-Hook) wie das JSON-Backend
+            products = JournaledJsonStorage.instance(json_path).load_products()
+        except (OSError, ValueError) as e:
+            Constants.LOGGER.error(f"Migration von {json_path} fehlgeschlagen: {e}")
+            return 0
+        count = self.upsert_products([ProductStorage._stored_fields(p) for p in products])
+        Constants.LOGGER.info(f"{count} Produkte von {json_path} nach {self.path} migriert")
+        return count
+
+    def load_products(self) -> list[dict]:
+        return list(self.iter_products())
+
+    def iter_products(self) -> Iterator[dict]:
+        with self._conn_lock:
+            rows = self._conn.execute("SELECT product_id, data FROM products ORDER BY rowid").fetchall()
+            self._rows = {product_id: data for product_id, data in rows}
+        Constants.LOGGER.info(f"{len(rows)} Produkte erfolgreich geladen von: {self.path}")
+        for _, data in rows:
+            yield self.codec.loads(data)
+
+    def _known_rows(self) -> dict[int, str]:
+        if self._rows is None:
+            with self._conn_lock:
+                self._rows = dict(self._conn.execute("SELECT product_id, data FROM products").fetchall())
+        return self._rows
+
+    def upsert_products(self, products: Iterable[dict]) -> int:
+        """Insert or update the given products; unchanged rows are skipped."""
+        with self._conn_lock:
+            known = self._known_rows()
+            candidates = {}
+            for product in products:
+                product_id = self._product_id(product)
+                data = self._serialize(product)
+                if known.get(product_id) != data:
+                    candidates[product_id] = (product, data)
+            if not candidates:
+                return 0
+            with self._conn:
+                # Schreibsperre vor dem Lesen, damit kein anderer Prozess dazwischen schreibt
+                self._conn.execute("BEGIN IMMEDIATE")
+                stored = dict(self._conn.execute(
+                    "SELECT product_id, data FROM products WHERE product_id IN (SELECT value FROM json_each(?))",
+                    (self.codec.dumps(list(candidates)),),
+                ).fetchall())
+                changed = {}
+                # neue Basis erst nach erfolgreichem Commit übernehmen
+                bases = {}
+                for product_id, (product, data) in candidates.items():
+                    base, current = known.get(product_id), stored.get(product_id)
+                    bases[product_id] = data
+                    if current != base:
+                        merged = ProductMerge.merge(
+                            self.codec.loads(base) if base else None,
+                            self.codec.loads(current) if current else None,
+                            product,
+                        )
+                        if merged is None:
+                            bases[product_id] = None
+                            continue
+                        if merged is not product:
+                            product, data = merged, self._serialize(merged)
+                    if current != data:
+                        changed[product_id] = (product_id, product.get("category_name"), product.get("brand_name"), data)
+                if changed:
+                    self._conn.executemany(
+                        "INSERT INTO products (product_id, category_name, brand_name, data) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT(product_id) DO UPDATE SET category_name=excluded.category_name, "
+                        "brand_name=excluded.brand_name, data=excluded.data",
+                        changed.values(),
+                    )
+            for product_id, data in bases.items():
+                if data is None:
+                    known.pop(product_id, None)
+                else:
+                    known[product_id] = data
+            return len(changed)
+
+    def delete_products(self, product_ids: Iterable) -> int:
+        product_ids = [(int(product_id),) for product_id in product_ids]
+        if not product_ids:
+            return 0
+        with self._conn_lock:
+            with self._conn:
+                deleted = self._conn.executemany("DELETE FROM products WHERE product_id = ?", product_ids).rowcount
+            known = self._known_rows()
+            for (product_id,) in product_ids:
+                known.pop(product_id, None)
+            return deleted
+
+    def save_products(self, products: list[dict]) -> None:
+        """Store the complete catalog: changed rows are upserted, missing ones deleted.
+        Rows added by another process meanwhile are kept."""
+        with self._conn_lock:
+            removed = set(self._known_rows()) - {self._product_id(product) for product in products}
+            deleted = self.delete_products(removed)
+            written = self.upsert_products(products)
+        Constants.LOGGER.info(
+            f"Produkte gespeichert unter: {self.path} ({written} geschrieben, {deleted} gelöscht)"
+        )
+
+    def snapshot(self) -> bytes:
+        """Current catalog as compact JSON sorted by product_id, e.g. for backups."""
+        with self._conn_lock:
+            rows = self._conn.execute("SELECT data FROM products ORDER BY product_id").fetchall()
+        return ("[" + ",".join(data for (data,) in rows) + "]").encode("utf-8")
+
+    def close(self) -> None:
+        with self._conn_lock:
+            self._conn.close()
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, Iterable
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls with the same key.
+
+    The first caller (leader) runs the call, every caller arriving while it
+    is in flight waits for the same future instead of issuing its own
+    request. Works across threads (``do``) and inside the service loop
+    (``do_async`` / ``do_many_async``) since all callers share
+    ``concurrent.futures.Future`` objects.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.shared = 0
+
+    def _join(self, key) -> tuple[Future, bool]:
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.shared += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            return future, True
+
+    def _forget(self, keys: Iterable) -> None:
+        with self._lock:
+            for key in keys:
+                self._calls.pop(key, None)
+
+    def do(self, key, fn: Callable, *args, **kwargs):
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+        try:
+            result = fn(*args, **kwargs)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._forget([key])
+
+    async def do_async(self, key, coro_fn: Callable, *args, **kwargs):
+        future, leader = self._join(key)
+        if not leader:
+            return await asyncio.wrap_future(future)
+        try:
+            result = await coro_fn(*args, **kwargs)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._forget([key])
+
+    async def do_many_async(self, kind: str, ids: Iterable, coro_fn: Callable, *args, **kwargs) -> dict:
+        """Batched variant: ``coro_fn(ids, ...)`` returns a dict id -> result and is
+        only called for ids that are not already in flight under ``(kind, id, *args)``."""
+        leaders, followers = {}, {}
+        for item_id in ids:
+            future, leader = self._join((kind, item_id, *args))
+            (leaders if leader else followers)[item_id] = future
+
+        results = {}
+        try:
+            if leaders:
+                results = dict(await coro_fn(list(leaders), *args, **kwargs))
+            for item_id, future in leaders.items():
+                future.set_result(results.get(item_id))
+        except BaseException as e:
+            for future in leaders.values():
+                if not future.done():
+                    future.set_exception(e)
+            raise
+        finally:
+            self._forget((kind, item_id, *args) for item_id in leaders)
+
+        for item_id, future in followers.items():
+            try:
+                results[item_id] = await asyncio.wrap_future(future)
+            except Exception:
+                results[item_id] = None
+        return results
@@ -0,0 +1,128 @@
+import gzip
+import io
+import json
+from itertools import islice
+from typing import IO, Iterable, Iterator
+
+from CONFIG.Constants import Constants
+
+
+class StorageCodec:
+    """JSON encoding and file compression used by the product storage.
+
+    ``library`` selects the JSON implementation: "orjson" if installed
+    ("auto") or the stdlib "json". ``compression`` applies to snapshot files
+    ("none", "gzip" or "zstd" via the optional ``zstandard`` package); reading
+    detects the compression from the file header, so changing the setting
+    keeps existing files readable.
+
+    Snapshots are compact JSON arrays with one product per line. They stay
+    valid JSON for any tool, and ``iter_array`` can stream them line by line
+    without parsing the whole file first.
+    """
+
+    _instance = None
+
+    # Zeilen pro Parser-Aufruf beim Streamen: ein Aufruf pro Zeile ist mit json deutlich langsamer
+    STREAM_BATCH = 1000
+    GZIP_MAGIC = b"\x1f\x8b"
+    ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+    def __init__(self, library: str = Constants.STORAGE_JSON_LIBRARY,
+                 compression: str = Constants.STORAGE_COMPRESSION):
+        self._orjson = None
+        if library in ("auto", "orjson"):
+            try:
+                import orjson
+                self._orjson = orjson
+            except ImportError:
+                if library == "orjson":
+                    Constants.LOGGER.warning("orjson ist nicht installiert, verwende json")
+        self.library = "orjson" if self._orjson is not None else "json"
+        if compression == "zstd" and not self._zstd_available():
+            Constants.LOGGER.warning("zstandard ist nicht installiert, verwende gzip")
+            compression = "gzip"
+        self.compression = compression
+
+    @classmethod
+    def instance(cls) -> "StorageCodec":
+        if cls._instance is None:
+            cls._instance = StorageCodec()
+        return cls._instance
+
+    @staticmethod
+    def _zstd_available() -> bool:
+        try:
+            import zstandard  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def dumps(self, obj) -> str:
+        if self._orjson is not None:
+            return self._orjson.dumps(obj).decode("utf-8")
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+    def loads(self, data):
+        if self._orjson is not None:
+            return self._orjson.loads(data)
+        return json.loads(data)
+
+    def open_read(self, path: str) -> IO[str]:
+        with open(path, "rb") as f:
+            magic = f.read(4)
+        if magic.startswith(self.GZIP_MAGIC):
+            return gzip.open(path, "rt", encoding="utf-8")
+        if magic == self.ZSTD_MAGIC:
+            import zstandard
+            return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True),
+                                    encoding="utf-8")
+        return open(path, "r", encoding="utf-8")
+
+    def open_write(self, path: str) -> IO[str]:
+        if self.compression == "gzip":
+            # niedrige Stufe: kaum größer, aber ein Vielfaches schneller als die Voreinstellung 9
+            return gzip.open(path, "wt", encoding="utf-8", compresslevel=3)
+        if self.compression == "zstd":
+            import zstandard
+            return io.TextIOWrapper(zstandard.ZstdCompressor(level=3).stream_writer(open(path, "wb"), closefd=True),
+                                    encoding="utf-8")
+        return open(path, "w", encoding="utf-8")
+
+    @staticmethod
+    def write_array(f: IO[str], rows: Iterable[str]) -> None:
+        """Write already encoded objects as a JSON array, one per line."""
+        f.write("[\n")
+        f.write(",\n".join(rows))
+        f.write("\n]\n")
+
+    def iter_array(self, path: str) -> Iterator[tuple[dict, str]]:
+        """Yield (object, encoded line) for every element of a snapshot written by write_array.
+        Other layouts (e.g. the former indent=2 files) are parsed as a whole."""
+        yielded = 0
+        with self.open_read(path) as f:
+            if f.readline().strip() == "[":
+                batch = []
+                for line in f:
+                    line = line.rstrip()
+                    if line.endswith(","):
+                        line = line[:-1]
+                    if not line or line == "]":
+                        continue
+                    if not line.startswith("{") or not line.endswith("}"):
+                        break
+                    batch.append(line)
+                    if len(batch) >= self.STREAM_BATCH:
+                        yield from zip(self._loads_lines(batch), batch)
+                        yielded += len(batch)
+                        batch = []
+                else:
+                    yield from zip(self._loads_lines(batch), batch)
+                    return
+        # kein Objekt pro Zeile: ganze Datei parsen, bereits gelieferte Objekte überspringen
+        with self.open_read(path) as f:
+            for obj in islice(self.loads(f.read()), yielded, None):
+                yield obj, self.dumps(obj)
+
+    def _loads_lines(self, lines: list[str]) -> list:
+        return self.loads("[" + ",".join(lines) + "]") if lines else []
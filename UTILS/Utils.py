@@ -1,8 +1,6 @@
 import hashlib
 import os
 from functools import lru_cache
-from tkinter import font as tkfont
-import tkinter as tk
 from CONFIG.Constants import Constants
 from datetime import datetime
 import re
@@ -27,6 +25,8 @@ class Utils:
     @staticmethod
     @lru_cache(maxsize=None)
     def create_font(size, weight="normal", family="Arial"):
+        # Tk nur für die GUI importieren, der headless Betrieb braucht kein Tk
+        from tkinter import font as tkfont
         return tkfont.Font(family=family, size=size, weight=weight or "normal")
 
     @staticmethod
@@ -95,18 +95,29 @@ class Utils:
         return os.path.join(Constants.CACHE_DIR_IMAGES, filename)
 
     @staticmethod
-    def delete_image(image_url):
+    def delete_image(image_url, log: bool = True) -> bool:
         try:
             cache_path = Utils.get_file_hash_path(image_url)
             if os.path.exists(cache_path):
                 os.remove(cache_path)
-                Constants.LOGGER.info(f"Bild gelöscht: {cache_path}")
-            else:
+                if log:
+                    Constants.LOGGER.info(f"Bild gelöscht: {cache_path}")
+                return True
+            if log:
                 Constants.LOGGER.warning(f"Bild existiert nicht oder konnte nicht geladen werden: {image_url}")
         except Exception as e:
             Constants.LOGGER.error(f"Fehler beim Löschen des Bildes: {e}")
+        return False
 
 
+    @staticmethod
+    def delete_images(image_urls) -> int:
+        """Delete the cached images of several products; one log line for the whole batch."""
+        image_urls = set(image_urls)
+        deleted = sum(Utils.delete_image(image_url, log=False) for image_url in image_urls)
+        Constants.LOGGER.info(f"{deleted} Bilder gelöscht, {len(image_urls) - deleted} nicht im Cache")
+        return deleted
+
     @staticmethod
     def contains_error():
         log_file_path = os.path.join(Constants.LOG_PATH, Constants.LOG_FILE_NAME)
@@ -123,6 +134,7 @@ class Utils:
     
     @staticmethod
     def bind_widget_events(widget, on_click, on_double_click):
+        import tkinter as tk
         for child in widget.winfo_children():
             if isinstance(child, tk.Label):
                 child.bind("<Button-1>", on_click)
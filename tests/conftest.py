@@ -0,0 +1,130 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Module werden wie in den Skripten über das Projektverzeichnis importiert (CONFIG.Constants, ...)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from CONFIG.Constants import Constants  # noqa: E402
+
+
+@pytest.fixture
+def storage_dir(tmp_path, monkeypatch):
+    """Point product storage, backups and observations at a temp directory."""
+    from PROCESS.BackupManager import BackupManager
+    from PROCESS.JournaledJsonStorage import JournaledJsonStorage
+    from PROCESS.SQLiteProductStorage import SQLiteProductStorage
+
+    monkeypatch.setattr(Constants, "JSON_PATH", str(tmp_path / "galaxo_data.json"))
+    monkeypatch.setattr(Constants, "SQLITE_PATH", str(tmp_path / "galaxo_data.sqlite"))
+    monkeypatch.setattr(Constants, "JSON_BACKUP_PATH", str(tmp_path / "Backup"))
+    monkeypatch.setattr(Constants, "OBSERVATION_DIR", str(tmp_path / "Observations"))
+    monkeypatch.setattr(JournaledJsonStorage, "_instances", {})
+    monkeypatch.setattr(SQLiteProductStorage, "_instances", {})
+    monkeypatch.setattr(BackupManager, "_instance", BackupManager(str(tmp_path / "Backup")))
+    return tmp_path
+
+
+@pytest.fixture
+def make_product():
+    """Build a ProductData with neutral defaults; keyword arguments override fields."""
+    from PROCESS.ProductData import ProductData
+
+    def _make(product_id: int = 1, **fields):
+        values = dict(product_name=f"Produkt {product_id}", brand_name="Marke", category_name="Kategorie",
+                      current_price=100.0, old_price=100.0, stock_count=1, old_stock=1, min_price=100.0,
+                      max_price=100.0, min_price_erreicht=1, max_price_erreicht=1, preisverlust_percentage=0,
+                      url="", image_url="", insert_date=0)
+        values.update(fields)
+        return ProductData(product_id=product_id, **values)
+
+    return _make
+
+
+@pytest.fixture
+def endpoint_guards(monkeypatch):
+    """Empty rate limiter and circuit breaker registries for every test."""
+    from API.CircuitBreaker import CircuitBreaker
+    from API.RateLimiter import RateLimiter
+
+    monkeypatch.setattr(CircuitBreaker, "_breakers", {})
+    monkeypatch.setattr(RateLimiter, "_limiters", {})
+
+
+@pytest.fixture
+def make_client(endpoint_guards):
+    """RequestGraphQLClient (or subclass) without __init__: the shared service loop
+    runs the requests, the transport is set directly instead of GraphQLTransport."""
+    from API.RequestGraphQLClient import PlaywrightService, RequestGraphQLClient
+
+    def _make(transport, endpoint: str, cls=RequestGraphQLClient, max_retries: int = 1):
+        client = cls.__new__(cls)
+        client.BASE_URL = endpoint
+        client.max_retries = max_retries
+        client.backoff_factor = 0
+        client.timeout_ms = 1000
+        client._service = PlaywrightService.instance()
+        client._transport = transport
+        return client
+
+    return _make
+
+
+@pytest.fixture
+def http_transport():
+    from API.GraphQLTransport import HttpTransport
+    transport = HttpTransport(pool_size=4)
+    yield transport
+    asyncio.run(transport.close())
+
+
+@pytest.fixture
+def fake_server(endpoint_guards):
+    """Local FakeGraphQLServer without latency; its endpoints are not rate limited."""
+    from API.RateLimiter import RateLimiter
+    from BENCHMARK.FakeGraphQLServer import FakeGraphQLServer, LatencyModel
+
+    server = FakeGraphQLServer(catalog_size=100, latency=LatencyModel("constant", 0)).start()
+    for url in (server.base_url, server.history_url):
+        RateLimiter._limiters[url] = RateLimiter(url, rate=1000, max_rate=1000, burst=1000)
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def product_client(fake_server, http_transport, make_client, tmp_path):
+    """ProductClient against the fake server over HTTP, with its own response cache."""
+    from API.OfferAvailabilityClient import OfferAvailabilityClient
+    from API.ProductDetailsClient_PDP import ProductDetailsClient_PDP
+    from PROCESS.ProductClient import ProductClient
+    from PROCESS.ResponseCache import ResponseCache
+
+    return ProductClient(
+        details_client=make_client(http_transport, fake_server.base_url, cls=ProductDetailsClient_PDP),
+        availability_client=make_client(http_transport, fake_server.base_url, cls=OfferAvailabilityClient),
+        response_cache=ResponseCache(path=str(tmp_path / "Cache" / "response_cache.json")),
+    )
+
+
+@pytest.fixture
+def repository(storage_dir):
+    """ProductRepository on the temp storage; write products with ProductStorage before reload()."""
+    from PROCESS.ProductRepository import ProductRepository
+    repository = ProductRepository(autoload=False)
+    yield repository
+    repository.close()
+
+
+@pytest.fixture
+def galaxo_process(repository, storage_dir):
+    """GalaxoProcess on the temp repository; tests set ``product_client`` to a fake as needed."""
+    from PROCESS.GalaxoProcess import GalaxoProcess
+    from PROCESS.ObservationStore import ObservationStore
+    process = GalaxoProcess.__new__(GalaxoProcess)
+    process.product_client = None
+    process.observations = ObservationStore(str(storage_dir / "Observations"))
+    process._owns_repository = False
+    process.repository = repository
+    return process
@@ -0,0 +1,97 @@
+import gzip
+import hashlib
+import os
+import re
+import threading
+import time
+
+from CONFIG.Constants import Constants
+from PROCESS.BackupManager import BackupManager
+from PROCESS.ProductStorage import ProductStorage
+
+
+def _backup(manager: BackupManager, data: bytes) -> None:
+    manager.schedule(lambda: data)
+    assert manager.wait(5)
+
+
+def _old_backup(directory, name: str, age_days: float) -> str:
+    path = os.path.join(directory, f"{Constants.JSON_BACKUP_FILE_NAMES}{name}.json.gz")
+    with gzip.open(path, "wb") as f:
+        f.write(name.encode())
+    mtime = time.time() - age_days * 86400
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_backup_is_named_after_its_content(tmp_path):
+    manager = BackupManager(str(tmp_path))
+    _backup(manager, b"[1]")
+
+    path, = tmp_path.iterdir()
+    digest = hashlib.sha256(b"[1]").hexdigest()[:16]
+    assert re.fullmatch(rf"{Constants.JSON_BACKUP_FILE_NAMES}\d{{8}}_\d{{6}}_{digest}\.json\.gz", path.name)
+    with gzip.open(path, "rb") as f:
+        assert f.read() == b"[1]"
+
+
+def test_unchanged_content_is_not_backed_up_again(tmp_path):
+    manager = BackupManager(str(tmp_path))
+    _backup(manager, b"[1]")
+    _backup(manager, b"[1]")
+    # neuer Prozess: erkennt das neueste Backup am Hash im Dateinamen
+    restarted = BackupManager(str(tmp_path))
+    _backup(restarted, b"[1]")
+
+    assert len(list(tmp_path.iterdir())) == 1
+    assert (manager.stats()["skipped"], restarted.stats()["skipped"]) == (1, 1)
+
+
+def test_requests_during_a_running_backup_are_coalesced(tmp_path):
+    manager = BackupManager(str(tmp_path))
+    release = threading.Event()
+    snapshots = []
+
+    def _slow():
+        release.wait(5)
+        snapshots.append("slow")
+        return b"[0]"
+
+    manager.schedule(_slow)
+    while not manager._busy:
+        time.sleep(0.01)
+    for index in range(1, 4):
+        manager.schedule(lambda index=index: snapshots.append(index) or f"[{index}]".encode())
+    release.set()
+    assert manager.wait(5)
+
+    assert snapshots == ["slow", 3]
+    assert manager.stats()["written"] == 2
+
+
+def test_retention_keeps_count_and_drops_old_backups(tmp_path):
+    oldest = _old_backup(tmp_path, "20200101_000000_a", 400)
+    kept = [_old_backup(tmp_path, f"2025010{day}_000000_b", day) for day in (1, 2)]
+    dropped = _old_backup(tmp_path, "20250103_000000_c", 3)
+
+    _backup(BackupManager(str(tmp_path), keep_count=3, max_age_days=90), b"[1]")
+
+    remaining = set(map(str, tmp_path.iterdir()))
+    assert set(kept) < remaining and len(remaining) == 3
+    assert oldest not in remaining and dropped not in remaining
+
+
+def test_newest_backup_survives_age_limit(tmp_path):
+    newest = _old_backup(tmp_path, "20200101_000000_a", 400)
+    BackupManager(str(tmp_path), keep_count=1, max_age_days=1)._apply_retention()
+    assert list(map(str, tmp_path.iterdir())) == [newest]
+
+
+def test_loading_products_schedules_a_backup(storage_dir):
+    ProductStorage.save_products([{"product_id": 1, "product_name": "Eins"}])
+    ProductStorage.load_products()
+    assert BackupManager.instance().wait(5)
+
+    backup, = (storage_dir / "Backup").iterdir()
+    with gzip.open(backup, "rb") as f:
+        assert b'"product_name":"Eins"' in f.read().replace(b" ", b"")
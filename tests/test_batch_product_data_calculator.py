@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+import PROCESS.BatchProductDataCalculator as batch_module
+from PROCESS.BatchProductDataCalculator import BatchProductDataCalculator
+from PROCESS.ProductFactory import ProductFactory
+
+np = pytest.importorskip("numpy")
+
+
+def _sources(count: int, seed: int = 5) -> list:
+    rng = random.Random(seed)
+
+    def price(*extra):
+        # Randfälle: 0 als int und float, gleiche Preise, Werte mit .5 zum Runden
+        return rng.choice((0, 0.0, 10.0, 12.5, 97.5, 100.0, round(rng.uniform(1, 3000), 2)) + extra)
+
+    sources = []
+    for product_id in range(1, count + 1):
+        current = price()
+        sources.append({
+            "product_id": product_id, "product_name": f"Produkt {product_id}", "brand_name": f"Marke {product_id % 7}",
+            "category_name": f"Kategorie {product_id % 5}", "current_price": current,
+            "old_price": price(current, 102.5), "min_price": price(current, 5.0), "max_price": price(current, 200.0),
+            "stock_count": rng.randrange(0, 20), "old_stock": rng.randrange(0, 20), "url": "", "image_url": "",
+            "insert_date": 1,
+        })
+    return sources
+
+
+def _typed(pd) -> list:
+    return [(name, value, type(value)) for name, value in pd.to_dict().items() if name != "last_refresh"]
+
+
+def _load_and_update(sources: list, updates: list) -> tuple:
+    loaded = ProductFactory.from_sources(sources)
+    loaded_fields = [_typed(pd) for pd in loaded]
+    updated = ProductFactory.update_existing_many(list(zip(loaded, updates)))
+    return loaded_fields, [_typed(pd) for pd in updated]
+
+
+def test_vectorized_matches_scalar(monkeypatch):
+    sources = _sources(20000)
+    rng = random.Random(7)
+    updates = [{"current_price": rng.choice((0, 0.0, 10.0, 97.5, round(rng.uniform(1, 3000), 2))),
+                "stock_count": rng.randrange(0, 20)} for _ in sources]
+    assert len(sources) >= BatchProductDataCalculator.MIN_VECTOR_SIZE
+
+    vectorized = _load_and_update(sources, updates)
+    monkeypatch.setattr(batch_module, "np", None)
+    scalar = _load_and_update(sources, updates)
+
+    assert vectorized[0] == scalar[0]
+    assert vectorized[1] == scalar[1]
+
+
+def test_small_batches_use_the_scalar_calculator(monkeypatch):
+    sources = _sources(BatchProductDataCalculator.MIN_VECTOR_SIZE - 1)
+    assert not BatchProductDataCalculator._vectorized(sources)
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("kleine Batches dürfen NumPy nicht verwenden")
+
+    monkeypatch.setattr(np, "fromiter", _fail)
+    products = ProductFactory.from_sources(sources)
+    assert [pd.product_id for pd in products] == list(range(1, len(sources) + 1))
@@ -0,0 +1,24 @@
+from PROCESS.ProductStorage import ProductStorage
+from UTILS.Utils import Utils
+
+
+def test_update_products_skips_products_without_known_field(galaxo_process, make_product):
+    ProductStorage.save_products([make_product(1).to_dict(), make_product(2).to_dict()])
+    galaxo_process.reload_products()
+    updated = galaxo_process.update_products(
+        {1: {"current_price": 80.0}, 2: {"no_such_field": 1}, 3: {"current_price": 1.0}}
+    )
+
+    assert [pd.product_id for pd in updated] == [1]
+    assert updated[0].price_change == -20.0
+    assert galaxo_process.get_product(1) is updated[0]
+    assert galaxo_process.get_product(2).current_price == 100.0
+
+
+def test_delete_images_counts_deleted_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(Utils, "get_file_hash_path", staticmethod(lambda url: str(tmp_path / url)))
+    (tmp_path / "a.jpg").write_bytes(b"a")
+    (tmp_path / "b.jpg").write_bytes(b"b")
+
+    assert Utils.delete_images(["a.jpg", "b.jpg", "a.jpg", "missing.jpg"]) == 2
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,49 @@
+import asyncio
+import gzip
+import json
+
+import pytest
+
+from API.CassetteTransport import CassetteMiss, CassetteTransport
+from API.CircuitBreaker import CircuitBreaker
+from API.RateLimiter import RateLimiter
+
+OPERATION = {"operationName": "PDP_GET_PRODUCT_DETAILS", "variables": {"productId": 1}}
+ANSWER = {"data": {"productDetails": {"product": {"productId": 1}}}}
+
+
+@pytest.fixture
+def replay_client(tmp_path, make_client):
+    path = tmp_path / "replay.cassette.json.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump({CassetteTransport._key(OPERATION): [0.5, ANSWER]}, f)
+    transport = CassetteTransport(None, "replay", path=str(path), latency="zero")
+    return lambda endpoint: make_client(transport, endpoint, max_retries=3)
+
+
+def test_replay_bypasses_rate_limiter_and_open_breaker(replay_client):
+    endpoint = "https://replay.test/bypass"
+    breaker = CircuitBreaker(endpoint, failure_threshold=1, reset_timeout=3600)
+    breaker.record_failure()
+    CircuitBreaker._breakers[endpoint] = breaker
+    # leerer Bucket ohne Nachschub: jeder acquire() würde hängen bleiben
+    RateLimiter._limiters[endpoint] = RateLimiter(endpoint, rate=0.001, max_rate=0.001, burst=1)
+    RateLimiter._limiters[endpoint]._tokens = 0
+    client = replay_client(endpoint)
+
+    async def _run():
+        return await asyncio.wait_for(
+            asyncio.gather(*(client._request_coro(OPERATION) for _ in range(50))), timeout=5
+        )
+
+    assert asyncio.run(_run()) == [ANSWER] * 50
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.rejected == 0
+
+
+def test_replay_miss_is_not_retried(replay_client):
+    client = replay_client("https://replay.test/miss")
+    missing = {"operationName": "PDP_GET_PRODUCT_DETAILS", "variables": {"productId": 2}}
+    with pytest.raises(CassetteMiss):
+        asyncio.run(client._request_coro(missing))
+    assert client._transport.misses == 1
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from API.CircuitBreaker import CircuitBreaker
+from API.GraphQLTransport import TransportResponse
+from API.RequestGraphQLClient import HTTPStatusError
+
+
+class _HangingTransport:
+    """Transport whose request never completes, like a PDP fetch that is cancelled."""
+
+    async def post(self, url, payload, timeout_ms):
+        await asyncio.sleep(3600)
+
+
+def _half_open(endpoint: str) -> CircuitBreaker:
+    breaker = CircuitBreaker(endpoint, failure_threshold=1, reset_timeout=0, half_open_probes=1)
+    CircuitBreaker._breakers[endpoint] = breaker
+    breaker.record_failure()
+    return breaker
+
+
+def test_cancelled_probe_is_released(make_client):
+    endpoint = "https://breaker.test/cancelled-probe"
+    breaker = _half_open(endpoint)
+    client = make_client(_HangingTransport(), endpoint)
+
+    async def _run():
+        task = asyncio.ensure_future(client._request_coro({"query": "x"}))
+        await asyncio.sleep(0.05)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(_run())
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+
+
+def test_release_probe_only_frees_taken_probes():
+    breaker = CircuitBreaker("https://breaker.test/release", failure_threshold=1, reset_timeout=0,
+                             half_open_probes=1)
+    breaker.record_failure()
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.release_probe()
+    breaker.release_probe()
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+
+class _ThrottlingTransport:
+    async def post(self, url, payload, timeout_ms):
+        return TransportResponse(429, "{}", {"Retry-After": "0"})
+
+
+def test_throttled_probe_does_not_close_the_breaker(make_client):
+    endpoint = "https://breaker.test/throttled-probe"
+    breaker = _half_open(endpoint)
+    client = make_client(_ThrottlingTransport(), endpoint)
+
+    with pytest.raises(HTTPStatusError):
+        asyncio.run(client._request_coro({"query": "x"}))
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # die Probe ist wieder frei
+    assert breaker.allow_request()
@@ -0,0 +1,26 @@
+import Galaxo_CLI
+from PROCESS.RefreshStats import RefreshStats
+
+
+class _Process:
+    def __init__(self):
+        self.reloads = 0
+
+    def reload_products(self):
+        self.reloads += 1
+
+    def process_update_prices(self, **kwargs):
+        return RefreshStats(total=1, succeeded=1).finish()
+
+
+def test_catalog_is_reloaded_only_from_the_second_cycle(capsys):
+    process = _Process()
+    args = Galaxo_CLI._parse_args(["--once"])
+
+    summary = Galaxo_CLI.run_cycle(process, args, 1)
+    assert process.reloads == 0
+    assert summary["cycle"] == 1 and summary["succeeded"] == 1
+
+    Galaxo_CLI.run_cycle(process, args, 2)
+    assert process.reloads == 1
+    assert len(capsys.readouterr().out.splitlines()) == 2
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from API.PriceHistoryClient import PriceHistoryClient
+from BENCHMARK.FakeGraphQLServer import FakeGraphQLServer, LatencyModel
+
+
+def _post(transport, url, payload):
+    return asyncio.run(transport.post(url, payload, 1000))
+
+
+def _pdp(product_id: int, operation: str = "PDP_GET_PRODUCT_DETAILS") -> dict:
+    return {"operationName": operation, "variables": {"productId": product_id}}
+
+
+@pytest.fixture
+def failing_server(request):
+    """Server with the rates given by the test's parametrization, e.g. every request throttled."""
+    server = FakeGraphQLServer(catalog_size=10, latency=LatencyModel("constant", 0), retry_after=7,
+                               **request.param).start()
+    yield server
+    server.stop()
+
+
+def test_batch_is_answered_in_order(fake_server, http_transport):
+    answer = _post(http_transport, fake_server.base_url, [
+        _pdp(2), _pdp(101), _pdp(2, "PDP_GET_PRODUCT_OFFERS"), {"operationName": "UNKNOWN"},
+    ]).json()
+
+    assert answer[0]["data"]["productDetails"]["product"]["productId"] == 2
+    assert answer[1] == {"data": {"productDetails": None}}
+    assert answer[2]["data"]["productDetails"] == {"offers": answer[0]["data"]["productDetails"]["offers"]}
+    assert "errors" in answer[3]
+    assert fake_server.stats() == {"requests": 1, "operations": 4, "errors": 0, "throttled": 0}
+
+
+def test_catalog_depends_only_on_the_seed():
+    servers = [FakeGraphQLServer(seed=seed).start() for seed in (1, 1, 2)]
+    try:
+        products = [server._product(5) for server in servers]
+        assert products[0] == products[1] != products[2]
+    finally:
+        for server in servers:
+            server.stop()
+
+
+@pytest.mark.parametrize("failing_server, status", [
+    ({"throttle_rate": 1.0}, 429), ({"error_rate": 1.0}, 500),
+], indirect=["failing_server"])
+def test_injected_failures(failing_server, http_transport, status):
+    response = _post(http_transport, failing_server.base_url, [_pdp(1)])
+
+    assert response.status == status
+    if status == 429:
+        assert response.headers["Retry-After"] == "7"
+    assert failing_server.stats()["operations"] == 0
+
+
+def test_price_history_only_returns_points_after_history_from(fake_server, http_transport, make_client):
+    client = make_client(http_transport, fake_server.history_url, cls=PriceHistoryClient)
+
+    full = client.fetch_price_chart(3)["data"]["productById"]["priceHistory"]["points"]
+    newer = client.fetch_price_chart(3, history_from="2025-10-01T00:00:00Z")["data"]["productById"]["priceHistory"]["points"]
+
+    assert len(full) == 12
+    assert newer == full[-2:]
+    assert client.fetch_price_chart(404)["data"]["productById"] is None
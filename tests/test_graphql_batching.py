@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from API.GraphQLTransport import TransportResponse
+from API.OfferAvailabilityClient import OfferAvailabilityClient
+from API.ProductDetailsClient_PDP import ProductDetailsClient_PDP
+
+
+@pytest.fixture
+def pdp(fake_server, http_transport, make_client):
+    return make_client(http_transport, fake_server.base_url, cls=ProductDetailsClient_PDP)
+
+
+@pytest.fixture
+def availability(fake_server, http_transport, make_client):
+    return make_client(http_transport, fake_server.base_url, cls=OfferAvailabilityClient)
+
+
+def test_pdp_batch_is_one_post_and_matches_single_queries(pdp, fake_server):
+    batch = pdp.get_product_details_pdp_batch([3, 999, 1])
+
+    assert fake_server.stats()["requests"] == 1 and fake_server.stats()["operations"] == 3
+    assert list(batch) == [3, 999, 1]
+    assert batch[999] is None
+    for product_id in (1, 3):
+        single = pdp.get_product_details_pdp(product_id)
+        assert vars(batch[product_id]) == vars(single)
+
+
+def test_pdp_batch_with_short_answer_leaves_missing_products_empty(make_client, fake_server):
+    class _ShortTransport:
+        name = "http"
+
+        async def post(self, url, payload, timeout_ms):
+            # nur die erste Operation wird beantwortet
+            product_id = payload[0]["variables"]["productId"]
+            return TransportResponse(200, json.dumps([{"data": {"productDetails": {"product": {"name": f"P{product_id}"}}}}]))
+
+    pdp = make_client(_ShortTransport(), "https://batch.test/short", cls=ProductDetailsClient_PDP)
+    batch = pdp.get_product_details_pdp_batch([1, 2])
+
+    assert batch[1].name == "P1"
+    assert batch[2] is None
+
+
+def test_availability_batch_skips_offers_without_id(availability, pdp, fake_server):
+    details = pdp.get_product_details_pdp_batch([1, 2])
+    requests = fake_server.stats()["requests"]
+
+    stock = availability.get_offer_availability_batch(
+        [(pid, d.offer_id, d.offer_type) for pid, d in details.items()] + [(5, None, "")]
+    )
+
+    assert fake_server.stats()["requests"] - requests == 1
+    assert stock[5] == 0
+    for pid, d in details.items():
+        assert stock[pid] == availability.get_offer_availability(pid, d.offer_id, d.offer_type)
+        assert stock[pid] == (d.offer_id * 7) % 50
+
+
+def test_availability_batch_failure_counts_as_no_stock(make_client):
+    class _FailingTransport:
+        name = "http"
+
+        async def post(self, url, payload, timeout_ms):
+            return TransportResponse(500, "{}")
+
+    availability = make_client(_FailingTransport(), "https://batch.test/failing", cls=OfferAvailabilityClient)
+    assert availability.get_offer_availability_batch([(1, 10, "RETAIL"), (2, 20, "RETAIL")]) == {1: 0, 2: 0}
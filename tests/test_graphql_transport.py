@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from API.GraphQLTransport import (FallbackTransport, GraphQLTransport, HttpTransport, PlaywrightTransport,
+                                  TransportRejected, TransportResponse)
+
+
+class _Transport:
+    """Answers with fixed responses; an HTTP-like transport rejects them like HttpTransport."""
+
+    def __init__(self, name: str, status: int = 200, headers: dict = None):
+        self.name = name
+        self.response = TransportResponse(status, "[]", headers or {"Content-Type": "application/json"})
+        self.posts = 0
+
+    async def post(self, url, payload, timeout_ms):
+        self.posts += 1
+        if self.name == "http" and HttpTransport.is_rejected(self.response):
+            raise TransportRejected(self.response)
+        return self.response
+
+
+def _post(transport, times: int = 1, url: str = "https://transport.test", payload=()):
+    async def _run():
+        return [await transport.post(url, list(payload), 1000) for _ in range(times)]
+    return asyncio.run(_run())
+
+
+@pytest.mark.parametrize("status, content_type, rejected", [
+    (200, "application/json", False),
+    (429, "application/json", False),
+    (500, "application/json", False),
+    (403, "application/json", True),
+    (401, "", True),
+    (200, "text/html; charset=utf-8", True),
+])
+def test_http_rejection(status, content_type, rejected):
+    assert HttpTransport.is_rejected(TransportResponse(status, "", {"content-type": content_type})) is rejected
+
+
+def test_http_transport_posts_to_server(fake_server, http_transport):
+    payload = [{"operationName": "PDP_GET_PRODUCT_DETAILS", "variables": {"productId": 1}}]
+    response, = _post(http_transport, url=fake_server.base_url, payload=payload)
+    assert response.ok
+    assert response.json()[0]["data"]["productDetails"]["product"]["productId"] == 1
+
+
+def test_fallback_switches_to_browser_once_http_is_rejected():
+    http, browser = _Transport("http", 403), _Transport("browser")
+    transport = FallbackTransport(http, browser, retry_http_after=3600)
+
+    assert [r.status for r in _post(transport, 3)] == [200, 200, 200]
+    # nur die erste Anfrage versucht HTTP, danach bleibt der Browser aktiv
+    assert (http.posts, browser.posts) == (1, 3)
+    assert transport.stats() == {"active": "browser", "fallback_count": 1, "requests": {"http": 1, "browser": 3}}
+
+
+def test_fallback_retries_http_after_timeout():
+    http, browser = _Transport("http", 403), _Transport("browser")
+    transport = FallbackTransport(http, browser, retry_http_after=0)
+    _post(transport)
+    http.response = TransportResponse(200, "[]", {"Content-Type": "application/json"})
+
+    _post(transport, 2)
+
+    assert transport.active is http
+    assert (http.posts, browser.posts, transport.fallback_count) == (3, 1, 1)
+
+
+def test_http_errors_are_not_a_reason_to_fall_back():
+    http, browser = _Transport("http", 500), _Transport("browser")
+    transport = FallbackTransport(http, browser)
+    assert _post(transport)[0].status == 500
+    assert browser.posts == 0 and transport.stats()["active"] == "http"
+
+
+def test_transport_modes_do_not_start_the_browser():
+    class _Service:
+        started = False
+
+        async def ensure_started(self):
+            self.started = True
+
+    service = _Service()
+    http = GraphQLTransport.create("http", service)
+    auto = GraphQLTransport.create("auto", service)
+    try:
+        assert isinstance(http, HttpTransport)
+        assert isinstance(GraphQLTransport.create("browser", service), PlaywrightTransport)
+        assert isinstance(auto.primary, HttpTransport) and isinstance(auto.fallback, PlaywrightTransport)
+        assert GraphQLTransport.stats(auto)["active"] == "http"
+        assert not service.started
+    finally:
+        asyncio.run(http.close())
+        asyncio.run(auto.close())
@@ -0,0 +1,50 @@
+import os
+import time
+from array import array
+
+from PROCESS.ObservationStore import ObservationStore
+
+
+def _store(directory, **kwargs) -> ObservationStore:
+    return ObservationStore(str(directory), retention_days=0, **kwargs)
+
+
+def test_torn_append_does_not_misalign_later_rows(tmp_path):
+    store = _store(tmp_path)
+    store.append([(100, 1, 10.0, 5), (101, 2, 20.0, 6)])
+    # abgebrochener Append: nur die ersten beiden Spalten geschrieben
+    for name, typecode in ObservationStore.COLUMNS[:2]:
+        with open(os.path.join(tmp_path, "log", f"{name}.bin"), "ab") as f:
+            array(typecode, [102]).tofile(f)
+
+    restarted = _store(tmp_path)
+    restarted.append([(200, 3, 30.0, 7)])
+
+    assert _store(tmp_path).range(3) == [(200, 30.0, 7)]
+    assert sorted(_store(tmp_path).scan()) == [(100, 1, 10.0, 5), (101, 2, 20.0, 6), (200, 3, 30.0, 7)]
+    sizes = {os.path.getsize(os.path.join(tmp_path, "log", f"{name}.bin")) for name, _ in ObservationStore.COLUMNS}
+    assert sizes == {3 * 8}
+
+
+def test_compaction_keeps_rows_of_other_writers(tmp_path):
+    # zwei Instanzen auf demselben Verzeichnis verhalten sich wie GUI und Cron
+    gui, cron = _store(tmp_path), _store(tmp_path)
+    gui.append([(100, 1, 10.0, 5)])
+    cron.append([(110, 2, 20.0, 6)])
+    gui.compact()
+    cron.append([(120, 3, 30.0, 7)])
+    cron.compact()
+
+    expected = [(100, 1, 10.0, 5), (110, 2, 20.0, 6), (120, 3, 30.0, 7)]
+    assert sorted(gui.scan()) == expected
+    assert sorted(cron.scan()) == expected
+    assert gui.stats()["log_rows"] == 0
+
+
+def test_compaction_collapses_unchanged_runs(tmp_path):
+    now = int(time.time())
+    store = _store(tmp_path)
+    store.append([(now + i, 1, 10.0, 5) for i in range(5)] + [(now + 5, 1, 12.0, 5)])
+    result = store.compact()
+    assert result["rows_after"] == 3
+    assert store.range(1) == [(now, 10.0, 5), (now + 4, 10.0, 5), (now + 5, 12.0, 5)]
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from API.PlaywrightPagePool import PlaywrightPagePool
+
+
+class _Page:
+    def __init__(self):
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+class _Context:
+    def __init__(self):
+        self.fail_next = 0
+        self.created = 0
+
+    async def new_page(self):
+        if self.fail_next:
+            self.fail_next -= 1
+            raise RuntimeError("Browser nicht erreichbar")
+        self.created += 1
+        return _Page()
+
+
+async def _checkout(pool):
+    async with pool.page() as page:
+        return page
+
+
+def test_failed_replacement_keeps_the_slot():
+    async def _run():
+        context = _Context()
+        pool = PlaywrightPagePool(context, size=1, max_failures=1)
+        await pool.start()
+
+        with pytest.raises(ValueError):
+            async with pool.page():
+                raise ValueError("Anfrage fehlgeschlagen")
+        assert pool.recycled == 1
+
+        # Ersatz scheitert beim Auschecken, der Platz bleibt trotzdem erhalten
+        context.fail_next = 1
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(_checkout(pool), timeout=1)
+        page = await asyncio.wait_for(_checkout(pool), timeout=1)
+        assert not page.is_closed()
+        assert context.created == 2
+        assert pool.stats()["available"] == 1
+
+    asyncio.run(_run())
+
+
+def test_closed_page_is_replaced_on_checkout():
+    async def _run():
+        pool = PlaywrightPagePool(_Context(), size=1)
+        await pool.start()
+        first = await _checkout(pool)
+        first.closed = True
+        second = await _checkout(pool)
+        assert second is not first and not second.is_closed()
+        assert pool.stats()["in_use"] == 0
+
+    asyncio.run(_run())
@@ -0,0 +1,47 @@
+from API.PriceHistoryClient import PriceHistoryClient, PriceHistoryPoint
+from API.PriceHistoryStore import PriceHistoryStore
+
+
+def _response(*points) -> dict:
+    return {"data": {"productById": {"priceHistory": {"points": [
+        {"price": {"amountInclusive": amount}, "validFrom": valid_from} for valid_from, amount in points
+    ]}}}}
+
+
+def _client(tmp_path) -> PriceHistoryClient:
+    # ohne __init__: kein Service-Thread
+    client = PriceHistoryClient.__new__(PriceHistoryClient)
+    client.store = PriceHistoryStore(str(tmp_path / "PriceHistory"))
+    return client
+
+
+def test_points_are_dates_and_the_cursor_keeps_the_timestamp(tmp_path):
+    client = _client(tmp_path)
+    summary = client._update_local_history(42, _response(("2025-01-01T08:30:00Z", 99.0),
+                                                         ("2025-02-01T10:00:00Z", 89.0)))
+
+    assert summary == {"min_price": 89.0, "max_price": 99.0}
+    assert client.get_local_price_history(42) == [
+        PriceHistoryPoint(amount_incl=99.0, valid_from="2025-01-01"),
+        PriceHistoryPoint(amount_incl=89.0, valid_from="2025-02-01"),
+    ]
+    assert client.store.last_valid_from(42) == "2025-02-01T10:00:00Z"
+
+
+def test_store_merges_new_points_into_the_sorted_series(tmp_path):
+    store = PriceHistoryStore(str(tmp_path))
+    store.merge(1, [["2025-03-01T00:00:00Z", 30.0], ["2025-01-01T00:00:00Z", 10.0]])
+    series = store.merge(1, [["2025-02-01T00:00:00Z", 20.0], ["2025-03-01T00:00:00Z", 31.0]])
+
+    assert series == [["2025-01-01T00:00:00Z", 10.0], ["2025-02-01T00:00:00Z", 20.0],
+                      ["2025-03-01T00:00:00Z", 31.0]]
+    assert store.load(1) == series
+    assert store.merge(1, []) == series
+    assert PriceHistoryStore.summarize(series) == {"min_price": 10.0, "max_price": 31.0}
+    assert PriceHistoryStore.summarize([]) == {"min_price": None, "max_price": None}
+
+
+def test_failed_fetch_keeps_the_local_history(tmp_path):
+    client = _client(tmp_path)
+    client._update_local_history(7, _response(("2025-01-01T00:00:00Z", 50.0)))
+    assert client._update_local_history(7, {"error": "timeout"}) == {"min_price": 50.0, "max_price": 50.0}
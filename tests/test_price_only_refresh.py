@@ -0,0 +1,77 @@
+import pytest
+
+from API.ProductDetailsClient_PDP import ProductDetailsClient_PDP
+from PROCESS.ProductClient import ProductClient
+
+
+class _RecordingTransport:
+    """Passes requests on and remembers the operation names of every POST."""
+
+    name = "http"
+
+    def __init__(self, transport):
+        self.transport = transport
+        self.operations = []
+
+    async def post(self, url, payload, timeout_ms):
+        self.operations.append([operation["operationName"] for operation in payload])
+        return await self.transport.post(url, payload, timeout_ms)
+
+
+@pytest.fixture
+def recorded(product_client, http_transport):
+    transport = _RecordingTransport(http_transport)
+    product_client.details_client._transport = transport
+    product_client.availability_client._transport = transport
+    return transport
+
+
+def _offer(offer_id, price, supplier="Shop", offer_type="RETAIL"):
+    return {"offerId": offer_id, "type": offer_type, "price": {"amountInclusive": price},
+            "supplier": {"name": supplier} if supplier else None}
+
+
+def test_offer_signature_ignores_order_and_offers_without_supplier():
+    offers = [_offer(2, 20.0), _offer(1, 30.0, offer_type="MARKETPLACE"), _offer(3, 5.0, supplier=None)]
+    cheapest, signature = ProductDetailsClient_PDP._cheapest_offer(offers)
+
+    assert cheapest["offerId"] == 2
+    assert signature == "1:MARKETPLACE,2:RETAIL"
+    assert ProductDetailsClient_PDP._cheapest_offer(offers[::-1])[1] == signature
+    assert ProductDetailsClient_PDP._cheapest_offer([]) == (None, "")
+
+
+def test_known_products_only_query_offers(product_client, recorded):
+    full = product_client.get_price_updates_bulk([1, 2], batch_size=2)
+    assert recorded.operations[0] == [ProductClient.PDP_OPERATION] * 2
+    recorded.operations.clear()
+
+    price_only = product_client.get_price_updates_bulk([1, 2], batch_size=2)
+
+    assert recorded.operations == [[ProductClient.OFFERS_OPERATION] * 2, ["GET_OFFER_AVAILABILITY_V2"] * 2]
+    for product_id in (1, 2):
+        assert vars(price_only[product_id]) == vars(full[product_id])
+
+
+def test_changed_offer_set_falls_back_to_full_query(product_client, recorded):
+    product_client.get_price_updates_bulk([1, 2], batch_size=2)
+    product_client.response_cache.put(ProductClient.PDP_OPERATION, 2, {"offer_signature": "veraltet"})
+    recorded.operations.clear()
+
+    result = product_client.get_price_updates_bulk([1, 2], batch_size=2)
+
+    assert recorded.operations[:2] == [[ProductClient.OFFERS_OPERATION] * 2, [ProductClient.PDP_OPERATION]]
+    assert result[1] and result[2]
+    # die neue Angebotsmenge ist wieder im Cache
+    assert product_client._get_cached_refresh_state(2)["offer_signature"] != "veraltet"
+
+
+def test_failed_offer_query_is_not_repeated_as_full_query(product_client, recorded):
+    # bekannt im Cache, aber vom Server nicht (mehr) geliefert
+    product_client.response_cache.put(ProductClient.PDP_OPERATION, 500, {
+        "product_name": "Weg", "brand_name": "", "category_name": "", "url": "", "image_url": "",
+        "offer_signature": "1:RETAIL",
+    })
+
+    assert product_client.get_price_update(500) is None
+    assert recorded.operations == [[ProductClient.OFFERS_OPERATION]]
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from PROCESS.ProductStorage import ProductStorage
+
+# 150/151 kennt der Fake-Server nicht: diese Produkte schlagen fehl
+PRODUCT_IDS = list(range(1, 31)) + [150, 151]
+
+
+@pytest.fixture
+def process(galaxo_process, product_client, make_product):
+    ProductStorage.save_products([make_product(product_id).to_dict() for product_id in PRODUCT_IDS])
+    galaxo_process.reload_products()
+    galaxo_process.product_client = product_client
+    return galaxo_process
+
+
+def _cheapest(server, product_id: int) -> float:
+    return min(offer["price"]["amountInclusive"] for offer in server._product(product_id)["offers"])
+
+
+def test_concurrent_refresh_updates_all_products_in_batches(process, fake_server):
+    stats = process.process_update_prices(concurrent=True, max_concurrency=2, batch_size=5,
+                                          price_only=False, only_due=False)
+
+    assert (stats.total, stats.succeeded, stats.failed, stats.not_attempted) == (32, 30, 2, 0)
+    for product_id in range(1, 31):
+        assert process.get_product(product_id).current_price == _cheapest(fake_server, product_id)
+    assert process.get_product(150).current_price == 100.0
+    # 7 PDP-Batches, 6 Verfügbarkeits-Batches (150/151 haben kein Angebot) statt 2 Anfragen pro Produkt
+    assert fake_server.requests == 7 + 6
+
+
+def test_concurrent_and_sequential_refresh_agree(process, fake_server):
+    sequential = process.process_update_prices(concurrent=False, price_only=False, only_due=False)
+    prices = {pd.product_id: (pd.current_price, pd.stock_count) for pd in process.repository.products()}
+    requests = fake_server.requests
+
+    concurrent = process.process_update_prices(concurrent=True, max_concurrency=4, batch_size=1,
+                                               price_only=False, only_due=False)
+
+    assert (sequential.succeeded, sequential.failed) == (concurrent.succeeded, concurrent.failed) == (30, 2)
+    assert {pd.product_id: (pd.current_price, pd.stock_count) for pd in process.repository.products()} == prices
+    # ohne Batching dieselben Einzelanfragen wie sequentiell
+    assert fake_server.requests - requests == requests
+
+
+class _PeakTransport:
+    """Counts the requests in flight at the same time."""
+
+    name = "http"
+
+    def __init__(self, transport):
+        self.transport = transport
+        self.in_flight = self.peak = 0
+
+    async def post(self, url, payload, timeout_ms):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            return await self.transport.post(url, payload, timeout_ms)
+        finally:
+            self.in_flight -= 1
+
+
+def test_concurrent_refresh_bounds_requests_in_flight(process, http_transport):
+    transport = _PeakTransport(http_transport)
+    process.product_client.details_client._transport = transport
+    process.product_client.availability_client._transport = transport
+
+    stats = process.process_update_prices(concurrent=True, max_concurrency=3, batch_size=1,
+                                          price_only=False, only_due=False)
+
+    assert stats.succeeded == 30
+    assert transport.peak == 3
@@ -0,0 +1,82 @@
+import random
+
+from PROCESS.ProductCatalog import ProductCatalog
+
+
+def _ids(products) -> list:
+    return [pd.product_id for pd in products]
+
+
+def _rebuilt(catalog: ProductCatalog) -> dict:
+    """Indexes computed from scratch, to compare with the incrementally maintained ones."""
+    by_category, by_brand = {}, {}
+    for pd in catalog.products():
+        by_category.setdefault(pd.category_name or "", set()).add(pd.product_id)
+        by_brand.setdefault(pd.brand_name or "", set()).add(pd.product_id)
+    return {"category": by_category, "brand": by_brand}
+
+
+def _indexed(catalog: ProductCatalog) -> dict:
+    return {
+        "category": {key: set(_ids(catalog.by_category(key))) for key in catalog.category_counts()},
+        "brand": {key: set(_ids(catalog.by_brand(key))) for key in catalog.brand_counts()},
+    }
+
+
+def test_lookup_by_id_category_and_brand(make_product):
+    catalog = ProductCatalog([
+        make_product(1, category_name="Monitor", brand_name="A"),
+        make_product(2, category_name="Maus", brand_name="A"),
+        make_product(3, category_name="Monitor", brand_name=None),
+    ])
+
+    assert catalog.get(2).category_name == "Maus" and 4 not in catalog and len(catalog) == 3
+    assert _ids(catalog.by_category("Monitor")) == [1, 3]
+    assert _ids(catalog.by_brand("A")) == [1, 2]
+    # fehlende Marke landet unter ""
+    assert _ids(catalog.by_brand(None)) == [3]
+    assert catalog.by_category("Drucker") == []
+    assert catalog.category_counts() == {"Monitor": 2, "Maus": 1}
+
+
+def test_add_keeps_the_first_product_with_an_id(make_product):
+    catalog = ProductCatalog([make_product(1, product_name="Alt")])
+    assert not catalog.add(make_product(1, product_name="Neu"))
+    assert catalog.get(1).product_name == "Alt" and len(catalog) == 1
+
+
+def test_replace_moves_product_between_buckets_and_keeps_its_position(make_product):
+    catalog = ProductCatalog([make_product(i, category_name="Monitor") for i in (1, 2, 3)])
+
+    assert catalog.replace(make_product(2, category_name="Maus"))
+
+    assert _ids(catalog.products()) == [1, 2, 3]
+    assert _ids(catalog.by_category("Monitor")) == [1, 3]
+    assert _ids(catalog.by_category("Maus")) == [2]
+    assert not catalog.replace(make_product(9))
+    assert 9 not in catalog
+
+
+def test_remove_drops_empty_buckets(make_product):
+    catalog = ProductCatalog([make_product(1, category_name="Maus", brand_name="B")])
+    assert catalog.remove(1).product_id == 1
+    assert catalog.remove(1) is None
+    assert (catalog.category_counts(), catalog.brand_counts(), len(catalog)) == ({}, {}, 0)
+
+
+def test_indexes_match_a_rebuild_after_random_changes(make_product):
+    rng = random.Random(7)
+    catalog = ProductCatalog()
+    for _ in range(2000):
+        product_id = rng.randint(1, 60)
+        fields = dict(category_name=rng.choice(["Monitor", "Maus", "", None]), brand_name=rng.choice("ABC"))
+        operation = rng.random()
+        if operation < 0.4:
+            catalog.add(make_product(product_id, **fields))
+        elif operation < 0.8:
+            catalog.replace(make_product(product_id, **fields))
+        else:
+            catalog.remove(product_id)
+
+    assert _indexed(catalog) == _rebuilt(catalog)
+    assert sum(catalog.category_counts().values()) == sum(catalog.brand_counts().values()) == len(catalog)
@@ -0,0 +1,79 @@
+import pytest
+
+from PROCESS.ProductFactory import ProductFactory
+from PROCESS.ProductRepository import ProductRepository
+from PROCESS.ProductStorage import ProductStorage
+
+SOURCES = [
+    {"product_id": 1, "product_name": "Eins", "brand_name": "A", "category_name": "Monitor",
+     "current_price": 100.0, "old_price": 100.0, "min_price": 100.0, "max_price": 100.0, "stock_count": 3},
+    {"product_id": 2, "product_name": "Zwei", "brand_name": "B", "category_name": "Maus",
+     "current_price": 20.0, "old_price": 20.0, "min_price": 20.0, "max_price": 20.0, "stock_count": 5},
+]
+
+
+@pytest.fixture
+def repository(repository):
+    """The conftest repository loaded with SOURCES."""
+    ProductStorage.save_products(SOURCES)
+    repository.reload()
+    return repository
+
+
+def _stored(product_id: int) -> dict:
+    return {p["product_id"]: p for p in ProductStorage.load_products()}[product_id]
+
+
+def test_updates_are_applied_to_copies_and_swapped_in(repository):
+    live = repository.get(1)
+    events = []
+    repository.subscribe(events.append)
+
+    changed, = repository.copies([1])
+    ProductFactory.update_existing(changed, {"current_price": 80.0, "stock_count": 1})
+    changed.category_name = "Maus"
+    # bis zum Übernehmen sieht kein Leser die halbe Änderung
+    assert repository.get(1) is live and live.current_price == 100.0
+
+    assert repository.update([changed]) == [changed]
+    assert repository.get(1) is changed
+    assert live.current_price == 100.0
+    assert [pd.product_id for pd in repository.by_category("Maus")] == [2, 1]
+    assert repository.category_counts() == {"Maus": 2}
+    assert events[-1].updated == (1,)
+
+
+def test_writer_stores_the_state_at_update_time(repository):
+    changed, = repository.copies([2])
+    changed.current_price = 15.0
+    repository.update([changed])
+    # spätere Änderungen am (nicht mehr eigenen) Objekt landen nicht im Speicher
+    changed.current_price = 1.0
+    assert repository.flush(5)
+    assert _stored(2)["current_price"] == 15.0
+
+
+def test_update_ignores_products_deleted_meanwhile(repository):
+    changed, = repository.copies([1])
+    repository.remove([1])
+    changed.current_price = 50.0
+    assert repository.update([changed]) == []
+    assert repository.get(1) is None
+    assert repository.flush(5)
+    assert [p["product_id"] for p in ProductStorage.load_products()] == [2]
+
+
+def test_close_stops_the_writer_and_the_exit_hook(storage_dir, monkeypatch):
+    import atexit
+    registered = []
+    monkeypatch.setattr(atexit, "register", lambda func, *args: registered.append(func))
+    monkeypatch.setattr(atexit, "unregister", lambda func: registered.remove(func))
+
+    ProductStorage.save_products(SOURCES)
+    repositories = [ProductRepository() for _ in range(3)]
+    hooks = lambda: [func for func in registered if isinstance(getattr(func, "__self__", None), ProductRepository)]
+    assert len(hooks()) == 3
+    for repository in repositories:
+        repository.close()
+        assert not repository._writer.is_alive()
+    assert hooks() == []
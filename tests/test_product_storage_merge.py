@@ -0,0 +1,119 @@
+import multiprocessing
+
+import pytest
+
+from CONFIG.Constants import Constants
+from PROCESS.FileLock import FileLock
+from PROCESS.JournaledJsonStorage import JournaledJsonStorage
+from PROCESS.ProductMerge import ProductMerge
+from PROCESS.SQLiteProductStorage import SQLiteProductStorage
+
+PRODUCTS = [
+    {"product_id": 1, "product_name": "Eins", "current_price": 10.0, "stock_count": 3},
+    {"product_id": 2, "product_name": "Zwei", "current_price": 20.0, "stock_count": 5},
+]
+
+
+def _json_storages(tmp_path):
+    path = str(tmp_path / "galaxo_data.json")
+    JournaledJsonStorage(path).save_products([dict(p) for p in PRODUCTS])
+    return JournaledJsonStorage(path), JournaledJsonStorage(path)
+
+
+def _sqlite_storages(tmp_path, monkeypatch):
+    # keine Übernahme der echten galaxo_data.json
+    monkeypatch.setattr(Constants, "JSON_PATH", str(tmp_path / "missing.json"))
+    path = str(tmp_path / "galaxo_data.sqlite")
+    SQLiteProductStorage(path).save_products([dict(p) for p in PRODUCTS])
+    return SQLiteProductStorage(path), SQLiteProductStorage(path)
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def storages(request, tmp_path, monkeypatch):
+    first, second = (_json_storages(tmp_path) if request.param == "json"
+                     else _sqlite_storages(tmp_path, monkeypatch))
+    yield first, second
+    first.close()
+    second.close()
+
+
+def _by_id(storage) -> dict:
+    return {p["product_id"]: p for p in storage.load_products()}
+
+
+def test_concurrent_updates_of_different_fields_are_merged(storages):
+    gui, cron = storages
+    gui_product, cron_product = _by_id(gui)[1], _by_id(cron)[1]
+
+    gui_product["product_name"] = "Eins (umbenannt)"
+    gui.upsert_products([gui_product])
+    cron_product["current_price"] = 8.5
+    cron_product["stock_count"] = 2
+    cron.upsert_products([cron_product])
+
+    for storage in (gui, cron):
+        product = _by_id(storage)[1]
+        assert product["product_name"] == "Eins (umbenannt)"
+        assert product["current_price"] == 8.5
+        assert product["stock_count"] == 2
+
+
+def test_delete_wins_over_concurrent_update(storages):
+    gui, cron = storages
+    cron_product = _by_id(cron)[2]
+
+    gui.delete_products([2])
+    cron_product["current_price"] = 15.0
+    cron.upsert_products([cron_product])
+
+    for storage in (gui, cron):
+        assert set(_by_id(storage)) == {1}
+
+
+def _hold_lock(path, locked, release):
+    with FileLock(path, timeout=5):
+        locked.set()
+        release.wait(10)
+
+
+def test_lock_timeout_when_another_process_holds_the_lock(tmp_path):
+    storage, _ = _json_storages(tmp_path)
+    storage.load_products()
+    locked, release = multiprocessing.Event(), multiprocessing.Event()
+    holder = multiprocessing.Process(target=_hold_lock, args=(storage._file_lock.path, locked, release))
+    holder.start()
+    try:
+        assert locked.wait(10)
+        storage._file_lock.timeout = 0.2
+        with pytest.raises(TimeoutError):
+            storage.upsert_products([dict(PRODUCTS[0], current_price=1.0)])
+    finally:
+        release.set()
+        holder.join(10)
+
+    storage.upsert_products([dict(PRODUCTS[0], current_price=1.0)])
+    assert _by_id(storage)[1]["current_price"] == 1.0
+
+
+def test_merge_keeps_fields_changed_on_both_sides():
+    base = {"product_id": 1, "current_price": 10.0, "stock_count": 3, "product_name": "Eins"}
+    theirs = dict(base, stock_count=1, product_name="Neu")
+    ours = dict(base, current_price=9.0, stock_count=2)
+
+    assert ProductMerge.merge(base, theirs, ours) == {
+        "product_id": 1, "current_price": 9.0, "stock_count": 2, "product_name": "Neu"
+    }
+    assert ProductMerge.merge(base, None, ours) is None
+    assert ProductMerge.merge(None, None, ours) == ours
+
+
+def test_iteration_does_not_hold_the_lock(tmp_path):
+    reader, writer = _json_storages(tmp_path)
+    products = reader.iter_products()
+    first = next(products)
+    # ein anderer Prozess bzw. Thread kann schreiben, während der Leser noch iteriert
+    writer._file_lock.timeout = 0.2
+    writer.upsert_products([dict(PRODUCTS[1], current_price=1.0)])
+    assert [first["product_id"]] + [p["product_id"] for p in products] == [1, 2]
+    reader.close()
+    writer.close()
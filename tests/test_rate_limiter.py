@@ -0,0 +1,86 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from API.GraphQLTransport import TransportResponse
+from API.RateLimiter import RateLimiter
+from CONFIG.Constants import Constants
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    monkeypatch.setattr(Constants, "RATE_LIMIT_JITTER", 0)
+    return RateLimiter("https://limiter.test", rate=4.0, min_rate=1.0, max_rate=5.0, burst=3)
+
+
+def _elapsed(coro) -> float:
+    start = time.monotonic()
+    asyncio.run(coro)
+    return time.monotonic() - start
+
+
+@pytest.mark.parametrize("value, seconds", [
+    ("3", 3.0), ("1.5", 1.5), ("-4", 0.0), (None, None), ("", None), ("soon", None),
+])
+def test_parse_retry_after_seconds(value, seconds):
+    assert RateLimiter.parse_retry_after(value) == seconds
+
+
+def test_parse_retry_after_http_date():
+    date = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 28 <= RateLimiter.parse_retry_after(date) <= 30
+    assert RateLimiter.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_rate_grows_additively_and_drops_multiplicatively(limiter):
+    for _ in range(10):
+        limiter.on_success()
+    assert limiter.rate == 5.0
+
+    limiter.on_throttle()
+    assert limiter.rate == 5.0 * Constants.RATE_LIMIT_DECREASE
+    limiter.on_server_error()
+    limiter.on_server_error()
+    assert limiter.rate == 1.0
+    assert (limiter.throttled, limiter.server_errors) == (1, 2)
+
+
+def test_burst_then_refill_rate(limiter):
+    async def _acquire(times):
+        for _ in range(times):
+            await limiter.acquire()
+
+    assert _elapsed(_acquire(3)) < 0.05
+    # der vierte Token kommt erst nach 1/rate Sekunden
+    assert 0.2 <= _elapsed(_acquire(1)) < 0.4
+
+
+def test_throttle_empties_bucket_and_honours_retry_after(limiter):
+    limiter.on_throttle(retry_after=0.3)
+    assert limiter._tokens == 0
+    assert _elapsed(limiter.acquire()) >= 0.3
+
+
+def test_client_waits_for_retry_after_and_retries(make_client, monkeypatch):
+    monkeypatch.setattr(Constants, "RATE_LIMIT_JITTER", 0)
+
+    class _ThrottleOnce:
+        name = "http"
+        posts = 0
+
+        async def post(self, url, payload, timeout_ms):
+            self.posts += 1
+            if self.posts == 1:
+                return TransportResponse(429, "{}", {"Retry-After": "0.3"})
+            return TransportResponse(200, '{"data": {}}')
+
+    client = make_client(_ThrottleOnce(), "https://limiter.test/client", max_retries=2)
+    start = time.monotonic()
+    assert client.send_request({"query": "x"}) == {"data": {}}
+
+    assert time.monotonic() - start >= 0.3
+    assert client.rate_limiter.throttled == 1
+    assert client._transport.posts == 2
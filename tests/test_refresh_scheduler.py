@@ -0,0 +1,77 @@
+import json
+import os
+
+import pytest
+
+from CONFIG.Constants import Constants
+from PROCESS.ProductFactory import ProductFactory
+from PROCESS.RefreshScheduler import RefreshScheduler
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "galaxo_data.json")
+
+
+@pytest.fixture
+def settled_product(make_product):
+    # genug beobachtet, ohne Bestand und ohne Preisbewegung
+    defaults = dict(stock_count=0, old_stock=0, refresh_count=Constants.SCHEDULER_MIN_OBSERVATIONS, change_rate=0.0)
+    return lambda **fields: make_product(**{**defaults, **fields})
+
+
+def _settled_catalog() -> list:
+    with open(DATA_FILE, "r", encoding="utf-8") as f:
+        products = ProductFactory.from_sources(json.load(f))
+    # eingeschwungener Zustand: genug beobachtet, Preise bewegen sich kaum
+    for pd in products:
+        pd.refresh_count = Constants.SCHEDULER_MIN_OBSERVATIONS
+        pd.change_rate = 0.0
+    return products
+
+
+def test_settled_catalog_is_not_hot():
+    # im gespeicherten Katalog liegen die meisten Preise am Minimum und die meisten
+    # Bestände bei 1-5, ohne sich zu bewegen
+    products = _settled_catalog()
+    assert RefreshScheduler.tier_counts(products) == {RefreshScheduler.TIER_COLD: len(products)}
+
+
+def test_catalog_tier_distribution():
+    products = _settled_catalog()
+    for pd in products[:10]:
+        pd.change_rate = Constants.SCHEDULER_HOT_CHANGE_RATE
+    for pd in products[10:30]:
+        pd.change_rate = Constants.SCHEDULER_WARM_CHANGE_RATE
+    assert RefreshScheduler.tier_counts(products) == {
+        RefreshScheduler.TIER_HOT: 10,
+        RefreshScheduler.TIER_WARM: 20,
+        RefreshScheduler.TIER_COLD: len(products) - 30,
+    }
+
+
+def test_new_products_are_hot(settled_product):
+    pd = settled_product(refresh_count=Constants.SCHEDULER_MIN_OBSERVATIONS - 1)
+    assert RefreshScheduler.tier(pd) == RefreshScheduler.TIER_HOT
+
+
+def test_never_moved_price_is_not_hot(settled_product):
+    assert RefreshScheduler.tier(settled_product()) == RefreshScheduler.TIER_COLD
+
+
+def test_unavailable_product_is_not_hot(settled_product):
+    pd = settled_product(current_price=0.0, old_price=0.0, min_price=0.0, max_price=80.0)
+    assert RefreshScheduler.tier(pd) == RefreshScheduler.TIER_COLD
+
+
+def test_price_dropped_near_min_is_hot(settled_product):
+    pd = settled_product(current_price=81.0, old_price=95.0, min_price=80.0, max_price=120.0)
+    assert RefreshScheduler.tier(pd) == RefreshScheduler.TIER_HOT
+
+
+def test_falling_low_stock_is_hot(settled_product):
+    assert RefreshScheduler.tier(settled_product(stock_count=2, old_stock=6)) == RefreshScheduler.TIER_HOT
+    assert RefreshScheduler.tier(settled_product(stock_count=2, old_stock=2)) == RefreshScheduler.TIER_COLD
+
+
+def test_price_resting_at_min_follows_change_rate(settled_product):
+    pd = settled_product(current_price=80.0, old_price=80.0, min_price=80.0, max_price=120.0,
+                  change_rate=Constants.SCHEDULER_WARM_CHANGE_RATE)
+    assert RefreshScheduler.tier(pd) == RefreshScheduler.TIER_WARM
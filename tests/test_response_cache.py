@@ -0,0 +1,97 @@
+import pytest
+
+import PROCESS.ResponseCache as response_cache_module
+from PROCESS.ResponseCache import ResponseCache
+
+TTLS = {"product_name": 100, "image_url": 10}
+OPERATION = "PDP_GET_PRODUCT_DETAILS"
+
+
+class _Clock:
+    """Stands in for the time module inside ResponseCache."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(response_cache_module, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "Cache" / "response_cache.json")
+
+
+def _cache(path, max_entries=10) -> ResponseCache:
+    return ResponseCache(path=path, max_entries=max_entries, field_ttls=TTLS)
+
+
+def test_fields_expire_after_their_own_ttl(cache_path, clock):
+    cache = _cache(cache_path)
+    cache.put(OPERATION, 1, {"product_name": "Eins", "image_url": "a.jpg", "price": 9.0})
+
+    assert cache.get(OPERATION, "1", ["product_name", "image_url"]) == {"product_name": "Eins", "image_url": "a.jpg"}
+    # Felder ohne TTL werden nicht gespeichert
+    assert cache.get(OPERATION, 1, ["price"]) is None
+
+    clock.now += 50
+    assert cache.get(OPERATION, 1, ["product_name", "image_url"]) is None
+    assert cache.get(OPERATION, 1, ["product_name"]) == {"product_name": "Eins"}
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_least_recently_used_entry_is_evicted(cache_path, clock):
+    cache = _cache(cache_path, max_entries=2)
+    cache.put(OPERATION, 1, {"product_name": "Eins"})
+    cache.put(OPERATION, 2, {"product_name": "Zwei"})
+    cache.get(OPERATION, 1, ["product_name"])
+
+    cache.put(OPERATION, 3, {"product_name": "Drei"})
+
+    assert cache.get(OPERATION, 2, ["product_name"]) is None
+    assert cache.get(OPERATION, 1, ["product_name"]) and cache.get(OPERATION, 3, ["product_name"])
+    assert cache.stats()["entries"] == 2
+
+
+def test_flush_persists_only_changes(cache_path, clock, tmp_path):
+    cache = _cache(cache_path)
+    cache.flush()
+    assert not (tmp_path / "Cache").exists()
+
+    cache.put(OPERATION, 1, {"product_name": "Eins"})
+    cache.invalidate(OPERATION, 2)
+    cache.flush()
+    reloaded = _cache(cache_path)
+    assert reloaded.get(OPERATION, 1, ["product_name"]) == {"product_name": "Eins"}
+
+    # Zeitstempel bleiben erhalten: abgelaufen ist abgelaufen, auch nach dem Neustart
+    clock.now += 101
+    assert _cache(cache_path).get(OPERATION, 1, ["product_name"]) is None
+
+    (tmp_path / "Cache" / "response_cache.json").unlink()
+    cache.flush()
+    assert not (tmp_path / "Cache" / "response_cache.json").exists()
+
+
+def test_corrupt_cache_file_starts_empty(cache_path, tmp_path):
+    (tmp_path / "Cache").mkdir()
+    (tmp_path / "Cache" / "response_cache.json").write_text("{kaputt", encoding="utf-8")
+    assert _cache(cache_path).stats()["entries"] == 0
+
+
+def test_product_client_caches_static_details(product_client):
+    assert product_client.get_cached_static_details(7) is None
+
+    details = product_client.get_full_product_details_bulk([7], include_price_history=False)[7]
+
+    assert product_client.get_cached_static_details(7) == {
+        "product_name": details.product_name, "brand_name": details.brand_name,
+        "category_name": details.category_name, "url": details.url, "image_url": details.image_url,
+    }
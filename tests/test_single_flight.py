@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from PROCESS.SingleFlight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def _fetch(product_id):
+        calls.append(product_id)
+        started.set()
+        time.sleep(0.2)
+        return {"product_id": product_id}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do(("pdp", 1), _fetch, 1)))
+    leader.start()
+    started.wait()
+    followers = [threading.Thread(target=lambda: results.append(flight.do(("pdp", 1), _fetch, 1))) for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    for thread in [leader, *followers]:
+        thread.join()
+
+    assert calls == [1]
+    assert results == [{"product_id": 1}] * 5
+    assert flight.shared == 4
+    # danach wird wieder neu abgefragt
+    flight.do(("pdp", 1), _fetch, 1)
+    assert calls == [1, 1]
+
+
+def test_error_reaches_every_waiting_caller():
+    flight = SingleFlight()
+
+    async def _fail():
+        await asyncio.sleep(0.05)
+        raise ValueError("kaputt")
+
+    async def _run():
+        return await asyncio.gather(*(flight.do_async("key", _fail) for _ in range(3)), return_exceptions=True)
+
+    errors = asyncio.run(_run())
+    assert [type(e) for e in errors] == [ValueError] * 3
+    assert flight._calls == {}
+
+
+def test_batches_only_fetch_ids_not_in_flight():
+    flight = SingleFlight()
+    batches = []
+
+    async def _fetch(ids, suffix):
+        batches.append(ids)
+        await asyncio.sleep(0.05)
+        return {item_id: f"{item_id}{suffix}" for item_id in ids}
+
+    async def _run():
+        first = asyncio.ensure_future(flight.do_many_async("pdp", [1, 2, 3], _fetch, "x"))
+        await asyncio.sleep(0)
+        second = flight.do_many_async("pdp", [2, 3, 4], _fetch, "x")
+        # anderes Argument, also ein anderer Schlüssel
+        third = flight.do_many_async("pdp", [1], _fetch, "y")
+        return await asyncio.gather(first, second, third)
+
+    first, second, third = asyncio.run(_run())
+    assert batches == [[1, 2, 3], [4], [1]]
+    assert first == {1: "1x", 2: "2x", 3: "3x"}
+    assert second == {2: "2x", 3: "3x", 4: "4x"}
+    assert third == {1: "1y"}
+
+
+def test_failed_leader_batch_leaves_followers_empty():
+    flight = SingleFlight()
+
+    async def _fail(ids):
+        await asyncio.sleep(0.05)
+        raise ConnectionError("weg")
+
+    async def _ok(ids):
+        return {item_id: item_id for item_id in ids}
+
+    async def _run():
+        leader = asyncio.ensure_future(flight.do_many_async("offers", [1, 2], _fail))
+        await asyncio.sleep(0)
+        follower = await flight.do_many_async("offers", [2, 3], _ok)
+        with pytest.raises(ConnectionError):
+            await leader
+        return follower
+
+    assert asyncio.run(_run()) == {3: 3, 2: None}
@@ -0,0 +1,20 @@
+import json
+
+from CONFIG.Constants import Constants
+from PROCESS.JournaledJsonStorage import JournaledJsonStorage
+from PROCESS.SQLiteProductStorage import SQLiteProductStorage
+
+
+def test_migration_strips_derived_fields_and_reuses_the_json_storage(storage_dir):
+    # altes Format: eingerückte Liste inklusive abgeleiteter Felder
+    with open(Constants.JSON_PATH, "w", encoding="utf-8") as f:
+        json.dump([{"product_id": 1, "current_price": 10.0, "price_change": -2.0, "min_flag": True,
+                    "old_price_percentage": "-17%↓"}], f, indent=2)
+    json_storage = JournaledJsonStorage.instance()
+
+    storage = SQLiteProductStorage.instance()
+    try:
+        assert storage.load_products() == [{"product_id": 1, "current_price": 10.0}]
+        assert JournaledJsonStorage._instances == {Constants.JSON_PATH: json_storage}
+    finally:
+        storage.close()
@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from PROCESS.StorageCodec import StorageCodec
+
+PRODUCTS = [{"product_id": i, "product_name": f"Bürostuhl {i}", "current_price": i * 1.5} for i in range(1, 6)]
+
+
+def _libraries():
+    libraries = ["json"]
+    try:
+        import orjson  # noqa: F401
+        libraries.append("orjson")
+    except ImportError:
+        pass
+    return libraries
+
+
+def _compressions():
+    return ["none", "gzip"] + (["zstd"] if StorageCodec._zstd_available() else [])
+
+
+def _write(codec: StorageCodec, path, products) -> None:
+    with codec.open_write(str(path)) as f:
+        codec.write_array(f, [codec.dumps(p) for p in products])
+
+
+@pytest.mark.parametrize("library", _libraries())
+@pytest.mark.parametrize("compression", _compressions())
+def test_snapshot_round_trip(tmp_path, library, compression, monkeypatch):
+    monkeypatch.setattr(StorageCodec, "STREAM_BATCH", 2)
+    codec = StorageCodec(library=library, compression=compression)
+    path = tmp_path / "snapshot.json"
+    _write(codec, path, PRODUCTS)
+
+    rows = list(codec.iter_array(str(path)))
+
+    assert [product for product, _ in rows] == PRODUCTS
+    assert [codec.loads(line) for _, line in rows] == PRODUCTS
+    assert codec.library == library
+
+
+def test_compression_is_detected_when_reading(tmp_path):
+    path = tmp_path / "snapshot.json"
+    _write(StorageCodec(library="json", compression="gzip"), path, PRODUCTS)
+    assert path.read_bytes().startswith(StorageCodec.GZIP_MAGIC)
+
+    assert [p for p, _ in StorageCodec(library="json", compression="none").iter_array(str(path))] == PRODUCTS
+
+
+def test_uncompressed_snapshot_stays_plain_json(tmp_path):
+    codec = StorageCodec(library="json", compression="none")
+    path = tmp_path / "snapshot.json"
+    _write(codec, path, PRODUCTS)
+
+    assert json.loads(path.read_text(encoding="utf-8")) == PRODUCTS
+    assert "Bürostuhl 1" in path.read_text(encoding="utf-8")
+    assert codec.dumps(PRODUCTS[0]) == '{"product_id":1,"product_name":"Bürostuhl 1","current_price":1.5}'
+
+
+def test_indented_snapshot_of_older_versions_is_read_completely(tmp_path):
+    path = tmp_path / "galaxo_data.json"
+    path.write_text(json.dumps(PRODUCTS, indent=2), encoding="utf-8")
+    assert [p for p, _ in StorageCodec(library="json").iter_array(str(path))] == PRODUCTS
+
+
+def test_layout_change_within_the_file_yields_every_product_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(StorageCodec, "STREAM_BATCH", 2)
+    codec = StorageCodec(library="json")
+    lines = [codec.dumps(p) for p in PRODUCTS[:3]] + [json.dumps(p, indent=2) for p in PRODUCTS[3:]]
+    path = tmp_path / "galaxo_data.json"
+    path.write_text("[\n" + ",\n".join(lines) + "\n]\n", encoding="utf-8")
+
+    assert [p for p, _ in codec.iter_array(str(path))] == PRODUCTS
+
+
+def test_missing_zstandard_falls_back_to_gzip(monkeypatch):
+    monkeypatch.setattr(StorageCodec, "_zstd_available", staticmethod(lambda: False))
+    assert StorageCodec(compression="zstd").compression == "gzip"